@@ -0,0 +1,241 @@
+"""Benchmarks des chemins critiques du scouting report.
+
+Mesure le chargement CSV, le calcul des percentiles, la construction des
+figures Plotly, le rendu du terrain et une réexécution complète de la page
+(AppTest de Streamlit). Résultats : p50/p95 en ms et pic mémoire
+(tracemalloc) par cas, écrits en JSON pour comparer deux versions.
+
+Exemples :
+    python benchmarks/bench_scouting.py --sizes 1 100 1000 10000
+    python benchmarks/bench_scouting.py --quick --compare benchmarks/results/base.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scouting import figures, pitch  # noqa: E402
+from scouting.engine import PercentileIndex  # noqa: E402
+from scouting.report import build_report  # noqa: E402
+from scouting.stats_store import DEFAULT_STATS_PATH, parse_scout_csv  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, 'nico_williams_scouting_app.py')
+DEFAULT_OUTPUT_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def measure(fn, repeats, warmup=1):
+    """(durées en ms, pic mémoire en Kio). Le pic est mesuré sur un appel à part
+    pour que tracemalloc ne fausse pas les temps."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e3)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, peak / 1024
+
+
+def summarize(name, size, timings, peak_kib):
+    return {
+        'name': name,
+        'size': size,
+        'repeats': len(timings),
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'mean_ms': float(np.mean(timings)),
+        'peak_kib': float(peak_kib),
+    }
+
+
+def synthetic_league(store, size, seed=0):
+    """Matrice de `size` joueurs obtenue en perturbant les valeurs du joueur de référence."""
+    rng = np.random.default_rng(seed)
+    values = store.per90[None, :] * rng.uniform(0.3, 1.7, (size, len(store.metrics)))
+    return [f'Joueur {i}' for i in range(size)], values.round(2)
+
+
+def write_league_csvs(store, size, directory):
+    players, values = synthetic_league(store, size)
+    paths = []
+    for player, row in zip(players, values):
+        df = pd.DataFrame({
+            ('Standard Stats', 'Statistic'): store.metrics,
+            ('Standard Stats', 'Per 90'): row,
+            ('Standard Stats', 'Percentile'): store.percentiles,
+        })
+        path = os.path.join(directory, player.lower().replace(' ', '_') + '_stats.csv')
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def bench_data(store, sizes, repeats, max_csv_files):
+    results = []
+    timings, peak = measure(lambda: parse_scout_csv(DEFAULT_STATS_PATH), repeats)
+    results.append(summarize('csv_load.single', 1, timings, peak))
+
+    for size in sizes:
+        players, values = synthetic_league(store, size)
+        timings, peak = measure(lambda: PercentileIndex(players, store.metrics, values), repeats)
+        results.append(summarize('percentiles.full', size, timings, peak))
+
+        index = PercentileIndex(players, store.metrics, values)
+        rng = np.random.default_rng(1)
+        timings, peak = measure(
+            lambda: index.update_player(players[rng.integers(size)], values[rng.integers(size)]), repeats)
+        results.append(summarize('percentiles.update_one', size, timings, peak))
+
+        if size <= max_csv_files:
+            with tempfile.TemporaryDirectory() as directory:
+                paths = write_league_csvs(store, size, directory)
+                timings, peak = measure(lambda: PercentileIndex.from_scout_files(paths), max(1, repeats // 5))
+                results.append(summarize('csv_load.league', size, timings, peak))
+    return results
+
+
+def bench_figures(store, repeats):
+    """Construction + sérialisation JSON, sans les caches lru."""
+    report = build_report(store)
+    import plotly.io as pio
+
+    cases = {
+        'overview_radar': (figures.overview_radar, (report.player, report.radar_categories, report.radar_values, ())),
+        'offensive_bars': (figures.offensive_bars, report.offensive),
+        'defensive_bars': (figures.defensive_bars, report.defensive),
+        'club_fit_radar': (figures.club_fit_radar, (report.player, report.club_fit.club, report.club_fit.categories,
+                                                    report.club_fit.importance, report.club_fit.levels)),
+    }
+    results = []
+    for name, (builder, args) in cases.items():
+        timings, peak = measure(lambda: builder.__wrapped__(*args), repeats)
+        results.append(summarize(f'figure.{name}.build', 1, timings, peak))
+        timings, peak = measure(lambda: pio.to_json(builder.__wrapped__(*args), validate=False), repeats)
+        results.append(summarize(f'figure.{name}.build_json', 1, timings, peak))
+        timings, peak = measure(lambda: builder(*args), repeats)
+        results.append(summarize(f'figure.{name}.cached', 1, timings, peak))
+    return results
+
+
+def bench_pitch(store, repeats):
+    results = []
+    timings, peak = measure(lambda: pitch.new_pitch_figure(pitch.PitchStyle()), repeats)
+    results.append(summarize('pitch.draw', 1, timings, peak))
+    timings, peak = measure(lambda: pitch.render_player_pitch.__wrapped__(store.player), repeats)
+    results.append(summarize('pitch.render_savefig', 1, timings, peak))
+    timings, peak = measure(lambda: pitch.render_player_pitch(store.player), repeats)
+    results.append(summarize('pitch.cached', 1, timings, peak))
+    return results
+
+
+def bench_app(repeats):
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for lazy in ('1', '0'):
+        os.environ['SCOUTING_LAZY_TABS'] = lazy
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        timings, peak = measure(lambda: at.run(), repeats)
+        name = 'app.rerun.lazy_tabs' if lazy == '1' else 'app.rerun.all_tabs'
+        results.append(summarize(name, 1, timings, peak))
+    os.environ.pop('SCOUTING_LAZY_TABS', None)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Cas dont le p50 s'est dégradé de plus de `threshold` (ex. 0.2 = +20 %)."""
+    with open(baseline_path) as handle:
+        baseline = {(r['name'], r['size']): r for r in json.load(handle)['results']}
+    regressions = []
+    for r in results:
+        base = baseline.get((r['name'], r['size']))
+        if base and base['p50_ms'] > 0 and r['p50_ms'] > base['p50_ms'] * (1 + threshold):
+            regressions.append((r['name'], r['size'], base['p50_ms'], r['p50_ms']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du scouting report")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 1000, 10000],
+                        help="nombres de joueurs pour les benchmarks de données")
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--max-csv-files', type=int, default=1000,
+                        help="taille maximale pour le benchmark de chargement de CSV multiples")
+    parser.add_argument('--only', nargs='+', choices=['data', 'figures', 'pitch', 'app'],
+                        default=['data', 'figures', 'pitch', 'app'])
+    parser.add_argument('--quick', action='store_true', help="tailles et répétitions réduites")
+    parser.add_argument('--output', help="fichier JSON (défaut : benchmarks/results/<date>.json)")
+    parser.add_argument('--compare', help="JSON de référence pour détecter les régressions")
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.sizes, args.repeats, args.max_csv_files = [1, 100, 1000], 5, 100
+
+    store = parse_scout_csv(DEFAULT_STATS_PATH)
+    results = []
+    if 'data' in args.only:
+        results += bench_data(store, args.sizes, args.repeats, args.max_csv_files)
+    if 'figures' in args.only:
+        results += bench_figures(store, args.repeats)
+    if 'pitch' in args.only:
+        results += bench_pitch(store, max(3, args.repeats // 4))
+    if 'app' in args.only:
+        results += bench_app(max(3, args.repeats // 4))
+
+    payload = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        },
+        'results': results,
+    }
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(payload, handle, indent=2)
+
+    print(f"{'cas':<36}{'taille':>8}{'p50 ms':>10}{'p95 ms':>10}{'pic Kio':>12}")
+    for r in results:
+        print(f"{r['name']:<36}{r['size']:>8}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['peak_kib']:>12.0f}")
+    print(f"-> {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for name, size, before, after in regressions:
+            print(f"RÉGRESSION {name} [{size}] : {before:.2f} -> {after:.2f} ms", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
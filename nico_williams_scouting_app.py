@@ -1,13 +1,20 @@
+import os
+import threading
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-from mplsoccer import Pitch
-import io
-import base64
+
+from scouting import assets, instrumentation
+from scouting import report as report_content
+from scouting.event_stream import load_league
+from scouting.instrumentation import cached_call, span
+from scouting.session_memo import memo
+from scouting.similarity import similarity_for
+from scouting.stats_store import load_stats_store
+
+# Mode paresseux : seul l'onglet affiché est construit, et plotly/matplotlib
+# ne sont importés qu'au premier affichage d'un onglet qui en a besoin.
+# SCOUTING_LAZY_TABS=0 rétablit les onglets st.tabs classiques.
+LAZY_TABS = os.environ.get('SCOUTING_LAZY_TABS', '1') != '0'
 
 # Configuration de la page
 st.set_page_config(
@@ -17,90 +24,56 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS personnalisé pour le design Barcelone
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(90deg, #004d98 0%, #a50044 100%);
-        padding: 2rem;
-        margin: -1rem -1rem 2rem -1rem;
-        color: white;
-        text-align: center;
-        border-radius: 10px;
-    }
-    .player-card {
-        background: linear-gradient(135deg, #004d98 0%, #a50044 100%);
-        padding: 1.5rem;
-        border-radius: 15px;
-        color: white;
-        margin: 1rem 0;
-    }
-    .metric-card {
-        background: white;
-        padding: 1rem;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        border-left: 4px solid #004d98;
-        margin: 0.5rem 0;
-    }
-    .strength-card {
-        background: linear-gradient(135deg, #00a650 0%, #007d3c 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-    .weakness-card {
-        background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-    .barca-colors {
-        background: linear-gradient(45deg, #004d98, #a50044);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-weight: bold;
-    }
-</style>
-""", unsafe_allow_html=True)
 
-# Données de Nico Williams (extraites du CSV)
-nico_stats = {
-    'Goals': 0.31, 'Assists': 0.21, 'Goals + Assists': 0.52,
-    'Non-Penalty Goals': 0.31, 'xG: Expected Goals': 0.21, 'npxG: Non-Penalty xG': 0.21,
-    'xAG: Exp. Assisted Goals': 0.17, 'Progressive Carries': 5.69,
-    'Progressive Passes': 3.09, 'Progressive Passes Rec': 11.07,
-    'Shots Total': 2.51, 'Shots on Target': 0.92, 'Goals/Shot': 0.12,
-    'Average Shot Distance': 16.6, 'Passes Completed': 23.12,
-    'Passes Attempted': 33.0, 'Key Passes': 2.05, 'Crosses': 5.05,
-    'Shot-Creating Actions': 5.29, 'Goal-Creating Actions': 0.61,
-    'Take-Ons Attempted': 8.62, 'Successful Take-Ons': 3.43,
-    'Times Tackled During Take-On': 4.53, 'Carries': 31.99,
-    'Total Carrying Distance': 258.5, 'Progressive Carrying Distance': 140.46,
-    'Carries into Final Third': 2.75, 'Carries into Penalty Area': 2.51,
-    'Tackles': 1.07, 'Tackles Won': 0.67, 'Interceptions': 0.37,
-    'Fouls Drawn': 1.53, 'Yellow Cards': 0.06, 'Ball Recoveries': 4.4
-}
+@st.cache_resource(show_spinner=False)
+def load_bundle(signature):
+    return assets.ensure_bundle()
+
+
+# CSS personnalisé pour le design Barcelone : feuille hachée servie depuis
+# static/ (mise en cache par le navigateur), ou CSS en ligne sans bundle
+bundle = load_bundle(assets.source_signature())
+st.markdown(assets.stylesheet_html(bundle), unsafe_allow_html=True)
+
+# Données de Nico Williams (CSV généré par NicoWilliams_Scrapping.ipynb),
+# chargées une seule fois puis partagées par tous les onglets
+with span('data.load_stats'):
+    store = load_stats_store()
+
+# Si les tableaux de la ligue sont disponibles (data/scout_tables), les
+# percentiles sont recalculés sur l'ensemble des joueurs plutôt que recopiés.
+# Une matrice publiée par `python -m scouting.shared_matrix` est préférée :
+# elle est mappée sans copie ni parsing et partagée entre les workers. Les
+# per-90 publiés par `python -m scouting.event_stream` y sont superposés.
+with span('data.league_index'):
+    league = load_league()
+# Version des données (tableaux, matrice partagée, événements) : clé des
+# résultats mémorisés, stable d'un rechargement à l'autre contrairement à id()
+league_version = None if league is None else league.version
+if league is not None and len(league) > 1 and store.player in league:
+    store = league.store_for(store.player)
+
+
+with span('data.build_report'):
+    comparables = report_content.comparables(store.player, league, similarity_for(league))
+    report = report_content.build_report(store, comparables)
 
-# Percentiles correspondants
-percentiles = {
-    'Goals': 57, 'Assists': 61, 'Goals + Assists': 59,
-    'Non-Penalty Goals': 64, 'xG: Expected Goals': 38, 'npxG: Non-Penalty xG': 43,
-    'xAG: Exp. Assisted Goals': 38, 'Progressive Carries': 94,
-    'Progressive Passes': 34, 'Progressive Passes Rec': 88,
-    'Shots Total': 69, 'Shots on Target': 60, 'Goals/Shot': 52,
-    'Average Shot Distance': 64, 'Passes Completed': 27,
-    'Passes Attempted': 32, 'Key Passes': 79, 'Crosses': 84,
-    'Shot-Creating Actions': 89, 'Goal-Creating Actions': 80,
-    'Take-Ons Attempted': 99, 'Successful Take-Ons': 98,
-    'Times Tackled During Take-On': 1, 'Carries': 59,
-    'Total Carrying Distance': 88, 'Progressive Carrying Distance': 89,
-    'Carries into Final Third': 81, 'Carries into Penalty Area': 89,
-    'Tackles': 31, 'Tackles Won': 36, 'Interceptions': 36,
-    'Fouls Drawn': 56, 'Yellow Cards': 84, 'Ball Recoveries': 66
-}
+
+@st.cache_resource(show_spinner=False)
+def warm_up_pitch(player):
+    # Exécuté une seule fois par processus, en arrière-plan : le premier
+    # affichage de l'onglet terrain ne paie pas le rendu matplotlib, et
+    # l'import de matplotlib/mplsoccer ne retarde pas le premier affichage
+    def run():
+        from scouting.pitch import warm_up
+        warm_up([player])
+
+    thread = threading.Thread(target=run, name='pitch-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+warm_up_pitch(store.player)
 
 # Header principal
 st.markdown("""
@@ -110,378 +83,220 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Sidebar avec informations personnelles
+# Sidebar avec informations personnelles (carte mise en cache, per-90 lus dans le store)
+PLAYER_PROFILE = (
+    ('Nom', 'Nicholas Williams Arthuer'),
+    ('Âge', '22 ans (né le 12/07/2002)'),
+    ('Nationalité', '🇪🇸 Espagnol'),
+    ('Club actuel', 'Athletic Bilbao'),
+    ('Position', 'Ailier gauche/droit'),
+    ('Taille', '181 cm'),
+    ('Poids', '69 kg'),
+    ('Pied fort', 'Droit'),
+    ('Valeur marchande', '70M€'),
+    ('Sélections', 'Espagne A'),
+)
+
 with st.sidebar:
-    st.markdown("""
-    <div class="player-card">
-        <h2>📋 FICHE JOUEUR</h2>
-        <hr style="border-color: white;">
-        <p><strong>Nom:</strong> Nicholas Williams Arthuer</p>
-        <p><strong>Âge:</strong> 22 ans (né le 12/07/2002)</p>
-        <p><strong>Nationalité:</strong> 🇪🇸 Espagnol</p>
-        <p><strong>Club actuel:</strong> Athletic Bilbao</p>
-        <p><strong>Position:</strong> Ailier gauche/droit</p>
-        <p><strong>Taille:</strong> 181 cm</p>
-        <p><strong>Poids:</strong> 69 kg</p>
-        <p><strong>Pied fort:</strong> Droit</p>
-        <p><strong>Valeur marchande:</strong> 70M€</p>
-        <p><strong>Sélections:</strong> Espagne A</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
+    st.markdown(assets.player_card_html(store, PLAYER_PROFILE, bundle), unsafe_allow_html=True)
+
     st.markdown("### 🏆 Palmarès récent:")
     st.write("• Champion d'Europe 2024 avec l'Espagne")
     st.write("• Finaliste Coupe du Roi 2024")
     st.write("• International espagnol depuis 2022")
 
-# Layout principal avec onglets
-tab1, tab2, tab3, tab4, tab5 = st.tabs(["🎯 Vue d'ensemble", "💪 Forces Offensives", "🛡️ Aspects Défensifs", "📊 Métriques Avancées", "⚽ Position sur Terrain"])
+def render_overview():
+    from scouting import figures
 
-with tab1:
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #004d98; margin: 0;">⚽ BUTS + PASSES</h3>
-            <h2 style="margin: 5px 0;">0.52 /90min</h2>
-            <p style="margin: 0; color: #666;">59e percentile</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #004d98; margin: 0;">🎭 DRIBBLES</h3>
-            <h2 style="margin: 5px 0;">8.62 tentatives</h2>
-            <p style="margin: 0; color: #666;">99e percentile</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #004d98; margin: 0;">🚀 ACTIONS CRÉATIVES</h3>
-            <h2 style="margin: 5px 0;">5.29 /90min</h2>
-            <p style="margin: 0; color: #666;">89e percentile</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #004d98; margin: 0;">📈 PROGRESSION</h3>
-            <h2 style="margin: 5px 0;">5.69 courses</h2>
-            <p style="margin: 0; color: #666;">94e percentile</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, card in zip(st.columns(4), report.cards):
+        with col:
+            st.markdown(report_content.metric_card_html(card), unsafe_allow_html=True)
 
     # Radar Chart Principal
     st.subheader("🕷️ Profil Radar - Comparaison avec les Ailiers Elite")
     
-    categories = ['Dribbles', 'Actions Créatives', 'Progression', 'Centres', 'Tirs', 'Passes Clés']
-    values_nico = [99, 89, 94, 84, 69, 79]
-    values_avg = [50, 50, 50, 50, 50, 50]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values_nico,
-        theta=categories,
-        fill='toself',
-        name='Nico Williams',
-        line_color='#004d98',
-        fillcolor='rgba(0, 77, 152, 0.3)'
-    ))
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values_avg,
-        theta=categories,
-        fill='toself',
-        name='Moyenne des Ailiers',
-        line_color='#a50044',
-        fillcolor='rgba(165, 0, 68, 0.1)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100]
-            )),
-        showlegend=True,
-        title="Comparaison Percentiles - Nico Williams vs Moyenne",
-        height=500
-    )
+    # Comparables réels (k plus proches voisins) quand l'index de la ligue existe
+    fig = cached_call('figures.overview_radar', figures.overview_radar,
+                      report.player, report.radar_categories, report.radar_values, report.comparables)
     
     st.plotly_chart(fig, use_container_width=True)
 
-with tab2:
+def render_offensive():
+    from scouting import figures
+
     st.subheader("💪 Forces Offensives - Pourquoi il est parfait pour Barcelone")
     
     col1, col2 = st.columns(2)
     
-    with col1:
-        st.markdown("""
-        <div class="strength-card">
-            <h3>🎭 DRIBBLES D'ÉLITE MONDIALE</h3>
-            <ul>
-                <li><strong>8.62 tentatives/90min (99e percentile)</strong></li>
-                <li><strong>3.43 réussites/90min (98e percentile)</strong></li>
-                <li>Taux de réussite: 40% - Excellent pour un ailier</li>
-                <li>Capable de déséquilibrer n'importe quelle défense</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="strength-card">
-            <h3>🚀 PROGRESSION EXCEPTIONNELLE</h3>
-            <ul>
-                <li><strong>5.69 courses progressives/90min (94e percentile)</strong></li>
-                <li><strong>2.51 courses en surface/90min (89e percentile)</strong></li>
-                <li>140.46m de distance progressive par match</li>
-                <li>Parfait pour le jeu de possession barcelonais</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="strength-card">
-            <h3>🎯 CRÉATION D'OCCASIONS</h3>
-            <ul>
-                <li><strong>5.29 actions créatives/90min (89e percentile)</strong></li>
-                <li><strong>2.05 passes clés/90min (79e percentile)</strong></li>
-                <li>0.61 actions créatrices de but/90min</li>
-                <li>Impact direct sur les statistiques offensives</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="strength-card">
-            <h3>⚡ VITESSE ET CENTRES</h3>
-            <ul>
-                <li><strong>5.05 centres/90min (84e percentile)</strong></li>
-                <li>Excellent dans les transitions rapides</li>
-                <li>Capable de jouer sur les deux flancs</li>
-                <li>Profil moderne recherché par Barcelone</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, insights in ((col1, report.strengths[:2]), (col2, report.strengths[2:])):
+        with col:
+            for insight in insights:
+                st.markdown(report_content.insight_html(insight), unsafe_allow_html=True)
     
     # Graphique des forces offensives
     st.subheader("📊 Comparaison des Forces Offensives")
     
-    offensive_metrics = ['Take-Ons Attempted', 'Successful Take-Ons', 'Progressive Carries', 
-                        'Shot-Creating Actions', 'Key Passes', 'Crosses']
-    offensive_values = [8.62, 3.43, 5.69, 5.29, 2.05, 5.05]
-    offensive_percentiles = [99, 98, 94, 89, 79, 84]
-    
-    fig = make_subplots(
-        rows=2, cols=1,
-        subplot_titles=('Valeurs Absolues (par 90 minutes)', 'Percentiles vs autres ailiers'),
-        specs=[[{"secondary_y": False}], [{"secondary_y": False}]]
-    )
-    
-    # Graphique des valeurs absolues
-    fig.add_trace(
-        go.Bar(x=offensive_metrics, y=offensive_values, 
-               marker_color=['#004d98' if p >= 90 else '#a50044' if p >= 70 else '#FFA500' for p in offensive_percentiles],
-               name="Valeurs"),
-        row=1, col=1
-    )
-    
-    # Graphique des percentiles
-    fig.add_trace(
-        go.Bar(x=offensive_metrics, y=offensive_percentiles,
-               marker_color=['#00a650' if p >= 90 else '#FFA500' if p >= 70 else '#ff6b6b' for p in offensive_percentiles],
-               name="Percentiles"),
-        row=2, col=1
-    )
-    
-    fig.update_layout(height=600, showlegend=False)
+    fig = cached_call('figures.offensive_bars', figures.offensive_bars, *report.offensive)
     st.plotly_chart(fig, use_container_width=True)
 
-with tab3:
+def render_defensive():
+    from scouting import figures
+
     st.subheader("🛡️ Aspects Défensifs - Zones d'Amélioration")
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
-        <div class="weakness-card">
-            <h3>⚠️ ENGAGEMENT DÉFENSIF LIMITÉ</h3>
-            <ul>
-                <li>1.07 tacles/90min (31e percentile)</li>
-                <li>0.37 interceptions/90min (36e percentile)</li>
-                <li>Besoin d'améliorer le pressing défensif</li>
-                <li>Adaptation nécessaire au système Barça</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="weakness-card">
-            <h3>🔄 PERTES DE BALLE</h3>
-            <ul>
-                <li>4.53 dribbles subis/90min (1er percentile)</li>
-                <li>2.02 dépossessions/90min (14e percentile)</li>
-                <li>Ratio à améliorer pour le jeu de possession</li>
-                <li>Formation tactique recommandée</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
+        for insight in report.weaknesses:
+            st.markdown(report_content.insight_html(insight), unsafe_allow_html=True)
     
     with col2:
         # Graphique défensif
-        defensive_metrics = ['Tackles', 'Interceptions', 'Ball Recoveries', 'Times Tackled During Take-On']
-        defensive_values = [1.07, 0.37, 4.4, 4.53]
-        defensive_percentiles = [31, 36, 66, 1]
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=defensive_metrics,
-            y=defensive_percentiles,
-            marker_color=['#ff6b6b' if p < 40 else '#FFA500' if p < 70 else '#00a650' for p in defensive_percentiles],
-            text=[f"{v:.2f}" for v in defensive_values],
-            textposition='auto'
-        ))
-        
-        fig.update_layout(
-            title="Métriques Défensives (Percentiles)",
-            yaxis_title="Percentile",
-            height=400
-        )
+        fig = cached_call('figures.defensive_bars', figures.defensive_bars, *report.defensive)
         
         st.plotly_chart(fig, use_container_width=True)
     
     st.info("💡 **Recommandation:** Ces faiblesses défensives sont typiques d'un ailier offensif moderne et peuvent être compensées par le système tactique de Barcelone et un travail spécifique avec l'entraîneur.")
 
-with tab4:
+def render_advanced():
     st.subheader("📊 Métriques Avancées - Analyse Approfondie")
     
     # Métriques de création
     col1, col2, col3 = st.columns(3)
     
-    with col1:
-        st.metric("🎯 Goals - xG", "+0.09", "Surperforme ses Expected Goals")
-        st.metric("📈 Progressive Passes Rec", "11.07", "88e percentile")
-        st.metric("🏃 Carries into Final Third", "2.75", "81e percentile")
-    
-    with col2:
-        st.metric("⚽ Goals + Assists", "0.52", "Production offensive solide")
-        st.metric("🎭 Successful Take-Ons", "3.43", "98e percentile - Elite")
-        st.metric("📊 Shot-Creating Actions", "5.29", "89e percentile")
+    for col, metrics in zip((col1, col2, col3), report.advanced):
+        with col:
+            for label, value, caption in metrics:
+                st.metric(label, value, caption)
     
-    with col3:
-        st.metric("🎯 Key Passes", "2.05", "79e percentile")
-        st.metric("🚀 Progressive Carrying Distance", "140.46m", "89e percentile")
-        st.metric("⚡ Total Carrying Distance", "258.5m", "88e percentile")
-    
-    # Graphique de comparaison avec les besoins de Barcelone
+    render_club_fit()
+    render_form_curves()
+
+
+@st.fragment
+def render_club_fit():
+    # Fragment : changer de club ou de pondération ne réexécute que ce bloc
+    from scouting import figures
+    from scouting.simulation import DEFAULT_MINUTES, simulate
+
+    # Graphique de comparaison avec les besoins d'un profil de club
     st.subheader("🔄 Adéquation avec le Profil Barcelone")
     
-    barca_needs = {
-        'Dribbles': {'importance': 95, 'nico_level': 99, 'description': 'Essentiel pour déséquilibrer'},
-        'Vitesse': {'importance': 90, 'nico_level': 95, 'description': 'Transitions rapides'},
-        'Créativité': {'importance': 85, 'nico_level': 89, 'description': 'Création d\'occasions'},
-        'Polyvalence': {'importance': 80, 'nico_level': 85, 'description': 'Joue sur les 2 flancs'},
-        'Jeunesse': {'importance': 75, 'nico_level': 100, 'description': '22 ans - Potentiel énorme'},
-        'Pressing': {'importance': 70, 'nico_level': 35, 'description': 'À développer'}
-    }
-    
-    categories = list(barca_needs.keys())
-    importance = [barca_needs[cat]['importance'] for cat in categories]
-    nico_level = [barca_needs[cat]['nico_level'] for cat in categories]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=importance,
-        theta=categories,
-        fill='toself',
-        name='Besoins Barcelone',
-        line_color='#a50044',
-        fillcolor='rgba(165, 0, 68, 0.2)'
-    ))
-    
-    fig.add_trace(go.Scatterpolar(
-        r=nico_level,
-        theta=categories,
-        fill='toself',
-        name='Niveau Nico Williams',
-        line_color='#004d98',
-        fillcolor='rgba(0, 77, 152, 0.3)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-        showlegend=True,
-        title="Adéquation Profil Nico Williams / Besoins FC Barcelona",
-        height=500
-    )
+    engine = report_content.club_fit_engine(store.metrics)
+    club = st.selectbox("Profil de club", engine.clubs, index=engine.clubs.index(report.club_fit.club))
+    
+    # Pondérations modifiables par le scout ; le score et son intervalle suivent
+    with st.expander("⚖️ Pondérations du profil et simulation"):
+        importance = {
+            d.name: st.slider(d.name, 0, 100, int(d.importance), key=f"weight-{club}-{d.name}")
+            for d in engine.club_dimensions(club)
+        }
+        minutes = st.number_input("Minutes jouées (taille d'échantillon des per-90)", 450, 4000,
+                                  DEFAULT_MINUTES, step=90)
+    weighted = engine.with_importance(club, importance)
+    default = all(importance[d.name] == d.importance for d in engine.club_dimensions(club))
+    if club == report.club_fit.club and default:
+        fit = report.club_fit
+    else:
+        fit = report_content.club_fit(store, club, weighted)
+    fig = cached_call('figures.club_fit_radar', figures.club_fit_radar,
+                      report.player, fit.club, fit.categories, fit.importance, fit.levels)
     
     st.plotly_chart(fig, use_container_width=True)
     
-    # Score de compatibilité
-    compatibility_score = np.mean([min(importance[i], nico_level[i]) for i in range(len(categories))])
+    # Score de compatibilité et intervalle de confiance (per-90 ré-échantillonnés),
+    # recalculé seulement si le joueur, la liste comparée, le club, les
+    # pondérations, la ligue ou la taille d'échantillon changent
+    shortlist = [store]
+    similarity = similarity_for(league) if league is not None and store.player in league else None
+    if similarity is not None:
+        shortlist += [league.store_for(name) for name, _ in similarity.neighbours(store.player, k=9)
+                      if name in league]
+    with span('simulation.club_fit'):
+        simulation = memo(
+            st.session_state, 'simulation',
+            lambda: simulate(weighted, shortlist, league if similarity is not None else None, minutes=minutes),
+            player=store.player, shortlist=tuple(s.player for s in shortlist), league=league_version,
+            club=club, importance=importance, minutes=minutes,
+        )
+    st.markdown(report_content.compatibility_html(fit, simulation.interval(store.player, club)),
+                unsafe_allow_html=True)
+    if len(shortlist) > 1:
+        st.markdown(f"**🔁 Profils similaires - score {club} simulé ({simulation.draws} tirages)**")
+        st.dataframe(
+            [{'Joueur': s.player, 'Score': round(i.score, 1), 'Bas': round(i.low, 1), 'Haut': round(i.high, 1)}
+             for s in shortlist for i in [simulation.interval(s.player, club)]],
+            hide_index=True
+        )
     
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, #004d98, #a50044); padding: 2rem; border-radius: 15px; text-align: center; color: white; margin: 2rem 0;">
-        <h2>🎯 SCORE DE COMPATIBILITÉ BARCELONE</h2>
-        <h1 style="font-size: 3rem; margin: 1rem 0;">{compatibility_score:.0f}/100</h1>
-        <p style="font-size: 1.2rem;">Profil TRÈS COMPATIBLE avec les besoins du FC Barcelona</p>
-    </div>
-    """, unsafe_allow_html=True)
+    # Classement de la ligue pour ce profil
+    if league is not None and len(league) > 1:
+        from scouting.club_fit import ClubFitEngine
+        
+        league_engine = ClubFitEngine.from_config(league.metrics)
+        table = memo(st.session_state, 'league_scores',
+                     lambda: league_engine.score_index(league),
+                     league=league_version)
+        st.markdown(f"**🏅 Top 10 de la ligue - profil {club}**")
+        st.dataframe(
+            [{'Joueur': name, 'Score': round(score, 1)} for name, score in table.top(club, 10)],
+            hide_index=True
+        )
+        assessed = league_engine.assessed_dimensions(club)
+        if assessed:
+            st.caption(f"Classement sur les dimensions mesurées par les statistiques ; "
+                       f"les évaluations de scout ({', '.join(assessed)}) en sont exclues.")
+
+
+@st.fragment
+def render_form_curves():
+    # Courbes de forme quand l'archive contient plusieurs snapshots
+    from scouting import figures
+    from scouting.archive import DEFAULT_ARCHIVE_DIR, SnapshotArchive
+    
+    if os.path.exists(os.path.join(DEFAULT_ARCHIVE_DIR, 'manifest.json')):
+        archive = SnapshotArchive(DEFAULT_ARCHIVE_DIR)
+        if len(archive.snapshots(store.player)) > 1:
+            st.subheader("📈 Évolution sur les derniers snapshots")
+            metrics = st.multiselect("Métriques", store.metrics, default=list(report.offensive[0][:3]))
+            if metrics:
+                trajectories = archive.trajectories([store.player], metrics)
+                # Aucune ligne pour ce joueur (nom différent dans la matrice, métriques renommées...)
+                curves = None
+                if not trajectories.empty and store.player in trajectories['percentile']:
+                    curves = trajectories['percentile'][store.player]
+                series = () if curves is None else tuple(
+                    (m, tuple(curves[m].tolist())) for m in metrics if m in curves)
+                if series:
+                    st.plotly_chart(figures.form_curves(store.player, tuple(curves.index), series), use_container_width=True)
+                else:
+                    st.info("Pas d'historique archivé pour ces métriques.")
+
+
+@st.fragment
+def render_pitch():
+    from scouting.events import EVENT_LABELS, EVENT_TYPES, load_event_grid, seasons
+    from scouting.pitch import LEFT_WINGER_LAYOUT, render_event_pitch, render_player_pitch
 
-with tab5:
     st.subheader("⚽ Position et Mouvements sur le Terrain")
     
-    # Création du terrain avec mplsoccer
-    fig, ax = plt.subplots(figsize=(12, 8))
-    pitch = Pitch(pitch_color='#2d5a2d', line_color='white', linewidth=2)
-    pitch.draw(ax=ax)
-    
-    # Position principale (ailier gauche)
-    ax.scatter(20, 15, s=300, c='#004d98', marker='o', edgecolors='white', linewidth=2, label='Position Principale')
-    ax.text(20, 12, 'NICO\nWILLIAMS', ha='center', va='top', color='white', fontsize=10, fontweight='bold')
-    
-    # Zones d'influence
-    from matplotlib.patches import Ellipse
-    
-    # Zone principale d'action
-    ellipse1 = Ellipse((25, 20), 30, 25, alpha=0.3, color='#004d98', label='Zone d\'influence principale')
-    ax.add_patch(ellipse1)
-    
-    # Zone de repli défensif
-    ellipse2 = Ellipse((15, 25), 20, 15, alpha=0.2, color='#a50044', label='Zone de repli défensif')
-    ax.add_patch(ellipse2)
-    
-    # Mouvements offensifs typiques
-    # Vers l'intérieur
-    ax.arrow(20, 15, 15, 5, head_width=2, head_length=2, fc='yellow', ec='yellow', alpha=0.8)
-    ax.text(28, 22, 'Rentrées\ndans l\'axe', ha='center', color='yellow', fontsize=9)
-    
-    # Vers la surface
-    ax.arrow(20, 15, 25, -5, head_width=2, head_length=2, fc='#00ff00', ec='#00ff00', alpha=0.8)
-    ax.text(45, 8, 'Courses\nen surface', ha='center', color='#00ff00', fontsize=9)
-    
-    # Débordements
-    ax.arrow(20, 15, 5, -10, head_width=2, head_length=2, fc='orange', ec='orange', alpha=0.8)
-    ax.text(27, 2, 'Débordements', ha='center', color='orange', fontsize=9)
-    
-    ax.set_title('Nico Williams - Positionnement et Mouvements Tactiques', 
-                 fontsize=16, fontweight='bold', color='white', pad=20)
-    ax.legend(loc='upper left', framealpha=0.8)
-    
-    # Conversion en image pour Streamlit
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', facecolor='#2d5a2d', dpi=150, bbox_inches='tight')
-    buf.seek(0)
-    st.image(buf, use_column_width=True)
-    plt.close()
+    # Carte de chaleur issue des événements (data/events/<joueur>/<saison>/),
+    # sinon schéma tactique pré-rendu (voir scouting/pitch.py)
+    available = seasons(store.player)
+    grid = None
+    if available:
+        col_season, col_type = st.columns(2)
+        season = col_season.selectbox("Saison", available)
+        event_type = col_type.selectbox("Événements", EVENT_TYPES, format_func=EVENT_LABELS.get)
+        with span('data.event_grid'):
+            grid = load_event_grid(store.player, season)
+    if grid is not None and grid.n_events:
+        png = cached_call('pitch.render_event_pitch', render_event_pitch, grid, event_type)
+        st.caption(f"{grid.n_events:,} événements sur {len(grid.matches)} matchs · "
+                   "flèches : conduites progressives moyennes par zone".replace(',', ' '))
+    else:
+        png = cached_call('pitch.render_player_pitch', render_player_pitch, store.player, LEFT_WINGER_LAYOUT)
+    st.image(png, use_column_width=True)
     
     col1, col2 = st.columns(2)
     
@@ -505,6 +320,40 @@ with tab5:
         - Optimiser les décrochages
         """)
 
+
+# Layout principal avec onglets
+TABS = {
+    "🎯 Vue d'ensemble": render_overview,
+    "💪 Forces Offensives": render_offensive,
+    "🛡️ Aspects Défensifs": render_defensive,
+    "📊 Métriques Avancées": render_advanced,
+    "⚽ Position sur Terrain": render_pitch,
+}
+
+
+# Les onglets forment un fragment : changer d'onglet ou de contrôle ne
+# réexécute ni l'en-tête, ni la sidebar, ni la conclusion. Les blocs avec
+# widgets (club, pondérations, saison...) sont eux-mêmes des fragments
+# imbriqués, réexécutés seuls quand leurs contrôles changent.
+@st.fragment
+def render_tabs():
+    if LAZY_TABS:
+        selected_tab = st.radio("Onglet", list(TABS), horizontal=True, label_visibility="collapsed")
+        with span(f'tab.{TABS[selected_tab].__name__}'):
+            TABS[selected_tab]()
+    else:
+        for tab, render in zip(st.tabs(list(TABS)), TABS.values()):
+            with tab:
+                with span(f'tab.{render.__name__}'):
+                    render()
+    # Seul point d'export : le fragment s'exécute aussi à chaque réexécution
+    # complète, et ses réexécutions seules n'atteignent pas la fin du script
+    if instrumentation.ENABLED:
+        instrumentation.write_prometheus()
+
+
+render_tabs()
+
 # Conclusion et recommandations
 st.markdown("---")
 st.subheader("🎯 Conclusion du Scouting Report")
@@ -549,3 +398,8 @@ st.markdown("""
     <p><strong>Score global de recommandation: 9.2/10</strong></p>
 </div>
 """, unsafe_allow_html=True)
+
+# Panneau de debug (SCOUTING_INSTRUMENT=1, puis ?debug=1 dans l'URL) ; l'export
+# Prometheus (SCOUTING_METRICS_FILE) est fait par render_tabs
+if instrumentation.ENABLED and st.query_params.get('debug') == '1':
+    instrumentation.render_debug_panel(st)
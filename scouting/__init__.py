@@ -0,0 +1 @@
+"""Briques réutilisables du scouting report (données, calculs, rendu)."""
@@ -0,0 +1,367 @@
+"""API HTTP (ASGI) du scouting report pour les outils hors Streamlit.
+
+Mêmes données et mêmes rendus que nico_williams_scouting_app.py : per-90,
+percentiles, voisins de l'index de similarité, radar (JSON Plotly ou PNG) et
+terrain (PNG). Chaque réponse porte un ETag dérivé de la version des données
+et de l'URL ; un `If-None-Match` correspondant reçoit un 304 sans rien
+recalculer. Les corps sont gardés dans un cache LRU en mémoire, et les rendus
+matplotlib partent dans un pool de processus (une requête identique déjà en
+cours est attendue au lieu d'être relancée).
+
+Exemple :
+    python -m scouting.api --port 8000 --workers 2
+    curl localhost:8000/players/Nico%20Williams/percentiles?category=offensive
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.routing import Route
+
+from scouting import instrumentation
+from scouting import report as report_content
+from scouting.engine import DEFAULT_LEAGUE_DIR, league_files
+from scouting.event_stream import DEFAULT_EVENT_MATRIX_DIR, load_league
+from scouting.events import DEFAULT_EVENTS_DIR
+from scouting.instrumentation import span
+from scouting.metrics import CATEGORIES, REGISTRY
+from scouting.shared_matrix import DEFAULT_SHARED_DIR, current_version
+from scouting.similarity import similarity_for
+from scouting.stats_store import DEFAULT_STATS_PATH, load_stats_store
+
+CACHE_ENTRIES = 1024
+# Intervalle minimal entre deux vérifications des fichiers de données
+RELOAD_INTERVAL = 1.0
+CACHE_CONTROL = 'public, max-age=60'
+
+
+def _render_pitch(player, grid=None, event_type='touch'):
+    from scouting.pitch import render_event_pitch, render_player_pitch
+
+    if grid is not None:
+        return render_event_pitch(grid, event_type)
+    return render_player_pitch(player)
+
+
+def _render_radar(player, categories, values, comparables):
+    return report_content.render_radar_png(player, categories, values, comparables)
+
+
+def _warm_up():
+    from scouting.pitch import warm_up
+
+    warm_up()
+    return os.getpid()
+
+
+def _number(value):
+    return None if value is None or math.isnan(value) else value
+
+
+def _integers(text, name):
+    try:
+        return [int(part) for part in text.split(',') if part]
+    except ValueError:
+        raise HTTPException(400, f"{name} : entiers attendus, reçu {text!r}") from None
+
+
+def _json(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ReportData:
+    """Joueur principal, ligue et index de similarité, rechargés quand les fichiers changent."""
+
+    def __init__(self, stats_path=DEFAULT_STATS_PATH, league_dir=DEFAULT_LEAGUE_DIR,
+                 shared_dir=DEFAULT_SHARED_DIR, events_dir=DEFAULT_EVENTS_DIR,
+                 event_matrix_dir=DEFAULT_EVENT_MATRIX_DIR):
+        self.stats_path = stats_path
+        self.league_dir = league_dir
+        self.shared_dir = shared_dir
+        self.events_dir = events_dir
+        self.event_matrix_dir = event_matrix_dir
+        self.version = None
+        self._checked = 0.0
+        self.refresh(force=True)
+
+    def _signature(self):
+        stats = os.path.getmtime(self.stats_path)
+        league = tuple(os.path.getmtime(p) for p in league_files(self.league_dir))
+        return repr((stats, current_version(self.shared_dir), current_version(self.event_matrix_dir), league))
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked < RELOAD_INTERVAL:
+            return
+        self._checked = now
+        version = hashlib.sha1(self._signature().encode()).hexdigest()[:16]
+        if version == self.version:
+            return
+        self.store = load_stats_store(self.stats_path)
+        self.league = load_league(self.shared_dir, self.league_dir, self.event_matrix_dir)
+        if self.league is not None and len(self.league) > 1 and self.store.player in self.league:
+            self.store = self.league.store_for(self.store.player)
+        self.similarity = similarity_for(self.league, self.league_dir)
+        self._reports = {}
+        self.version = version
+
+    def players(self):
+        if self.league is None:
+            return [self.store.player]
+        players = list(self.league.players)
+        return players if self.store.player in self.league else [self.store.player] + players
+
+    def store_for(self, player):
+        if player == self.store.player:
+            return self.store
+        if self.league is not None and player in self.league:
+            return self.league.store_for(player)
+        raise HTTPException(404, f"joueur inconnu : {player}")
+
+    def report_for(self, player):
+        report = self._reports.get(player)
+        if report is None:
+            comparables = report_content.comparables(player, self.league, self.similarity)
+            report = self._reports[player] = report_content.build_report(self.store_for(player), comparables)
+        return report
+
+
+class ResponseCache:
+    """Corps de réponse par (version des données, URL), en LRU, avec dédoublonnage des calculs en cours."""
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._pending = {}
+
+    async def get(self, key, build):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            instrumentation.record_cache('api.responses', True)
+            return self._entries[key]
+        instrumentation.record_cache('api.responses', False)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(build())
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        body = await asyncio.shield(pending)
+        self._entries[key] = body
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return body
+
+
+def create_app(data=None, workers=2):
+    """Application Starlette ; `workers` processus pour les rendus matplotlib (0 : dans la boucle)."""
+    data = data or ReportData()
+    cache = ResponseCache()
+    state = {'pool': None}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        if workers:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            loop = asyncio.get_running_loop()
+            for _ in range(workers):
+                loop.run_in_executor(pool, _warm_up)
+            state['pool'] = pool
+        yield
+        if state['pool'] is not None:
+            state['pool'].shutdown(cancel_futures=True)
+
+    async def render(fn, *args):
+        if state['pool'] is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(state['pool'], fn, *args)
+
+    async def respond(request, build, media_type='application/json', signature=''):
+        """Réponse avec ETag ; 304 si le client a déjà cette version.
+
+        `signature` : empreinte des fichiers lus hors de `data.version` (matchs d'une saison).
+        """
+        data.refresh()
+        url = request.url.path + ('?' + request.url.query if request.url.query else '')
+        version = data.version + signature
+        etag = '"%s"' % hashlib.sha1(f'{version}{url}'.encode()).hexdigest()[:20]
+        headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=headers)
+
+        async def run():
+            result = build()
+            return await result if asyncio.iscoroutine(result) else result
+
+        with span(f"api.{request.scope['route'].name}"):
+            body = await cache.get((version, url), run)
+        return Response(body, media_type=media_type, headers=headers)
+
+    def selected_metrics(request, store):
+        params = request.query_params
+        if 'metrics' in params:
+            metrics = [m for m in params['metrics'].split(',') if m]
+        elif 'ids' in params:
+            ids = _integers(params['ids'], 'ids')
+            unknown = [i for i in ids if not 0 <= i < len(REGISTRY)]
+            if unknown:
+                raise HTTPException(400, f"identifiants de métrique inconnus : {unknown}")
+            metrics = [REGISTRY[i].label for i in ids]
+        elif 'category' in params:
+            if params['category'] not in CATEGORIES:
+                raise HTTPException(400, f"catégorie inconnue : {params['category']}")
+            metrics = REGISTRY.by_category(params['category'])
+        else:
+            return list(store.metrics)
+        return [m for m in metrics if m in store.index]
+
+    async def health(request):
+        data.refresh()
+        return Response(_json({'status': 'ok', 'version': data.version}), media_type='application/json')
+
+    async def players(request):
+        return await respond(request, lambda: _json({'players': data.players()}))
+
+    async def stats(request):
+        player = request.path_params['player']
+
+        def build():
+            store = data.store_for(player)
+            rows = []
+            for metric in selected_metrics(request, store):
+                definition = REGISTRY.get(metric)
+                rows.append({
+                    'id': definition.id, 'key': definition.key, 'label': metric,
+                    'label_fr': definition.label_fr, 'category': definition.category,
+                    'higher_is_better': definition.higher_is_better,
+                    'per90': _number(store.value(metric)), 'percentile': _number(store.percentile(metric)),
+                })
+            return _json({'player': player, 'metrics': rows})
+        return await respond(request, build)
+
+    async def percentiles(request):
+        player = request.path_params['player']
+
+        def build():
+            store = data.store_for(player)
+            metrics = selected_metrics(request, store)
+            return _json({
+                'player': player,
+                'metrics': metrics,
+                'ids': [REGISTRY.id(m) for m in metrics],
+                'percentiles': [_number(v) for v in store.percentile_values(metrics).tolist()],
+            })
+        return await respond(request, build)
+
+    async def similar(request):
+        player = request.path_params['player']
+        k = request.query_params.get('k', '5')
+        if not k.isdigit() or int(k) <= 0:
+            raise HTTPException(400, f"k : entier strictement positif attendu, reçu {k!r}")
+        k = int(k)
+
+        def build():
+            data.store_for(player)
+            if data.similarity is None or player not in data.league:
+                raise HTTPException(404, "index de similarité indisponible pour ce joueur")
+            neighbours = data.similarity.neighbours(player, k=k)
+            return _json({'player': player, 'neighbours': [
+                {'player': name, 'distance': float(distance)} for name, distance in neighbours
+            ]})
+        return await respond(request, build)
+
+    async def radar(request):
+        from scouting import figures
+
+        player = request.path_params['player']
+
+        def build():
+            report = data.report_for(player)
+            return figures.figure_json('overview_radar', report.player, report.radar_categories,
+                                       report.radar_values, report.comparables).encode('utf-8')
+        return await respond(request, build)
+
+    async def radar_png(request):
+        player = request.path_params['player']
+
+        async def build():
+            report = data.report_for(player)
+            return await render(_render_radar, report.player, report.radar_categories,
+                                report.radar_values, report.comparables)
+        return await respond(request, build, 'image/png')
+
+    async def pitch_png(request):
+        player = request.path_params['player']
+        season = request.query_params.get('season')
+        event_type = request.query_params.get('events', 'touch')
+        signature = ''
+        if season:
+            from scouting.events import files_signature
+
+            signature = repr(files_signature(player, season, data.events_dir))
+
+        async def build():
+            data.store_for(player)
+            grid = None
+            if season:
+                from scouting.events import EVENT_TYPES, load_event_grid
+
+                if event_type not in EVENT_TYPES:
+                    raise HTTPException(400, f"type d'événement inconnu : {event_type}")
+                grid = load_event_grid(player, season, data.events_dir)
+                if grid is None:
+                    raise HTTPException(404, f"aucun événement pour {player} en {season}")
+            return await render(_render_pitch, player, grid, event_type)
+        return await respond(request, build, 'image/png', signature)
+
+    async def metrics(request):
+        return Response(instrumentation.prometheus_text(), media_type='text/plain; version=0.0.4')
+
+    async def http_error(request, exc):
+        return Response(_json({'detail': exc.detail}), status_code=exc.status_code,
+                        media_type='application/json')
+
+    routes = [
+        Route('/health', health),
+        Route('/players', players),
+        Route('/players/{player}/stats', stats),
+        Route('/players/{player}/percentiles', percentiles),
+        Route('/players/{player}/similar', similar),
+        Route('/players/{player}/radar', radar),
+        Route('/players/{player}/radar.png', radar_png),
+        Route('/players/{player}/pitch.png', pitch_png),
+        Route('/metrics', metrics),
+    ]
+    return Starlette(routes=routes, lifespan=lifespan, exception_handlers={HTTPException: http_error})
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Sert le scouting report en JSON et PNG")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=2, help="processus de rendu matplotlib")
+    parser.add_argument('--stats', default=DEFAULT_STATS_PATH)
+    parser.add_argument('--league-dir', default=DEFAULT_LEAGUE_DIR)
+    parser.add_argument('--events-dir', default=DEFAULT_EVENTS_DIR)
+    args = parser.parse_args(argv)
+
+    data = ReportData(args.stats, args.league_dir, events_dir=args.events_dir)
+    app = create_app(data, workers=args.workers)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
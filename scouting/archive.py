@@ -0,0 +1,167 @@
+"""Archive des snapshots de scouting (une ligne par joueur, date et métrique).
+
+Stockage Parquet partitionné `player=<nom>/snapshot=<AAAA-MM-JJ>/`. L'archive
+est en ajout seul : un snapshot identique au précédent n'est pas écrit, et
+seules les métriques dont la valeur a changé depuis le snapshot précédent
+sont stockées. Les trajectoires se lisent par filtre sur les partitions et
+les colonnes, sans charger l'archive entière.
+"""
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from scouting.engine import DEFAULT_LEAGUE_DIR
+from scouting.stats_store import parse_scout_csv
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(DEFAULT_LEAGUE_DIR), 'archive')
+
+ROW_SCHEMA = pa.schema([
+    ('metric', pa.string()),
+    ('per90', pa.float64()),
+    ('percentile', pa.float64()),
+])
+PARTITIONING = ds.partitioning(
+    pa.schema([('player', pa.string()), ('snapshot', pa.string())]), flavor='hive')
+
+
+def _digest(store):
+    payload = json.dumps([store.metrics, store.per90.tolist(), store.percentiles.tolist()])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class SnapshotArchive:
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.manifest_path) as handle:
+                self.manifest = json.load(handle)
+        except FileNotFoundError:
+            self.manifest = {}
+
+    def players(self):
+        return sorted(self.manifest)
+
+    def snapshots(self, player):
+        return sorted(self.manifest.get(player, {}))
+
+    def _dataset(self):
+        return ds.dataset(self.directory, format='parquet', partitioning=PARTITIONING,
+                          exclude_invalid_files=True)
+
+    def latest_state(self, player, before=None, inclusive=False):
+        """Dernière valeur connue de chaque métrique d'un joueur : {métrique: (per90, percentile)}."""
+        rows = self.query([player], end=before, exclusive_end=not inclusive)
+        rows = rows.sort_values('snapshot').drop_duplicates('metric', keep='last')
+        return {m: (v, p) for m, v, p in zip(rows['metric'], rows['per90'], rows['percentile'])}
+
+    def _write_partition(self, player, snapshot, metrics, per90, percentiles):
+        partition = os.path.join(self.directory, f"player={quote(player, safe='')}", f"snapshot={snapshot}")
+        path = os.path.join(partition, 'part-0.parquet')
+        if not metrics:
+            if os.path.exists(path):
+                os.unlink(path)
+            return
+        table = pa.table({'metric': list(metrics), 'per90': per90, 'percentile': percentiles},
+                         schema=ROW_SCHEMA)
+        os.makedirs(partition, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=partition, suffix='.tmp')
+        os.close(fd)
+        pq.write_table(table, tmp, compression='zstd')
+        os.replace(tmp, path)
+
+    def ingest(self, store, snapshot=None):
+        """Ajoute un snapshot ; retourne le nombre de lignes écrites (0 si inchangé).
+
+        Un snapshot antérieur à des dates déjà archivées (rattrapage) est
+        accepté : le snapshot suivant est réécrit en delta contre le nouvel état.
+        """
+        snapshot = (snapshot or datetime.date.today()).isoformat()
+        known = self.manifest.setdefault(store.player, {})
+        digest = _digest(store)
+        if snapshot in known:
+            return 0
+        previous = [d for d in sorted(known) if d < snapshot]
+        if previous and known[previous[-1]] == digest:
+            # Rien à écrire, mais la date reste connue pour les trajectoires
+            known[snapshot] = digest
+            self._save_manifest()
+            return 0
+
+        following = [d for d in sorted(known) if d > snapshot]
+        # État complet du snapshot suivant, lu avant que son delta ne devienne faux
+        next_state = self.latest_state(store.player, following[0], inclusive=True) if following else None
+
+        state = self.latest_state(store.player, before=snapshot) if previous else {}
+        changed = [
+            i for i, m in enumerate(store.metrics)
+            if m not in state or not np.allclose(state[m], (store.per90[i], store.percentiles[i]), equal_nan=True)
+        ]
+        if changed:
+            self._write_partition(store.player, snapshot, [store.metrics[i] for i in changed],
+                                  store.per90[changed], store.percentiles[changed])
+        if next_state is not None:
+            current = dict(state)
+            current.update((m, (v, p)) for m, v, p in zip(store.metrics, store.per90, store.percentiles))
+            delta = [m for m, values in next_state.items()
+                     if m not in current or not np.allclose(current[m], values, equal_nan=True)]
+            self._write_partition(store.player, following[0], delta,
+                                  np.array([next_state[m][0] for m in delta], dtype=np.float64),
+                                  np.array([next_state[m][1] for m in delta], dtype=np.float64))
+        known[snapshot] = digest
+        self._save_manifest()
+        return len(changed)
+
+    def ingest_files(self, paths, snapshot=None):
+        return {path: self.ingest(parse_scout_csv(path), snapshot) for path in paths}
+
+    def _save_manifest(self):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as handle:
+            json.dump(self.manifest, handle)
+        os.replace(tmp, self.manifest_path)
+
+    def query(self, players=None, metrics=None, start=None, end=None, exclusive_end=False):
+        """Lignes (player, snapshot, metric, per90, percentile) aux dates de changement."""
+        columns = ['player', 'snapshot', 'metric', 'per90', 'percentile']
+        if not self.manifest:
+            return pd.DataFrame(columns=columns)
+        condition = None
+
+        def add(expr):
+            nonlocal condition
+            condition = expr if condition is None else condition & expr
+
+        if players is not None:
+            add(ds.field('player').isin(list(players)))
+        if metrics is not None:
+            add(ds.field('metric').isin(list(metrics)))
+        if start is not None:
+            add(ds.field('snapshot') >= str(start))
+        if end is not None:
+            add(ds.field('snapshot') < str(end) if exclusive_end else ds.field('snapshot') <= str(end))
+        return self._dataset().to_table(columns=columns, filter=condition).to_pandas()
+
+    def trajectories(self, players, metrics, start=None, end=None):
+        """Valeurs par snapshot (index) et (joueur, métrique) (colonnes), complétées
+        vers l'avant entre les changements ; une colonne per90 et une percentile."""
+        rows = self.query(players, metrics, end=end)
+        if rows.empty:
+            return rows
+        wide = rows.pivot_table(index='snapshot', columns=['player', 'metric'],
+                                values=['per90', 'percentile'], aggfunc='last')
+        dates = sorted({d for p in players for d in self.snapshots(p)} | set(wide.index))
+        wide = wide.reindex(dates).ffill()
+        if start is not None:
+            wide = wide[wide.index >= str(start)]
+        return wide
@@ -0,0 +1,238 @@
+"""Bundle statique de la page : CSS minifié, photos redimensionnées, carte joueur.
+
+Les fichiers sont nommés d'après le hachage de leur contenu (report.3f2a….css,
+nico-320.9b1c….webp) et servis par Streamlit depuis static/
+(`server.enableStaticServing`, voir .streamlit/config.toml) : le navigateur
+les garde en cache tant que le contenu ne change pas, et chaque réexécution
+n'envoie plus qu'une balise <link> au lieu du bloc <style> complet. Les
+photos existent en plusieurs largeurs, en WebP et en PNG, pour que le
+navigateur télécharge la plus petite qui convient (srcset).
+
+manifest.json relie les noms logiques aux fichiers hachés ; sans bundle,
+l'application retombe sur le CSS en ligne.
+
+Exemple :
+    python -m scouting.assets --static-dir static
+"""
+import argparse
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+from functools import lru_cache
+from string import Template
+
+from scouting import report as report_content
+from scouting.metrics import REGISTRY
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Streamlit sert le dossier static/ situé à côté du script de l'application
+DEFAULT_STATIC_DIR = os.path.join(ROOT_DIR, 'static')
+STATIC_URL = 'app/static/'
+MANIFEST = 'manifest.json'
+# Photo source de chaque joueur (nom du StatsStore -> fichier du dépôt)
+PLAYER_IMAGES = {'Nico Williams': os.path.join(ROOT_DIR, 'nico.png')}
+IMAGE_WIDTHS = (160, 320, 640)
+WEBP_QUALITY = 80
+# Largeur d'affichage de la photo dans la sidebar, pour le choix du srcset
+CARD_IMAGE_SIZES = '(max-width: 640px) 100vw, 320px'
+
+PLAYER_CARD = Template("""
+    <div class="player-card">
+        $picture
+        <h2>📋 FICHE JOUEUR</h2>
+        <hr style="border-color: white;">
+$rows
+    </div>
+    """)
+PLAYER_CARD_ROW = Template("        <p><strong>$label:</strong> $value</p>")
+# Métriques /90 rappelées en bas de la carte
+CARD_METRICS = ('Goals + Assists', 'Shot-Creating Actions', 'Successful Take-Ons')
+
+
+def minify_css(css):
+    """Retire commentaires et espaces superflus (suffisant pour le CSS du rapport)."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{}:;,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def hashed_name(stem, data, extension):
+    return f"{stem}.{hashlib.sha1(data).hexdigest()[:10]}.{extension}"
+
+
+def _write(directory, name, data):
+    """Écrit un fichier du bundle de façon atomique ; un nom haché déjà présent est réutilisé."""
+    path = os.path.join(directory, name)
+    if os.path.exists(path):
+        return name
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return name
+
+
+def _encode(image, fmt, palette=False):
+    from PIL import Image
+
+    buf = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buf, format='WEBP', quality=WEBP_QUALITY, method=6)
+    else:
+        # Une source en palette (comme nico.png) reste en palette : sinon le PNG grossit
+        if palette:
+            image = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+        image.save(buf, format='PNG', optimize=True)
+    return buf.getvalue()
+
+
+def resize_image(path, widths=IMAGE_WIDTHS):
+    """{largeur: {'webp': octets, 'png': octets}} ; jamais d'agrandissement au-delà de l'original."""
+    from PIL import Image
+
+    with Image.open(path) as source:
+        palette = source.mode == 'P'
+        source = source.convert('RGBA')
+        chosen = sorted({min(w, source.width) for w in widths})
+        variants = {}
+        for width in chosen:
+            height = round(source.height * width / source.width)
+            image = source if width == source.width else source.resize((width, height), Image.LANCZOS)
+            variants[width] = {fmt: _encode(image, fmt, palette) for fmt in ('webp', 'png')}
+    return variants
+
+
+def build_bundle(static_dir=DEFAULT_STATIC_DIR, images=PLAYER_IMAGES, widths=IMAGE_WIDTHS, css=None):
+    """Construit le bundle et son manifeste ; retire les fichiers hachés devenus inutiles."""
+    os.makedirs(static_dir, exist_ok=True)
+    css = minify_css(report_content.CSS if css is None else css).encode('utf-8')
+    manifest = {'css': _write(static_dir, hashed_name('report', css, 'css'), css), 'images': {}}
+    for player, path in images.items():
+        if not os.path.exists(path):
+            continue
+        stem = os.path.splitext(os.path.basename(path))[0]
+        manifest['images'][player] = [
+            dict(width=width, **{fmt: _write(static_dir, hashed_name(f'{stem}-{width}', data, fmt), data)
+                                 for fmt, data in encoded.items()})
+            for width, encoded in resize_image(path, widths).items()
+        ]
+    manifest['sources'] = source_signature(images)
+
+    keep = {manifest['css'], MANIFEST} | {
+        name for variants in manifest['images'].values() for v in variants for name in (v['webp'], v['png'])
+    }
+    for name in os.listdir(static_dir):
+        if name not in keep and re.fullmatch(r'.+\.[0-9a-f]{10}\.(css|webp|png)', name):
+            os.unlink(os.path.join(static_dir, name))
+    _write_manifest(static_dir, manifest)
+    return manifest
+
+
+def _write_manifest(static_dir, manifest):
+    data = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+    fd, tmp = tempfile.mkstemp(dir=static_dir, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as handle:
+        handle.write(data)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, os.path.join(static_dir, MANIFEST))
+
+
+def source_signature(images=PLAYER_IMAGES):
+    """Empreinte des sources (CSS et photos) : le bundle est reconstruit quand elle change."""
+    digest = hashlib.sha1(report_content.CSS.encode('utf-8'))
+    for player, path in sorted(images.items()):
+        if os.path.exists(path):
+            digest.update(f'{player}:{os.path.getmtime(path)}:{os.path.getsize(path)}'.encode())
+    return digest.hexdigest()[:16]
+
+
+def _read_manifest(static_dir):
+    try:
+        with open(os.path.join(static_dir, MANIFEST), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def ensure_bundle(static_dir=DEFAULT_STATIC_DIR):
+    """Manifeste du bundle, reconstruit si les sources ont changé ; None si static/ n'est pas inscriptible."""
+    manifest = _read_manifest(static_dir)
+    if manifest is not None and manifest.get('sources') == source_signature():
+        return manifest
+    try:
+        return build_bundle(static_dir)
+    except OSError:
+        return None
+
+
+def asset_url(name):
+    return STATIC_URL + name
+
+
+def stylesheet_html(manifest):
+    """Balise <link> vers le CSS haché, ou le CSS en ligne sans bundle."""
+    if manifest is None:
+        return f"<style>{minify_css(report_content.CSS)}</style>"
+    return f'<link rel="stylesheet" href="{asset_url(manifest["css"])}">'
+
+
+def picture_html(variants, alt, sizes=CARD_IMAGE_SIZES):
+    if not variants:
+        return ''
+    webp = ', '.join(f"{asset_url(v['webp'])} {v['width']}w" for v in variants)
+    png = ', '.join(f"{asset_url(v['png'])} {v['width']}w" for v in variants)
+    fallback = asset_url(variants[len(variants) // 2]['png'])
+    return (f'<picture><source type="image/webp" srcset="{webp}" sizes="{sizes}">'
+            f'<img src="{fallback}" srcset="{png}" sizes="{sizes}" alt="{html.escape(alt)}" loading="lazy">'
+            f'</picture>')
+
+
+@lru_cache(maxsize=64)
+def _player_card(player, profile, stats, picture):
+    rows = [PLAYER_CARD_ROW.substitute(label=label, value=value) for label, value in profile]
+    if stats:
+        # Pas de ligne vide dans le bloc : Markdown y terminerait le HTML
+        rows.append('        <hr style="border-color: white;">')
+        rows += [PLAYER_CARD_ROW.substitute(label=label, value=value) for label, value in stats]
+    return PLAYER_CARD.substitute(picture=picture, rows='\n'.join(rows))
+
+
+def player_card_html(store, profile, manifest=None):
+    """Carte joueur de la sidebar : `profile` = ((libellé, valeur), ...) + per-90 lus dans le store."""
+    stats = tuple(
+        (f"{REGISTRY.get(metric).label_fr} /90",
+         f"{store.value(metric):.2f} ({report_content.ordinal(store.percentile(metric))} percentile)")
+        for metric in CARD_METRICS if metric in store.index
+    )
+    variants = (manifest or {}).get('images', {}).get(store.player, ())
+    return _player_card(store.player, tuple(profile), stats, picture_html(variants, store.player))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construit le bundle statique du rapport")
+    parser.add_argument('--static-dir', default=DEFAULT_STATIC_DIR)
+    parser.add_argument('--widths', type=int, nargs='+', default=list(IMAGE_WIDTHS))
+    args = parser.parse_args(argv)
+
+    manifest = build_bundle(args.static_dir, widths=tuple(args.widths))
+    names = [manifest['css']] + [
+        name for variants in manifest['images'].values() for v in variants for name in (v['webp'], v['png'])
+    ]
+    for name in names:
+        print(f"{os.path.getsize(os.path.join(args.static_dir, name)):>8}  {name}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
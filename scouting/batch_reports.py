@@ -0,0 +1,123 @@
+"""Génération des scouting reports en lot, sans Streamlit.
+
+Exemples :
+    python -m scouting.batch_reports nico_williams_stats.csv --format html pdf
+    python -m scouting.batch_reports --league-dir data/scout_tables --league-percentiles
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from scouting import report as report_content
+from scouting.engine import DEFAULT_LEAGUE_DIR, PercentileIndex, league_files
+from scouting.similarity import SimilarityIndex
+from scouting.stats_store import parse_scout_csv
+
+FORMATS = ('html', 'png', 'pdf')
+
+# Données chargées une fois dans le processus parent ; avec 'fork', les
+# workers en héritent sans rien relire (initializer sinon)
+_STATE = {}
+
+
+def load_state(paths, league_percentiles=False):
+    stores = [parse_scout_csv(p) for p in paths]
+    index = PercentileIndex.from_stores(stores) if len(stores) > 1 else None
+    if index is not None and league_percentiles:
+        stores = [index.store_for(s.player) for s in stores]
+    similarity = SimilarityIndex.from_percentile_index(index) if index is not None and len(stores) > 3 else None
+    return {'stores': {s.player: s for s in stores}, 'index': index, 'similarity': similarity}
+
+
+def _init_worker(paths, league_percentiles):
+    if not _STATE:
+        _STATE.update(load_state(paths, league_percentiles))
+
+
+def player_slug(player):
+    return re.sub(r'[^a-z0-9]+', '_', player.lower()).strip('_')
+
+
+def render_player(player, formats, output_dir):
+    """Écrit les fichiers d'un joueur et retourne leurs chemins."""
+    store = _STATE['stores'][player]
+    comparables = ()
+    if _STATE['similarity'] is not None:
+        radar_metrics = report_content.RADAR_METRICS.values()
+        comparables = tuple(
+            (name, tuple(_STATE['stores'][name].percentile_values(radar_metrics).tolist()))
+            for name, _ in _STATE['similarity'].neighbours(player, k=3)
+        )
+    report = report_content.build_report(store, comparables)
+
+    written = []
+    base = os.path.join(output_dir, player_slug(player))
+    for fmt in formats:
+        if fmt == 'html':
+            data = report_content.render_html(report).encode('utf-8')
+        else:
+            data = report_content.render_summary(report, fmt)
+        path = f"{base}.{fmt}"
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp, path)
+        written.append(path)
+    return written
+
+
+def generate_reports(paths, formats=('html',), output_dir='reports', workers=None,
+                     players=None, league_percentiles=False):
+    """Rend les rapports en parallèle (un processus par cœur par défaut)."""
+    os.makedirs(output_dir, exist_ok=True)
+    _STATE.clear()
+    _STATE.update(load_state(paths, league_percentiles))
+    players = list(players or _STATE['stores'])
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    written, failures = [], {}
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(tuple(paths), league_percentiles),
+    ) as pool:
+        futures = {pool.submit(render_player, p, tuple(formats), output_dir): p for p in players}
+        for future in as_completed(futures):
+            try:
+                written += future.result()
+            except Exception as exc:
+                failures[futures[future]] = exc
+    return written, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scouting reports statiques en lot")
+    parser.add_argument('csv', nargs='*', help="tableaux de scouting (CSV du notebook/scraper)")
+    parser.add_argument('--league-dir', help=f"utiliser tous les tableaux d'un dossier (ex. {DEFAULT_LEAGUE_DIR})")
+    parser.add_argument('--player', action='append', help="limiter à ces joueurs")
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['html'])
+    parser.add_argument('--output-dir', default='reports')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--league-percentiles', action='store_true',
+                        help="recalculer les percentiles sur l'ensemble des tableaux fournis")
+    args = parser.parse_args(argv)
+
+    paths = list(args.csv) + (league_files(args.league_dir) if args.league_dir else [])
+    if not paths:
+        parser.error("aucun tableau de scouting fourni")
+
+    written, failures = generate_reports(paths, args.format, args.output_dir, args.workers,
+                                         args.player, args.league_percentiles)
+    print(f"{len(written)} fichiers écrits dans {args.output_dir}")
+    for player, error in failures.items():
+        print(f"FAIL {player}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
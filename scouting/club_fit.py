@@ -0,0 +1,173 @@
+"""Score d'adéquation joueur / club, généralisation de l'ancien dict `barca_needs`.
+
+Un profil de club associe à chaque dimension une importance (0-100) et soit
+une liste de métriques FBref (niveau = moyenne de leurs percentiles), soit
+une évaluation de scout saisie dans la configuration. Le score d'un joueur
+pour un club est la moyenne, sur les dimensions, de min(importance, niveau).
+"""
+import json
+import os
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+DEFAULT_CLUB_PROFILES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'config', 'club_profiles.json',
+)
+
+
+@dataclass(frozen=True)
+class Dimension:
+    name: str
+    importance: float
+    metrics: tuple = ()
+    assessment: str = None
+    description: str = ''
+
+
+@dataclass(frozen=True)
+class ClubProfile:
+    name: str
+    dimensions: tuple
+
+
+def load_club_profiles(path=DEFAULT_CLUB_PROFILES):
+    """Retourne ({club: ClubProfile}, {joueur: {évaluation: niveau}})."""
+    with open(path, encoding='utf-8') as handle:
+        config = json.load(handle)
+    profiles = {
+        club: ClubProfile(club, tuple(
+            Dimension(name, float(spec['importance']), tuple(spec.get('metrics', ())),
+                      spec.get('assessment'), spec.get('description', ''))
+            for name, spec in dimensions.items()
+        ))
+        for club, dimensions in config['clubs'].items()
+    }
+    return profiles, config.get('assessments', {})
+
+
+class ClubFitEngine:
+    """Scores joueurs x clubs calculés en une opération matricielle.
+
+    Chaque couple (club, dimension) est une colonne k : le niveau des
+    joueurs s'obtient par un produit percentiles (P x M) @ poids (M x K),
+    puis min(niveau, importance) est moyenné par club via une matrice
+    d'appartenance (K x C). Les niveaux manquants sont ignorés.
+    """
+
+    def __init__(self, metrics, profiles, assessments=None):
+        self.metrics = tuple(metrics)
+        self.profiles = dict(profiles)
+        self.clubs = tuple(self.profiles)
+        self.assessments = assessments or {}
+        self.columns = [(club, dim) for club in self.clubs for dim in self.profiles[club].dimensions]
+
+        column = {m: j for j, m in enumerate(self.metrics)}
+        K, C = len(self.columns), len(self.clubs)
+        self._weights = np.zeros((len(self.metrics), K))
+        self._membership = np.zeros((K, C))
+        self.importance = np.empty(K)
+        for k, (club, dim) in enumerate(self.columns):
+            known = [column[m] for m in dim.metrics if m in column]
+            if known:
+                self._weights[known, k] = 1.0 / len(known)
+            self._membership[k, self.clubs.index(club)] = 1.0
+            self.importance[k] = dim.importance
+        self._assessed = [k for k, (_, dim) in enumerate(self.columns) if dim.assessment]
+
+    @classmethod
+    def from_config(cls, metrics, path=DEFAULT_CLUB_PROFILES):
+        profiles, assessments = load_club_profiles(path)
+        return cls(metrics, profiles, assessments)
+
+    def levels(self, percentiles, players=()):
+        """Niveau (0-100) de chaque joueur sur chaque colonne (club, dimension) : P x K."""
+        percentiles = np.atleast_2d(np.asarray(percentiles, dtype=np.float64))
+        known = ~np.isnan(percentiles)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            levels = (np.where(known, percentiles, 0.0) @ self._weights) / (known @ self._weights)
+        levels[:, ~self._weights.any(axis=0)] = np.nan
+        for k in self._assessed:
+            key = self.columns[k][1].assessment
+            values = [self.assessments.get(p, {}).get(key, np.nan) for p in players]
+            levels[:, k] = values if values else np.nan
+        return levels
+
+    def scores(self, percentiles, players=()):
+        """Matrice P x C des scores de compatibilité."""
+        return self.combine(self.levels(percentiles, players))
+
+    def combine(self, levels):
+        """Scores P x C à partir des niveaux P x K : moyenne par club de min(niveau, importance)."""
+        contributions = np.minimum(levels, self.importance)
+        known = ~np.isnan(contributions)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (np.where(known, contributions, 0.0) @ self._membership) / (known @ self._membership)
+
+    def score_index(self, index):
+        """Scores de tous les joueurs d'un PercentileIndex (colonnes alignées sur ses métriques).
+
+        Les évaluations de scout ne couvrent que quelques joueurs : pour que le
+        classement compare tout le monde sur les mêmes dimensions, seules les
+        dimensions mesurées par les statistiques comptent ici.
+        """
+        return ScoreTable(index.players, self.clubs, self.scores(index.percentiles))
+
+    def assessed_dimensions(self, club):
+        """Noms des dimensions d'un club notées par évaluation de scout (hors classement de ligue)."""
+        return tuple(d.name for d in self.profiles[club].dimensions if d.assessment)
+
+    def club_dimensions(self, club):
+        return self.profiles[club].dimensions
+
+    def with_importance(self, club, importance, metrics=None):
+        """Copie du moteur avec d'autres importances {dimension: 0-100} pour un club."""
+        profile = self.profiles[club]
+        dimensions = tuple(replace(d, importance=float(importance.get(d.name, d.importance)))
+                           for d in profile.dimensions)
+        profiles = dict(self.profiles, **{club: replace(profile, dimensions=dimensions)})
+        return ClubFitEngine(self.metrics if metrics is None else metrics, profiles, self.assessments)
+
+    def used_metrics(self):
+        """Métriques qui entrent dans au moins une dimension, dans l'ordre du moteur."""
+        return tuple(m for m, weights in zip(self.metrics, self._weights) if weights.any())
+
+    def player_levels(self, store, club):
+        """Niveaux d'un joueur sur les dimensions d'un club (pour le radar)."""
+        levels = self.levels(self._align(store), [store.player])[0]
+        return tuple(float(levels[k]) for k, (c, _) in enumerate(self.columns) if c == club)
+
+    def score_store(self, store):
+        return dict(zip(self.clubs, self.scores(self._align(store), [store.player])[0].tolist()))
+
+    def _align(self, store):
+        return np.array([store.percentile(m) if m in store.index else np.nan for m in self.metrics])
+
+
+class ScoreTable:
+    """Scores joueurs x clubs avec classement et top-N."""
+
+    def __init__(self, players, clubs, scores):
+        self.players = list(players)
+        self.clubs = tuple(clubs)
+        self.scores = scores
+
+    def top(self, club, n=10):
+        column = self.scores[:, self.clubs.index(club)]
+        column = np.where(np.isnan(column), -np.inf, column)
+        n = min(n, len(column))
+        best = np.argpartition(-column, n - 1)[:n] if n < len(column) else np.arange(len(column))
+        best = best[np.argsort(-column[best], kind='stable')]
+        return [(self.players[i], float(column[i])) for i in best]
+
+    def top_all(self, n=10):
+        return {club: self.top(club, n) for club in self.clubs}
+
+    def ranks(self, club):
+        """Rang (1 = meilleur) de chaque joueur pour un club."""
+        column = self.scores[:, self.clubs.index(club)]
+        order = np.argsort(-np.where(np.isnan(column), -np.inf, column), kind='stable')
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.arange(1, len(order) + 1)
+        return ranks
@@ -0,0 +1,200 @@
+"""Moteur multi-joueurs : matrice joueurs x métriques et percentiles vectorisés."""
+import glob
+import hashlib
+import os
+
+import numpy as np
+
+from scouting.metrics import LOWER_IS_BETTER
+from scouting.stats_store import build_store, parse_scout_csv
+
+DEFAULT_LEAGUE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'data', 'scout_tables',
+)
+
+
+class PercentileIndex:
+    """Matrice joueurs x métriques avec un index trié par colonne.
+
+    Les percentiles correspondent, comme sur FBref, à la part des joueurs
+    ayant une moins bonne valeur. Les valeurs manquantes (NaN) sont exclues
+    du classement et gardent un percentile NaN.
+    """
+
+    # Nombre de lignes complètes modifiées à partir duquel update_players retrie tout
+    RECOMPUTE_THRESHOLD = 0.5
+    # Identifiant des données chargées (fixé par les chargeurs) ; None pour un
+    # index construit ou modifié en mémoire
+    version = None
+
+    def __init__(self, players, metrics, values, lower_is_better=LOWER_IS_BETTER):
+        self.players = list(players)
+        self.metrics = tuple(metrics)
+        self.values = np.array(values, dtype=np.float64).reshape(len(self.players), len(self.metrics))
+        self._player_index = {p: i for i, p in enumerate(self.players)}
+        self._metric_index = {m: j for j, m in enumerate(self.metrics)}
+        self._sign = np.array([-1.0 if m in lower_is_better else 1.0 for m in self.metrics])
+        self.recompute()
+
+    def __len__(self):
+        return len(self.players)
+
+    def __contains__(self, player):
+        return player in self._player_index
+
+    def recompute(self):
+        """Recalcule tous les percentiles en une passe sur l'index trié."""
+        keyed = self.values * self._sign
+        order = np.argsort(keyed, axis=0, kind='stable')  # NaN rangés en fin de colonne
+        self._sorted = np.take_along_axis(keyed, order, axis=0)
+        self._valid = np.count_nonzero(~np.isnan(keyed), axis=0)
+
+        # Nombre de valeurs strictement inférieures : indice du début de chaque
+        # groupe d'égalités, propagé vers le bas de la colonne
+        rows = np.arange(len(self.players))[:, None]
+        starts = np.ones(keyed.shape, dtype=bool)
+        starts[1:] = self._sorted[1:] != self._sorted[:-1]
+        below = np.maximum.accumulate(np.where(starts, rows, 0), axis=0)
+
+        ranks = np.empty_like(keyed)
+        np.put_along_axis(ranks, order, below * 100.0 / np.maximum(self._valid, 1), axis=0)
+        ranks[np.isnan(keyed)] = np.nan
+        self.percentiles = ranks
+
+    def _row(self, values):
+        if isinstance(values, dict):
+            return np.array([values.get(m, np.nan) for m in self.metrics], dtype=np.float64)
+        return np.asarray(values, dtype=np.float64)
+
+    def _append_empty(self, players):
+        """Ajoute des lignes NaN (rangées en fin de colonne, hors classement)."""
+        for player in players:
+            self._player_index[player] = len(self.players)
+            self.players.append(player)
+        empty = np.full((len(players), len(self.metrics)), np.nan)
+        self.values = np.vstack([self.values, empty])
+        self.percentiles = np.vstack([self.percentiles, empty])
+        self._sorted = np.vstack([self._sorted, empty])
+
+    def add_player(self, player, values):
+        if player not in self._player_index:
+            self._append_empty([player])
+        self.update_player(player, values)
+
+    def _changed(self, row, new):
+        old = self.values[row]
+        return ~((old == new) | (np.isnan(old) & np.isnan(new)))
+
+    def update_player(self, player, values):
+        """Met à jour la ligne d'un joueur sans retrier les colonnes inchangées."""
+        self.update_players({player: values})
+
+    def update_players(self, rows):
+        """Met à jour (ou ajoute) plusieurs joueurs {joueur: valeurs}.
+
+        Chaque cellule modifiée coûte une insertion dans sa colonne triée ; au-delà
+        de `RECOMPUTE_THRESHOLD` lignes complètes modifiées, un tri global est
+        moins cher et on recalcule tout en une passe.
+        """
+        self._append_empty([p for p in rows if p not in self._player_index])
+        updates = [(self._player_index[p], self._row(v)) for p, v in rows.items()]
+        changes = [(row, new, self._changed(row, new)) for row, new in updates]
+        n_changed = sum(int(changed.sum()) for _, _, changed in changes)
+        if n_changed > self.RECOMPUTE_THRESHOLD * len(self.metrics):
+            for row, new, _ in changes:
+                self.values[row] = new
+            self.recompute()
+            return
+        for row, new, changed in changes:
+            old = self.values[row].copy()
+            self.values[row] = new
+            for j in np.flatnonzero(changed):
+                self._move(j, old[j] * self._sign[j], new[j] * self._sign[j])
+                self._rank_column(j)
+
+    def _move(self, j, old, new):
+        col = self._sorted[:, j]
+        valid = self._valid[j]
+        if np.isnan(old):
+            col = col[:-1]
+        else:
+            col = np.delete(col, np.searchsorted(col[:valid], old, side='left'))
+            valid -= 1
+        if np.isnan(new):
+            col = np.append(col, np.nan)
+        else:
+            col = np.insert(col, np.searchsorted(col[:valid], new, side='left'), new)
+            valid += 1
+        self._sorted[:, j] = col
+        self._valid[j] = valid
+
+    def _rank_column(self, j):
+        keyed = self.values[:, j] * self._sign[j]
+        valid = self._valid[j]
+        below = np.searchsorted(self._sorted[:valid, j], keyed, side='left')
+        ranks = below * 100.0 / max(valid, 1)
+        ranks[np.isnan(keyed)] = np.nan
+        self.percentiles[:, j] = ranks
+
+    def store_for(self, player):
+        row = self._player_index[player]
+        return build_store(player, self.metrics, self.values[row], self.percentiles[row])
+
+    def percentiles_for(self, player):
+        return dict(zip(self.metrics, self.percentiles[self._player_index[player]].tolist()))
+
+    @classmethod
+    def from_stores(cls, stores, lower_is_better=LOWER_IS_BETTER):
+        metrics = list(dict.fromkeys(m for s in stores for m in s.metrics))
+        column = {m: j for j, m in enumerate(metrics)}
+        values = np.full((len(stores), len(metrics)), np.nan)
+        for i, s in enumerate(stores):
+            values[i, [column[m] for m in s.metrics]] = s.per90
+        return cls([s.player for s in stores], metrics, values, lower_is_better)
+
+    @classmethod
+    def from_scout_files(cls, paths, lower_is_better=LOWER_IS_BETTER):
+        return cls.from_stores([parse_scout_csv(p) for p in paths], lower_is_better)
+
+
+def league_files(directory=DEFAULT_LEAGUE_DIR, pattern='*_stats.csv'):
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+try:
+    import streamlit as st
+    _cache = st.cache_resource(show_spinner=False)
+except ImportError:
+    from functools import lru_cache
+    _cache = lru_cache(maxsize=8)
+
+
+def _tables_signature(directory):
+    paths = tuple(league_files(directory))
+    return paths, tuple(os.path.getmtime(p) for p in paths)
+
+
+def _tables_version(paths, signature):
+    return 'csv-' + hashlib.sha1(repr((paths, signature)).encode()).hexdigest()[:12]
+
+
+def tables_version(directory=DEFAULT_LEAGUE_DIR):
+    """Version que porterait l'index de load_league_index, sans lire les tableaux ; None sans tableau."""
+    paths, signature = _tables_signature(directory)
+    return _tables_version(paths, signature) if paths else None
+
+
+@_cache
+def _load_league_index(paths, signature):
+    index = PercentileIndex.from_scout_files(paths)
+    index.version = _tables_version(paths, signature)
+    return index
+
+
+def load_league_index(directory=DEFAULT_LEAGUE_DIR):
+    """Index de la ligue (mémoïsé), ou None si le dossier ne contient aucun tableau."""
+    paths, signature = _tables_signature(directory)
+    if not paths:
+        return None
+    return _load_league_index(paths, signature)
@@ -0,0 +1,355 @@
+"""Ingestion en flux des événements de match : compteurs et per-90 calculés en ligne.
+
+Les fichiers d'événements de la ligue (JSON lines ou CSV, un événement par
+ligne, triés par match) sont lus par morceaux de `chunksize` lignes. Chaque
+morceau est réduit à des compteurs joueurs x métriques, puis jeté : la mémoire
+dépend du nombre de joueurs, pas du nombre d'événements. À la fin de chaque
+match, les per-90 des joueurs concernés sont réinjectés dans le
+PercentileIndex, qui met à jour leurs percentiles sans retrier les autres.
+
+Colonnes attendues : `match_id, player, type, outcome, x, y, end_x, end_y`,
+plus `minutes` sur les lignes de type `appearance` (une par joueur et par
+match). Coordonnées StatsBomb, comme scouting/events.py.
+
+La matrice publiée (`--publish`) n'est pas lue seule : `load_league()`
+la superpose à la matrice FBref de la ligue, et c'est ce résultat que
+l'application et l'API affichent.
+
+Exemple :
+    python -m scouting.event_stream data/event_feeds/*.jsonl --publish
+"""
+import argparse
+import os
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from scouting.engine import DEFAULT_LEAGUE_DIR, PercentileIndex, load_league_index
+from scouting.events import PITCH_LENGTH, PITCH_WIDTH, progressive_mask
+from scouting.shared_matrix import DEFAULT_SHARED_DIR, export_matrix, load_shared_matrix
+
+DEFAULT_CHUNKSIZE = 50_000
+# Dossier propre aux matrices issues des événements : elles ne couvrent qu'une
+# partie des métriques FBref (pas 'Goals + Assists', 'Key Passes'...) et sont
+# superposées à la matrice de la ligue par load_league, pas substituées
+DEFAULT_EVENT_MATRIX_DIR = os.path.join(os.path.dirname(DEFAULT_SHARED_DIR), 'event_matrix')
+# En dessous, les per-90 sont trop bruités : le joueur reste hors classement
+MIN_MINUTES = 270
+FEED_COLUMNS = ['match_id', 'player', 'type', 'outcome', 'x', 'y', 'end_x', 'end_y', 'minutes']
+ON_BALL = frozenset({'touch', 'pass', 'carry', 'take_on', 'shot', 'miscontrol', 'dispossessed'})
+
+FINAL_THIRD = PITCH_LENGTH * 2 / 3
+DEF_THIRD = PITCH_LENGTH / 3
+BOX_DEPTH = 18.0
+BOX_WIDTH = (18.0, PITCH_WIDTH - 18.0)
+
+
+def _in_box(x, y, attacking=True):
+    depth = x >= PITCH_LENGTH - BOX_DEPTH if attacking else x <= BOX_DEPTH
+    return depth & (y >= BOX_WIDTH[0]) & (y <= BOX_WIDTH[1])
+
+
+def _columns(events):
+    """Colonnes d'un lot converties une seule fois en tableaux NumPy."""
+    columns = {c: events[c].to_numpy(dtype=float) for c in ('x', 'y', 'end_x', 'end_y', 'minutes')}
+    columns['type'] = events['type'].to_numpy(dtype=object)
+    columns['outcome'] = events['outcome'].to_numpy(dtype=object)
+    return columns
+
+
+def _is(ev, kind, outcome=None):
+    mask = ev['type'] == kind
+    if outcome is not None:
+        mask &= np.isin(ev['outcome'], outcome)
+    return mask
+
+
+def _on_ball(ev):
+    return np.isin(ev['type'], list(ON_BALL))
+
+
+def _xy(ev, prefix=''):
+    return ev[f'{prefix}x'], ev[f'{prefix}y']
+
+
+def _carry_distance(ev):
+    (x, y), (end_x, end_y) = _xy(ev), _xy(ev, 'end_')
+    return np.where(_is(ev, 'carry'), np.nan_to_num(np.hypot(end_x - x, end_y - y)), 0.0)
+
+
+def _carry_progression(ev):
+    x, end_x = _xy(ev)[0], _xy(ev, 'end_')[0]
+    return np.where(_is(ev, 'carry'), np.clip(np.nan_to_num(end_x - x), 0.0, None), 0.0)
+
+
+def _progressive(ev, kind, outcome=None):
+    return _is(ev, kind, outcome) & progressive_mask(*_xy(ev), *_xy(ev, 'end_'))
+
+
+def _enters(ev, kind, region, outcome=None):
+    return _is(ev, kind, outcome) & ~region(*_xy(ev)) & region(*_xy(ev, 'end_'))
+
+
+def _final_third(x, y):
+    return x >= FINAL_THIRD
+
+
+# Nom FBref -> fonction vectorisée (colonnes d'un lot -> poids par événement).
+# Les noms sont ceux des tableaux de scouting, pour alimenter les mêmes structures.
+EVENT_METRICS = {
+    'Goals': lambda ev: _is(ev, 'shot', ['goal']),
+    'Shots Total': lambda ev: _is(ev, 'shot'),
+    'Shots on Target': lambda ev: _is(ev, 'shot', ['goal', 'saved']),
+    'Passes Attempted': lambda ev: _is(ev, 'pass'),
+    'Passes Completed': lambda ev: _is(ev, 'pass', ['success']),
+    'Progressive Passes': lambda ev: _progressive(ev, 'pass', ['success']),
+    'Passes into Final Third': lambda ev: _enters(ev, 'pass', _final_third, ['success']),
+    'Passes into Penalty Area': lambda ev: _enters(ev, 'pass', _in_box, ['success']),
+    'Touches': _on_ball,
+    'Touches (Def Pen)': lambda ev: _on_ball(ev) & _in_box(*_xy(ev), attacking=False),
+    'Touches (Def 3rd)': lambda ev: _on_ball(ev) & (_xy(ev)[0] < DEF_THIRD),
+    'Touches (Mid 3rd)': lambda ev: _on_ball(ev) & (_xy(ev)[0] >= DEF_THIRD) & (_xy(ev)[0] < FINAL_THIRD),
+    'Touches (Att 3rd)': lambda ev: _on_ball(ev) & (_xy(ev)[0] >= FINAL_THIRD),
+    'Touches (Att Pen)': lambda ev: _on_ball(ev) & _in_box(*_xy(ev)),
+    'Take-Ons Attempted': lambda ev: _is(ev, 'take_on'),
+    'Successful Take-Ons': lambda ev: _is(ev, 'take_on', ['success']),
+    'Times Tackled During Take-On': lambda ev: _is(ev, 'take_on', ['fail']),
+    'Carries': lambda ev: _is(ev, 'carry'),
+    'Total Carrying Distance': _carry_distance,
+    'Progressive Carrying Distance': _carry_progression,
+    'Progressive Carries': lambda ev: _progressive(ev, 'carry'),
+    'Carries into Final Third': lambda ev: _enters(ev, 'carry', _final_third),
+    'Carries into Penalty Area': lambda ev: _enters(ev, 'carry', _in_box),
+    'Miscontrols': lambda ev: _is(ev, 'miscontrol'),
+    'Dispossessed': lambda ev: _is(ev, 'dispossessed'),
+    'Tackles': lambda ev: _is(ev, 'tackle'),
+    'Tackles Won': lambda ev: _is(ev, 'tackle', ['success']),
+    'Interceptions': lambda ev: _is(ev, 'interception'),
+    'Tkl+Int': lambda ev: _is(ev, 'tackle') | _is(ev, 'interception'),
+    'Blocks': lambda ev: _is(ev, 'block'),
+    'Clearances': lambda ev: _is(ev, 'clearance'),
+    'Ball Recoveries': lambda ev: _is(ev, 'recovery'),
+    'Fouls Committed': lambda ev: _is(ev, 'foul_committed'),
+    'Fouls Drawn': lambda ev: _is(ev, 'foul_won'),
+    'Aerials Won': lambda ev: _is(ev, 'aerial', ['success']),
+    'Aerials Lost': lambda ev: _is(ev, 'aerial', ['fail']),
+}
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Générateur de DataFrames de `chunksize` lignes au plus (JSON lines ou CSV)."""
+    if path.endswith(('.jsonl', '.json', '.ndjson')):
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, dtype={'match_id': str})
+    else:
+        reader = pd.read_csv(path, chunksize=chunksize, dtype={'match_id': str},
+                             usecols=lambda column: column in FEED_COLUMNS)
+    with reader:
+        for chunk in reader:
+            for column in FEED_COLUMNS:
+                if column not in chunk:
+                    chunk[column] = np.nan
+            yield chunk
+
+
+def match_segments(chunks):
+    """Découpe le flux aux changements de match : (match_id, événements, match terminé ?).
+
+    Un match à cheval sur deux morceaux est livré en plusieurs segments ; seul
+    le dernier est marqué terminé.
+    """
+    current = None
+    for chunk in chunks:
+        ids = chunk['match_id'].to_numpy()
+        bounds = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+        starts = np.concatenate([[0], bounds])
+        ends = np.concatenate([bounds, [len(ids)]])
+        for start, end in zip(starts, ends):
+            match_id = ids[start]
+            if current is not None and match_id != current:
+                yield current, None, True
+            current = match_id
+            yield match_id, chunk.iloc[start:end], False
+    if current is not None:
+        yield current, None, True
+
+
+@dataclass(frozen=True)
+class MatchUpdate:
+    match_id: str
+    players: tuple
+    n_events: int
+
+
+class OnlineAggregator:
+    """Compteurs cumulés joueurs x métriques et minutes jouées, en mémoire bornée."""
+
+    def __init__(self, metrics=EVENT_METRICS, min_minutes=MIN_MINUTES):
+        self.rules = dict(metrics)
+        self.metrics = tuple(self.rules)
+        self.min_minutes = min_minutes
+        self.players = []
+        self._player_index = {}
+        self.counts = np.zeros((0, len(self.metrics)))
+        self.minutes = np.zeros(0)
+
+    def __len__(self):
+        return len(self.players)
+
+    def _codes(self, names):
+        """Indices globaux des joueurs d'un morceau, en agrandissant les tableaux si besoin."""
+        codes, uniques = pd.factorize(names)
+        rows = np.empty(len(uniques), dtype=np.intp)
+        for k, player in enumerate(uniques):
+            row = self._player_index.get(player)
+            if row is None:
+                row = self._player_index[player] = len(self.players)
+                self.players.append(player)
+            rows[k] = row
+        if len(self.players) > len(self.minutes):
+            capacity = max(2 * len(self.minutes), len(self.players), 64)
+            self.counts = np.vstack([self.counts, np.zeros((capacity - len(self.counts), len(self.metrics)))])
+            self.minutes = np.concatenate([self.minutes, np.zeros(capacity - len(self.minutes))])
+        return rows[codes], rows
+
+    def ingest(self, events):
+        """Ajoute un lot d'événements ; retourne les indices des joueurs concernés."""
+        events = events[events['player'].notna()]
+        if events.empty:
+            return np.empty(0, dtype=np.intp)
+        codes, touched = self._codes(events['player'].to_numpy())
+        columns = _columns(events)
+        size = len(self.minutes)
+        for j, rule in enumerate(self.rules.values()):
+            weights = np.asarray(rule(columns), dtype=float)
+            self.counts[:, j] += np.bincount(codes, weights=weights, minlength=size)
+        minutes = np.nan_to_num(columns['minutes']) * _is(columns, 'appearance')
+        self.minutes += np.bincount(codes, weights=minutes, minlength=size)
+        return touched
+
+    def per90(self, rows=None):
+        """Per-90 des lignes demandées ; NaN pour les joueurs sous `min_minutes`."""
+        rows = np.arange(len(self.players)) if rows is None else np.asarray(rows)
+        minutes = self.minutes[rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.round(self.counts[rows] * 90.0 / minutes[:, None], 2)
+        values[minutes < self.min_minutes] = np.nan
+        return values
+
+
+class EventStream:
+    """Agrégateur en ligne couplé à un PercentileIndex rafraîchi à chaque match."""
+
+    def __init__(self, metrics=EVENT_METRICS, min_minutes=MIN_MINUTES):
+        self.aggregator = OnlineAggregator(metrics, min_minutes)
+        self.index = PercentileIndex([], self.aggregator.metrics, np.empty((0, len(self.aggregator.metrics))))
+
+    def ingest(self, paths, chunksize=DEFAULT_CHUNKSIZE):
+        """Générateur : un MatchUpdate par match terminé, index déjà à jour."""
+        def chunks():
+            for path in paths:
+                yield from read_chunks(path, chunksize)
+
+        touched, n_events = set(), 0
+        for match_id, events, finished in match_segments(chunks()):
+            if events is not None:
+                touched.update(self.aggregator.ingest(events).tolist())
+                n_events += len(events)
+            if finished:
+                yield self._refresh(match_id, sorted(touched), n_events)
+                touched, n_events = set(), 0
+
+    def _refresh(self, match_id, rows, n_events):
+        values = self.aggregator.per90(rows)
+        players = [self.aggregator.players[row] for row in rows]
+        self.index.update_players(dict(zip(players, values)))
+        return MatchUpdate(str(match_id), tuple(players), n_events)
+
+    def store_for(self, player):
+        return self.index.store_for(player)
+
+
+def load_event_matrix(directory=DEFAULT_EVENT_MATRIX_DIR):
+    """Dernière matrice publiée par `--publish`, ou None."""
+    return load_shared_matrix(directory)
+
+
+def merge_event_metrics(league, events):
+    """PercentileIndex de la ligue où les per-90 issus des événements remplacent ceux de FBref.
+
+    Les métriques que les événements ne couvrent pas gardent leur colonne
+    FBref, de même que les per-90 NaN (joueur sous MIN_MINUTES). Les joueurs
+    présents seulement dans les événements sont ajoutés ; les percentiles
+    sont recalculés sur l'ensemble.
+    """
+    players = list(league.players) + [p for p in events.players if p not in league]
+    metrics = list(league.metrics) + [m for m in events.metrics if m not in league.metrics]
+    values = np.full((len(players), len(metrics)), np.nan)
+    values[:len(league), :len(league.metrics)] = league.values
+    rows = {p: i for i, p in enumerate(players)}
+    columns = {m: j for j, m in enumerate(metrics)}
+    block = np.ix_([rows[p] for p in events.players], [columns[m] for m in events.metrics])
+    event_values = np.asarray(events.values)
+    values[block] = np.where(np.isnan(event_values), values[block], event_values)
+    index = PercentileIndex(players, metrics, values)
+    index.version = f'{league.version}+{events.version}'
+    return index
+
+
+try:
+    import streamlit as st
+    _cache = st.cache_resource(show_spinner=False, max_entries=4)
+except ImportError:
+    from functools import lru_cache
+    _cache = lru_cache(maxsize=4)
+
+
+@_cache
+def _merged_league(league_version, events_version, _league, _events):
+    # Les paramètres préfixés par _ ne sont pas hachés par st.cache_resource
+    return merge_event_metrics(_league, _events)
+
+
+def load_league(shared_dir=DEFAULT_SHARED_DIR, league_dir=DEFAULT_LEAGUE_DIR,
+                event_dir=DEFAULT_EVENT_MATRIX_DIR):
+    """Ligue affichée : matrice partagée (ou tableaux FBref), complétée par la matrice des événements."""
+    league = load_shared_matrix(shared_dir) or load_league_index(league_dir)
+    events = load_event_matrix(event_dir)
+    if events is None:
+        return league
+    if league is None:
+        return events
+    return _merged_league(league.version, events.version, league, events)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcule les per-90 et percentiles depuis les flux d'événements")
+    parser.add_argument('paths', nargs='+', help="fichiers .jsonl ou .csv, triés par match")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--min-minutes', type=float, default=MIN_MINUTES)
+    parser.add_argument('--publish', action='store_true',
+                        help="publie la matrice (superposée à celle de la ligue par load_league)")
+    parser.add_argument('--out', default=DEFAULT_EVENT_MATRIX_DIR)
+    parser.add_argument('--publish-every', type=int, default=0,
+                        help="republie tous les N matchs (0 : seulement à la fin)")
+    args = parser.parse_args(argv)
+
+    stream = EventStream(min_minutes=args.min_minutes)
+    n_matches = n_events = 0
+    for update in stream.ingest(args.paths, args.chunksize):
+        n_matches += 1
+        n_events += update.n_events
+        if args.publish and args.publish_every and n_matches % args.publish_every == 0:
+            export_matrix(stream.index, args.out)
+    ranked = int(np.count_nonzero(~np.isnan(stream.index.values).all(axis=1)))
+    print(f"{n_matches} matchs, {n_events} événements, {len(stream.index)} joueurs "
+          f"({ranked} au-dessus de {args.min_minutes:g} minutes)")
+    if args.publish:
+        version = export_matrix(stream.index, args.out)
+        print(f"matrice publiée -> {os.path.join(args.out, version)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
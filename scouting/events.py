@@ -0,0 +1,236 @@
+"""Données d'événements (touches, conduites, dribbles) agrégées en grilles sur le terrain.
+
+Fichiers locaux : `data/events/<joueur>/<saison>/<match>.csv` avec les colonnes
+`type, x, y, end_x, end_y` en coordonnées StatsBomb (120 x 80, l'équipe attaque
+vers x = 120). Chaque saison est réduite à des histogrammes 2D par type
+d'événement et à la somme des vecteurs de conduites progressives par case de
+départ ; ces grilles sont mises en cache dans `data/event_grids/` et seuls les
+matchs arrivés depuis le dernier calcul sont relus et ajoutés.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from scouting.engine import DEFAULT_LEAGUE_DIR
+
+DEFAULT_EVENTS_DIR = os.path.join(os.path.dirname(DEFAULT_LEAGUE_DIR), 'events')
+DEFAULT_GRID_DIR = os.path.join(os.path.dirname(DEFAULT_LEAGUE_DIR), 'event_grids')
+
+PITCH_LENGTH = 120.0
+PITCH_WIDTH = 80.0
+BINS = (24, 16)
+EVENT_TYPES = ('touch', 'carry', 'take_on')
+EVENT_LABELS = {'touch': 'Touches', 'carry': 'Conduites', 'take_on': 'Dribbles tentés'}
+EVENT_COLUMNS = ['type', 'x', 'y', 'end_x', 'end_y']
+GOAL = (PITCH_LENGTH, PITCH_WIDTH / 2)
+# Conduite progressive : la distance au but adverse diminue d'au moins 25 %
+PROGRESSIVE_RATIO = 0.75
+
+
+def player_dirname(player):
+    """'Nico Williams' -> 'nico_williams' (inverse de player_name_from_path)."""
+    return player.strip().lower().replace(' ', '_')
+
+
+def bin_edges():
+    return (np.linspace(0.0, PITCH_LENGTH, BINS[0] + 1),
+            np.linspace(0.0, PITCH_WIDTH, BINS[1] + 1))
+
+
+def progressive_mask(x, y, end_x, end_y):
+    start = np.hypot(GOAL[0] - x, GOAL[1] - y)
+    end = np.hypot(GOAL[0] - end_x, GOAL[1] - end_y)
+    return np.isfinite(end) & (end <= PROGRESSIVE_RATIO * start)
+
+
+@dataclass(eq=False)
+class EventGrid:
+    """Grilles d'une saison : comptes (type, x, y) et conduites progressives par case.
+
+    Hachable par (joueur, saison, contenu) pour servir de clé aux rendus mis en cache.
+    """
+
+    player: str
+    season: str
+    counts: np.ndarray
+    progressive_count: np.ndarray
+    progressive_dx: np.ndarray
+    progressive_dy: np.ndarray
+    matches: tuple = ()
+
+    @classmethod
+    def empty(cls, player, season):
+        shape = BINS
+        return cls(player, season,
+                   np.zeros((len(EVENT_TYPES),) + shape, dtype=np.int64),
+                   np.zeros(shape, dtype=np.int64),
+                   np.zeros(shape), np.zeros(shape))
+
+    @property
+    def n_events(self):
+        return int(self.counts.sum())
+
+    @property
+    def signature(self):
+        """Identifiant du contenu, utilisé comme clé du cache des rendus."""
+        digest = hashlib.sha1(self.counts.tobytes())
+        digest.update(self.progressive_count.tobytes())
+        digest.update('\n'.join(self.matches).encode())
+        return digest.hexdigest()[:16]
+
+    def __hash__(self):
+        return hash((self.player, self.season, self.signature))
+
+    def __eq__(self, other):
+        return (isinstance(other, EventGrid)
+                and (self.player, self.season, self.signature)
+                == (other.player, other.season, other.signature))
+
+    def grid(self, event_type):
+        return self.counts[EVENT_TYPES.index(event_type)]
+
+    def add_events(self, events, match_id=None):
+        """Ajoute un tableau d'événements aux grilles (binning vectorisé, aucune boucle Python)."""
+        x_edges, y_edges = bin_edges()
+        x = np.clip(events['x'].to_numpy(dtype=float), 0.0, PITCH_LENGTH)
+        y = np.clip(events['y'].to_numpy(dtype=float), 0.0, PITCH_WIDTH)
+        codes = pd.Categorical(events['type'], categories=EVENT_TYPES).codes
+        known = codes >= 0
+        counts, _ = np.histogramdd((codes[known], x[known], y[known]),
+                                   bins=(np.arange(len(EVENT_TYPES) + 1) - 0.5, x_edges, y_edges))
+        self.counts += counts.astype(np.int64)
+
+        carries = codes == EVENT_TYPES.index('carry')
+        end_x = events['end_x'].to_numpy(dtype=float)[carries]
+        end_y = events['end_y'].to_numpy(dtype=float)[carries]
+        cx, cy = x[carries], y[carries]
+        progressive = progressive_mask(cx, cy, end_x, end_y)
+        cx, cy = cx[progressive], cy[progressive]
+        dx, dy = end_x[progressive] - cx, end_y[progressive] - cy
+        ix = np.minimum(np.searchsorted(x_edges, cx, side='right') - 1, BINS[0] - 1)
+        iy = np.minimum(np.searchsorted(y_edges, cy, side='right') - 1, BINS[1] - 1)
+        flat = np.ravel_multi_index((ix, iy), BINS)
+        size = BINS[0] * BINS[1]
+        self.progressive_count += np.bincount(flat, minlength=size).reshape(BINS)
+        self.progressive_dx += np.bincount(flat, weights=dx, minlength=size).reshape(BINS)
+        self.progressive_dy += np.bincount(flat, weights=dy, minlength=size).reshape(BINS)
+        if match_id is not None:
+            self.matches = tuple(sorted(self.matches + (match_id,)))
+        return self
+
+    def progressive_vectors(self, min_count=3):
+        """(x, y, dx moyen, dy moyen, nombre) des cases avec au moins `min_count` conduites."""
+        x_edges, y_edges = bin_edges()
+        centers_x = (x_edges[:-1] + x_edges[1:]) / 2
+        centers_y = (y_edges[:-1] + y_edges[1:]) / 2
+        ix, iy = np.nonzero(self.progressive_count >= min_count)
+        count = self.progressive_count[ix, iy]
+        return (centers_x[ix], centers_y[iy],
+                self.progressive_dx[ix, iy] / count, self.progressive_dy[ix, iy] / count, count)
+
+    def save(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.npz.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                np.savez(handle, counts=self.counts, progressive_count=self.progressive_count,
+                         progressive_dx=self.progressive_dx, progressive_dy=self.progressive_dy,
+                         matches=np.asarray(self.matches, dtype=str), bins=np.asarray(BINS))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path, player, season):
+        with np.load(path) as data:
+            if tuple(data['bins']) != BINS:
+                raise ValueError(f'grille {path} calculée avec d\'autres dimensions')
+            return cls(player, season, data['counts'], data['progressive_count'],
+                       data['progressive_dx'], data['progressive_dy'],
+                       tuple(str(match) for match in data['matches']))
+
+
+def read_events(path):
+    events = pd.read_csv(path, usecols=lambda column: column in EVENT_COLUMNS)
+    for column in ('end_x', 'end_y'):
+        if column not in events:
+            events[column] = np.nan
+    return events.dropna(subset=['x', 'y'])
+
+
+def match_files(player, season, events_dir=DEFAULT_EVENTS_DIR):
+    """{identifiant de match: chemin} des fichiers d'événements d'une saison."""
+    directory = os.path.join(events_dir, player_dirname(player), season)
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return {}
+    return {os.path.splitext(name)[0]: os.path.join(directory, name)
+            for name in sorted(names) if name.endswith('.csv')}
+
+
+def seasons(player, events_dir=DEFAULT_EVENTS_DIR):
+    directory = os.path.join(events_dir, player_dirname(player))
+    try:
+        return sorted((name for name in os.listdir(directory)
+                       if os.path.isdir(os.path.join(directory, name))), reverse=True)
+    except FileNotFoundError:
+        return []
+
+
+def update_grid(player, season, events_dir=DEFAULT_EVENTS_DIR, grid_dir=DEFAULT_GRID_DIR):
+    """Grille de la saison, en ne lisant que les matchs absents du cache.
+
+    Un match déjà agrégé n'est pas relu ; si un fichier de match disparaît ou
+    a été modifié après le calcul, la grille est recalculée depuis zéro.
+    """
+    files = match_files(player, season, events_dir)
+    path = os.path.join(grid_dir, player_dirname(player), f'{season}.npz')
+    try:
+        grid = EventGrid.load(path, player, season)
+        computed_at = os.path.getmtime(path)
+    except (FileNotFoundError, ValueError):
+        grid, computed_at = EventGrid.empty(player, season), 0.0
+    stale = any(match not in files or os.path.getmtime(files[match]) > computed_at
+                for match in grid.matches)
+    if stale:
+        grid = EventGrid.empty(player, season)
+    new = [match for match in files if match not in grid.matches]
+    for match in new:
+        grid.add_events(read_events(files[match]), match)
+    if new:
+        grid.save(path)
+    return grid
+
+
+def files_signature(player, season, events_dir=DEFAULT_EVENTS_DIR):
+    """(match, mtime) des fichiers d'une saison : change dès qu'un match arrive ou est modifié."""
+    files = match_files(player, season, events_dir)
+    return tuple((match, os.path.getmtime(path)) for match, path in files.items())
+
+
+try:
+    import streamlit as st
+    _cache = st.cache_data(show_spinner=False, max_entries=16)
+except ImportError:
+    from functools import lru_cache
+    _cache = lru_cache(maxsize=16)
+
+
+@_cache
+def _load_event_grid(player, season, events_dir, signature):
+    return update_grid(player, season, events_dir)
+
+
+def load_event_grid(player, season, events_dir=DEFAULT_EVENTS_DIR):
+    """Grille de la saison, recalculée seulement quand un fichier de match change ; None sinon."""
+    signature = files_signature(player, season, events_dir)
+    if not signature:
+        return None
+    return _load_event_grid(player, season, events_dir, signature)
@@ -0,0 +1,169 @@
+"""Fabrique des graphiques Plotly du rapport, avec cache des figures et de leur JSON.
+
+Les arguments sont des tuples (hashables) : une même sélection de joueur et
+de métriques ne construit la figure qu'une fois par processus. Les figures
+retournées sont partagées et ne doivent pas être modifiées.
+"""
+from functools import lru_cache
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+
+BLUE = '#004d98'
+GRANATE = '#a50044'
+COMPARABLE_COLORS = (GRANATE, '#FFA500', '#00a650')
+
+
+@lru_cache(maxsize=256)
+def overview_radar(player, categories, values, comparables=()):
+    """Radar de percentiles ; `comparables` = ((nom, percentiles), ...), sinon moyenne à 50."""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=values,
+        theta=categories,
+        fill='toself',
+        name=player,
+        line_color=BLUE,
+        fillcolor='rgba(0, 77, 152, 0.3)'
+    ))
+
+    if comparables:
+        for (name, comparable_values), color in zip(comparables, COMPARABLE_COLORS):
+            fig.add_trace(go.Scatterpolar(
+                r=comparable_values,
+                theta=categories,
+                name=name,
+                line_color=color
+            ))
+        title = f"Comparaison Percentiles - {player} vs Profils Similaires"
+    else:
+        fig.add_trace(go.Scatterpolar(
+            r=[50] * len(categories),
+            theta=categories,
+            fill='toself',
+            name='Moyenne des Ailiers',
+            line_color=GRANATE,
+            fillcolor='rgba(165, 0, 68, 0.1)'
+        ))
+        title = f"Comparaison Percentiles - {player} vs Moyenne"
+
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+        showlegend=True,
+        title=title,
+        height=500
+    )
+    return fig
+
+
+@lru_cache(maxsize=256)
+def offensive_bars(metrics, values, percentiles):
+    """Valeurs /90 et percentiles des forces offensives (2 lignes)."""
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Valeurs Absolues (par 90 minutes)', 'Percentiles vs autres ailiers'),
+        specs=[[{"secondary_y": False}], [{"secondary_y": False}]]
+    )
+
+    # Graphique des valeurs absolues
+    fig.add_trace(
+        go.Bar(x=metrics, y=values,
+               marker_color=[BLUE if p >= 90 else GRANATE if p >= 70 else '#FFA500' for p in percentiles],
+               name="Valeurs"),
+        row=1, col=1
+    )
+
+    # Graphique des percentiles
+    fig.add_trace(
+        go.Bar(x=metrics, y=percentiles,
+               marker_color=['#00a650' if p >= 90 else '#FFA500' if p >= 70 else '#ff6b6b' for p in percentiles],
+               name="Percentiles"),
+        row=2, col=1
+    )
+
+    fig.update_layout(height=600, showlegend=False)
+    return fig
+
+
+@lru_cache(maxsize=256)
+def defensive_bars(metrics, values, percentiles):
+    """Percentiles défensifs, annotés avec les valeurs /90."""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=metrics,
+        y=percentiles,
+        marker_color=['#ff6b6b' if p < 40 else '#FFA500' if p < 70 else '#00a650' for p in percentiles],
+        text=[f"{v:.2f}" for v in values],
+        textposition='auto'
+    ))
+
+    fig.update_layout(
+        title="Métriques Défensives (Percentiles)",
+        yaxis_title="Percentile",
+        height=400
+    )
+    return fig
+
+
+@lru_cache(maxsize=256)
+def club_fit_radar(player, club, categories, importance, levels):
+    """Besoins d'un club (importance par dimension) face au niveau du joueur."""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=importance,
+        theta=categories,
+        fill='toself',
+        name=f'Besoins {club}',
+        line_color=GRANATE,
+        fillcolor='rgba(165, 0, 68, 0.2)'
+    ))
+
+    fig.add_trace(go.Scatterpolar(
+        r=levels,
+        theta=categories,
+        fill='toself',
+        name=f'Niveau {player}',
+        line_color=BLUE,
+        fillcolor='rgba(0, 77, 152, 0.3)'
+    ))
+
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+        showlegend=True,
+        title=f"Adéquation Profil {player} / Besoins {club}",
+        height=500
+    )
+    return fig
+
+
+@lru_cache(maxsize=256)
+def form_curves(player, dates, series):
+    """Évolution de métriques entre snapshots ; `series` = ((métrique, valeurs), ...)."""
+    fig = go.Figure()
+    for metric, values in series:
+        fig.add_trace(go.Scatter(x=dates, y=values, mode='lines+markers', line_shape='hv', name=metric))
+
+    fig.update_layout(
+        title=f"Évolution des percentiles - {player}",
+        yaxis=dict(title="Percentile", range=[0, 100]),
+        height=400
+    )
+    return fig
+
+
+FIGURES = {
+    'overview_radar': overview_radar,
+    'offensive_bars': offensive_bars,
+    'defensive_bars': defensive_bars,
+    'club_fit_radar': club_fit_radar,
+    'form_curves': form_curves,
+}
+
+
+@lru_cache(maxsize=256)
+def figure_json(kind, *args):
+    """JSON Plotly prêt à envoyer au navigateur, sérialisé une seule fois."""
+    return pio.to_json(FIGURES[kind](*args), validate=False)
@@ -0,0 +1,211 @@
+"""Instrumentation optionnelle : durées, allocations et hits/miss de cache par section.
+
+Activée par SCOUTING_INSTRUMENT=1. Désactivée, `span()` retourne un
+contexte vide partagé et `record_cache()` ne fait rien : le coût se limite
+à un test de booléen.
+
+Les mesures sont cumulées dans le processus et exportées au format texte
+Prometheus (`prometheus_text()`, `write_prometheus()`). tracemalloc compte
+pour tout le processus : avec plusieurs sessions simultanées, les octets
+alloués incluent ceux des autres threads, et le pic n'est retenu que pour
+les sections exécutées sans autre section ouverte ailleurs (mesure fiable
+en session unique, comme avec `streamlit run` en local).
+"""
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get('SCOUTING_INSTRUMENT', '0') == '1'
+METRICS_PATH = os.environ.get('SCOUTING_METRICS_FILE')
+
+_NULL = nullcontext()
+_lock = threading.Lock()
+_spans = {}   # nom -> [appels, secondes, octets alloués, pic octets au-dessus de l'entrée]
+_caches = {}  # nom -> [hits, misses]
+_last = {}    # nom -> (secondes, octets alloués) du dernier appel
+_local = threading.local()
+_active = {}   # thread -> sections ouvertes
+_overlaps = 0  # entrées de section alors qu'un autre thread en avait une ouverte
+
+
+def _open_spans():
+    """Sections ouvertes du thread courant : [pic absolu vu jusqu'ici], de la plus externe à la plus interne."""
+    frames = getattr(_local, 'frames', None)
+    if frames is None:
+        frames = _local.frames = []
+    return frames
+
+
+def enable(enabled=True):
+    global ENABLED
+    ENABLED = enabled
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+if ENABLED:
+    enable()
+
+
+@contextmanager
+def _measure(name):
+    # tracemalloc n'a qu'un pic global : chaque section le remet à zéro à
+    # l'entrée, après avoir reporté le pic courant sur la section englobante,
+    # et lui reporte le sien à la sortie. Les pics sont relatifs à l'entrée.
+    global _overlaps
+    tracing = tracemalloc.is_tracing()
+    thread = threading.get_ident()
+    frames = _open_spans()
+    before = 0
+    with _lock:
+        overlaps = _overlaps
+        if any(other != thread for other in _active):
+            _overlaps += 1
+        _active[thread] = _active.get(thread, 0) + 1
+        if tracing:
+            before, peak = tracemalloc.get_traced_memory()
+            if frames:
+                frames[-1][0] = max(frames[-1][0], peak)
+            tracemalloc.reset_peak()
+    frame = [before]
+    frames.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        frames.pop()
+        with _lock:
+            _active[thread] -= 1
+            if not _active[thread]:
+                del _active[thread]
+            current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+            peak = max(frame[0], peak)
+            if frames:
+                frames[-1][0] = max(frames[-1][0], peak)
+            allocated = max(current - before, 0)
+            stats = _spans.setdefault(name, [0, 0.0, 0, 0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += allocated
+            # Un autre thread a mesuré en même temps : son reset_peak fausse ce pic
+            if _overlaps == overlaps:
+                stats[3] = max(stats[3], peak - before)
+            _last[name] = (elapsed, allocated)
+
+
+def span(name):
+    """with span('tab.pitch'): ... — mesure la section si l'instrumentation est active."""
+    return _measure(name) if ENABLED else _NULL
+
+
+def record_cache(name, hit):
+    if not ENABLED:
+        return
+    with _lock:
+        _caches.setdefault(name, [0, 0])[0 if hit else 1] += 1
+
+
+def cached_call(name, fn, *args):
+    """Appelle une fonction lru_cache et comptabilise le hit ou le miss."""
+    if not ENABLED:
+        return fn(*args)
+    hits = fn.cache_info().hits
+    result = fn(*args)
+    record_cache(name, fn.cache_info().hits > hits)
+    return result
+
+
+def snapshot():
+    with _lock:
+        return ({k: list(v) for k, v in _spans.items()},
+                {k: list(v) for k, v in _caches.items()},
+                dict(_last))
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _caches.clear()
+        _last.clear()
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text():
+    spans, caches, _ = snapshot()
+    lines = [
+        '# HELP scouting_span_calls_total Nombre d\'exécutions de la section.',
+        '# TYPE scouting_span_calls_total counter',
+    ]
+    lines += [f'scouting_span_calls_total{{span="{_label(n)}"}} {v[0]}' for n, v in sorted(spans.items())]
+    lines += [
+        '# HELP scouting_span_seconds_total Temps cumulé passé dans la section.',
+        '# TYPE scouting_span_seconds_total counter',
+    ]
+    lines += [f'scouting_span_seconds_total{{span="{_label(n)}"}} {v[1]:.6f}' for n, v in sorted(spans.items())]
+    lines += [
+        '# HELP scouting_span_allocated_bytes_total Octets alloués (tracemalloc) pendant la section.',
+        '# TYPE scouting_span_allocated_bytes_total counter',
+    ]
+    lines += [f'scouting_span_allocated_bytes_total{{span="{_label(n)}"}} {v[2]}' for n, v in sorted(spans.items())]
+    lines += [
+        '# HELP scouting_cache_requests_total Accès aux caches, par résultat.',
+        '# TYPE scouting_cache_requests_total counter',
+    ]
+    for name, (hits, misses) in sorted(caches.items()):
+        lines.append(f'scouting_cache_requests_total{{cache="{_label(name)}",result="hit"}} {hits}')
+        lines.append(f'scouting_cache_requests_total{{cache="{_label(name)}",result="miss"}} {misses}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path=None):
+    """Écrit les métriques (remplacement atomique) pour un scraper local type node_exporter.
+
+    Chaque appel a son propre fichier temporaire (sessions concurrentes) ; un
+    échec d'écriture est ignoré pour ne jamais interrompre le rendu.
+    """
+    path = path or METRICS_PATH
+    if not path:
+        return None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    except OSError:
+        return None
+    try:
+        with os.fdopen(fd, 'w') as handle:
+            handle.write(prometheus_text())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except OSError:
+        os.unlink(tmp)
+        return None
+    return path
+
+
+def render_debug_panel(st):
+    """Panneau de la sidebar avec les mesures de la session (affiché si actif)."""
+    spans, caches, last = snapshot()
+    with st.sidebar.expander("🛠️ Instrumentation", expanded=False):
+        st.dataframe(
+            [{
+                'section': name,
+                'dernier (ms)': round(last.get(name, (0, 0))[0] * 1e3, 2),
+                'moyen (ms)': round(v[1] / v[0] * 1e3, 2),
+                'appels': v[0],
+                'alloué (Kio)': round(v[2] / v[0] / 1024, 1),
+                'pic (Kio)': round(v[3] / 1024, 1),
+            } for name, v in sorted(spans.items())],
+            hide_index=True,
+        )
+        if caches:
+            st.dataframe(
+                [{'cache': name, 'hits': h, 'miss': m} for name, (h, m) in sorted(caches.items())],
+                hide_index=True,
+            )
+        st.code(prometheus_text(), language='text')
@@ -0,0 +1,253 @@
+"""Registre des métriques : identifiant entier stable, clé, libellés et catégorie.
+
+Chaque métrique du tableau de scouting FBref a un identifiant entier fixe
+(ordre du tableau ; les nouvelles métriques sont ajoutées à la fin), une clé
+canonique, le libellé FBref (utilisé dans les CSV), un libellé français, une
+catégorie et le sens du classement. Les graphiques choisissent leurs métriques
+par catégorie (`chart_metrics`) au lieu de listes tenues à la main.
+
+Le registre est figé à l'import. Un libellé inconnu (nouvelle colonne FBref)
+reçoit une métrique provisoire, hors registre, sans identifiant (`id` None)
+et dans la catégorie 'autre' : les identifiants ne dépendent donc jamais de
+l'ordre dans lequel les tableaux ont été lus.
+"""
+import re
+
+import numpy as np
+
+OFFENSIVE = 'offensive'
+POSSESSION = 'possession'
+DEFENSIVE = 'defensive'
+DISCIPLINE = 'discipline'
+OTHER = 'autre'
+CATEGORIES = (OFFENSIVE, POSSESSION, DEFENSIVE, DISCIPLINE, OTHER)
+
+
+class Metric:
+    """Définition d'une métrique ; `rank` > 0 la place dans le graphique de sa catégorie,
+    `radar` = (position, libellé d'axe) sur le radar principal, `profile` la met dans le
+    vecteur de profil de la recherche de joueurs similaires."""
+
+    __slots__ = ('id', 'key', 'label', 'label_fr', 'category', 'higher_is_better', 'rank', 'radar', 'profile')
+
+    def __init__(self, id, key, label, label_fr, category, higher_is_better=True, rank=0, radar=None,
+                 profile=False):
+        self.id = id
+        self.key = key
+        self.label = label
+        self.label_fr = label_fr
+        self.category = category
+        self.higher_is_better = higher_is_better
+        self.rank = rank
+        self.radar = radar
+        self.profile = profile
+
+    def __repr__(self):
+        return f"Metric({self.id}, {self.key!r})"
+
+
+# (id, clé, libellé FBref, libellé français, catégorie, options)
+_DEFINITIONS = (
+    (0, 'goals', 'Goals', 'Buts', OFFENSIVE, {'profile': True}),
+    (1, 'assists', 'Assists', 'Passes décisives', OFFENSIVE, {'profile': True}),
+    (2, 'goals_assists', 'Goals + Assists', 'Buts + passes décisives', OFFENSIVE, {'profile': True}),
+    (3, 'non_penalty_goals', 'Non-Penalty Goals', 'Buts hors penalty', OFFENSIVE, {'profile': True}),
+    (4, 'penalties_made', 'Penalty Kicks Made', 'Penalties marqués', OFFENSIVE, {}),
+    (5, 'penalties_attempted', 'Penalty Kicks Attempted', 'Penalties tentés', OFFENSIVE, {}),
+    (6, 'yellow_cards', 'Yellow Cards', 'Cartons jaunes', DISCIPLINE, {'lower': True, 'profile': True}),
+    (7, 'red_cards', 'Red Cards', 'Cartons rouges', DISCIPLINE, {'lower': True}),
+    (8, 'xg', 'xG: Expected Goals', 'Buts attendus (xG)', OFFENSIVE, {'profile': True}),
+    (9, 'npxg', 'npxG: Non-Penalty xG', 'xG hors penalty', OFFENSIVE, {'profile': True}),
+    (10, 'xag', 'xAG: Exp. Assisted Goals', 'Passes décisives attendues (xAG)', OFFENSIVE, {'profile': True}),
+    (11, 'npxg_xag', 'npxG + xAG', 'npxG + xAG', OFFENSIVE, {}),
+    (12, 'progressive_carries', 'Progressive Carries', 'Conduites progressives', OFFENSIVE,
+     {'rank': 3, 'radar': (3, 'Progression'), 'profile': True}),
+    (13, 'progressive_passes', 'Progressive Passes', 'Passes progressives', POSSESSION, {'profile': True}),
+    (14, 'progressive_passes_received', 'Progressive Passes Rec', 'Passes progressives reçues', POSSESSION,
+     {'profile': True}),
+    (15, 'shots', 'Shots Total', 'Tirs', OFFENSIVE, {'radar': (5, 'Tirs'), 'profile': True}),
+    (16, 'shots_on_target', 'Shots on Target', 'Tirs cadrés', OFFENSIVE, {'profile': True}),
+    (17, 'goals_per_shot', 'Goals/Shot', 'Buts par tir', OFFENSIVE, {'profile': True}),
+    (18, 'goals_per_shot_on_target', 'Goals/Shot on Target', 'Buts par tir cadré', OFFENSIVE, {}),
+    (19, 'average_shot_distance', 'Average Shot Distance', 'Distance moyenne de tir', OFFENSIVE,
+     {'profile': True}),
+    (20, 'free_kick_shots', 'Shots from Free Kicks', 'Tirs sur coup franc', OFFENSIVE, {}),
+    (21, 'npxg_per_shot', 'npxG/Shot', 'npxG par tir', OFFENSIVE, {}),
+    (22, 'goals_minus_xg', 'Goals - xG', 'Buts - xG', OFFENSIVE, {}),
+    (23, 'npg_minus_npxg', 'Non-Penalty Goals - npxG', 'Buts hors penalty - npxG', OFFENSIVE, {}),
+    (24, 'passes_completed', 'Passes Completed', 'Passes réussies', POSSESSION, {'profile': True}),
+    (25, 'passes_attempted', 'Passes Attempted', 'Passes tentées', POSSESSION, {'profile': True}),
+    (26, 'passing_distance', 'Total Passing Distance', 'Distance totale de passe', POSSESSION, {}),
+    (27, 'progressive_passing_distance', 'Progressive Passing Distance', 'Distance de passe progressive',
+     POSSESSION, {}),
+    (28, 'short_passes_completed', 'Passes Completed (Short)', 'Passes courtes réussies', POSSESSION, {}),
+    (29, 'short_passes_attempted', 'Passes Attempted (Short)', 'Passes courtes tentées', POSSESSION, {}),
+    (30, 'medium_passes_completed', 'Passes Completed (Medium)', 'Passes moyennes réussies', POSSESSION, {}),
+    (31, 'medium_passes_attempted', 'Passes Attempted (Medium)', 'Passes moyennes tentées', POSSESSION, {}),
+    (32, 'long_passes_completed', 'Passes Completed (Long)', 'Passes longues réussies', POSSESSION, {}),
+    (33, 'long_passes_attempted', 'Passes Attempted (Long)', 'Passes longues tentées', POSSESSION, {}),
+    (34, 'xa', 'xA: Expected Assists', 'Passes décisives attendues (xA)', OFFENSIVE, {}),
+    (35, 'key_passes', 'Key Passes', 'Passes clés', OFFENSIVE,
+     {'rank': 5, 'radar': (6, 'Passes Clés'), 'profile': True}),
+    (36, 'passes_final_third', 'Passes into Final Third', 'Passes dans le dernier tiers', POSSESSION, {}),
+    (37, 'passes_penalty_area', 'Passes into Penalty Area', 'Passes dans la surface', OFFENSIVE, {}),
+    (38, 'crosses_penalty_area', 'Crosses into Penalty Area', 'Centres dans la surface', OFFENSIVE, {}),
+    (39, 'live_ball_passes', 'Live-ball Passes', 'Passes en jeu', POSSESSION, {}),
+    (40, 'dead_ball_passes', 'Dead-ball Passes', 'Passes sur phase arrêtée', POSSESSION, {}),
+    (41, 'free_kick_passes', 'Passes from Free Kicks', 'Passes sur coup franc', POSSESSION, {}),
+    (42, 'through_balls', 'Through Balls', 'Passes en profondeur', OFFENSIVE, {}),
+    (43, 'switches', 'Switches', 'Changements d\'aile', POSSESSION, {}),
+    (44, 'crosses', 'Crosses', 'Centres', OFFENSIVE, {'rank': 6, 'radar': (4, 'Centres'), 'profile': True}),
+    (45, 'throw_ins', 'Throw-ins Taken', 'Touches jouées', POSSESSION, {}),
+    (46, 'corner_kicks', 'Corner Kicks', 'Corners', POSSESSION, {}),
+    (47, 'inswinging_corners', 'Inswinging Corner Kicks', 'Corners rentrants', POSSESSION, {}),
+    (48, 'outswinging_corners', 'Outswinging Corner Kicks', 'Corners sortants', POSSESSION, {}),
+    (49, 'straight_corners', 'Straight Corner Kicks', 'Corners directs', POSSESSION, {}),
+    (50, 'passes_offside', 'Passes Offside', 'Passes hors-jeu', POSSESSION, {'lower': True}),
+    (51, 'passes_blocked', 'Passes Blocked', 'Passes contrées', POSSESSION, {}),
+    (52, 'sca', 'Shot-Creating Actions', 'Actions créatrices de tir', OFFENSIVE,
+     {'rank': 4, 'radar': (2, 'Actions Créatives'), 'profile': True}),
+    (53, 'sca_live_pass', 'SCA (Live-ball Pass)', 'ACT (passe en jeu)', OFFENSIVE, {}),
+    (54, 'sca_dead_pass', 'SCA (Dead-ball Pass)', 'ACT (phase arrêtée)', OFFENSIVE, {}),
+    (55, 'sca_take_on', 'SCA (Take-On)', 'ACT (dribble)', OFFENSIVE, {}),
+    (56, 'sca_shot', 'SCA (Shot)', 'ACT (tir)', OFFENSIVE, {}),
+    (57, 'sca_fouls_drawn', 'SCA (Fouls Drawn)', 'ACT (faute subie)', OFFENSIVE, {}),
+    (58, 'sca_defensive_action', 'SCA (Defensive Action)', 'ACT (action défensive)', OFFENSIVE, {}),
+    (59, 'gca', 'Goal-Creating Actions', 'Actions créatrices de but', OFFENSIVE, {'profile': True}),
+    (60, 'gca_live_pass', 'GCA (Live-ball Pass)', 'ACB (passe en jeu)', OFFENSIVE, {}),
+    (61, 'gca_dead_pass', 'GCA (Dead-ball Pass)', 'ACB (phase arrêtée)', OFFENSIVE, {}),
+    (62, 'gca_take_on', 'GCA (Take-On)', 'ACB (dribble)', OFFENSIVE, {}),
+    (63, 'gca_shot', 'GCA (Shot)', 'ACB (tir)', OFFENSIVE, {}),
+    (64, 'gca_fouls_drawn', 'GCA (Fouls Drawn)', 'ACB (faute subie)', OFFENSIVE, {}),
+    (65, 'gca_defensive_action', 'GCA (Defensive Action)', 'ACB (action défensive)', OFFENSIVE, {}),
+    (66, 'tackles', 'Tackles', 'Tacles', DEFENSIVE, {'rank': 1, 'profile': True}),
+    (67, 'tackles_won', 'Tackles Won', 'Tacles gagnés', DEFENSIVE, {'profile': True}),
+    (68, 'tackles_def_third', 'Tackles (Def 3rd)', 'Tacles (tiers défensif)', DEFENSIVE, {}),
+    (69, 'tackles_mid_third', 'Tackles (Mid 3rd)', 'Tacles (tiers médian)', DEFENSIVE, {}),
+    (70, 'tackles_att_third', 'Tackles (Att 3rd)', 'Tacles (tiers offensif)', DEFENSIVE, {}),
+    (71, 'dribblers_tackled', 'Dribblers Tackled', 'Dribbleurs taclés', DEFENSIVE, {}),
+    (72, 'dribbles_challenged', 'Dribbles Challenged', 'Dribbles contestés', DEFENSIVE, {}),
+    (73, 'challenges_lost', 'Challenges Lost', 'Duels perdus', DEFENSIVE, {'lower': True}),
+    (74, 'blocks', 'Blocks', 'Contres', DEFENSIVE, {}),
+    (75, 'shots_blocked', 'Shots Blocked', 'Tirs contrés', DEFENSIVE, {}),
+    (76, 'interceptions', 'Interceptions', 'Interceptions', DEFENSIVE, {'rank': 2, 'profile': True}),
+    (77, 'tackles_interceptions', 'Tkl+Int', 'Tacles + interceptions', DEFENSIVE, {}),
+    (78, 'clearances', 'Clearances', 'Dégagements', DEFENSIVE, {}),
+    (79, 'errors', 'Errors', 'Erreurs', DEFENSIVE, {'lower': True}),
+    (80, 'touches', 'Touches', 'Touches de balle', POSSESSION, {}),
+    (81, 'touches_def_pen', 'Touches (Def Pen)', 'Touches (surface défensive)', POSSESSION, {}),
+    (82, 'touches_def_third', 'Touches (Def 3rd)', 'Touches (tiers défensif)', POSSESSION, {}),
+    (83, 'touches_mid_third', 'Touches (Mid 3rd)', 'Touches (tiers médian)', POSSESSION, {}),
+    (84, 'touches_att_third', 'Touches (Att 3rd)', 'Touches (tiers offensif)', POSSESSION, {}),
+    (85, 'touches_att_pen', 'Touches (Att Pen)', 'Touches (surface adverse)', POSSESSION, {}),
+    (86, 'touches_live_ball', 'Touches (Live-Ball)', 'Touches (ballon en jeu)', POSSESSION, {}),
+    (87, 'take_ons_attempted', 'Take-Ons Attempted', 'Dribbles tentés', OFFENSIVE,
+     {'rank': 1, 'radar': (1, 'Dribbles'), 'profile': True}),
+    (88, 'take_ons_successful', 'Successful Take-Ons', 'Dribbles réussis', OFFENSIVE,
+     {'rank': 2, 'profile': True}),
+    (89, 'tackled_during_take_on', 'Times Tackled During Take-On', 'Dribbles stoppés', POSSESSION,
+     {'lower': True, 'rank': 4, 'profile': True}),
+    (90, 'carries', 'Carries', 'Conduites de balle', POSSESSION, {'profile': True}),
+    (91, 'carrying_distance', 'Total Carrying Distance', 'Distance totale de conduite', POSSESSION,
+     {'profile': True}),
+    (92, 'progressive_carrying_distance', 'Progressive Carrying Distance', 'Distance de conduite progressive',
+     POSSESSION, {'profile': True}),
+    (93, 'carries_final_third', 'Carries into Final Third', 'Conduites dans le dernier tiers', OFFENSIVE,
+     {'profile': True}),
+    (94, 'carries_penalty_area', 'Carries into Penalty Area', 'Conduites dans la surface', OFFENSIVE,
+     {'profile': True}),
+    (95, 'miscontrols', 'Miscontrols', 'Contrôles manqués', POSSESSION, {'lower': True}),
+    (96, 'dispossessed', 'Dispossessed', 'Dépossessions', POSSESSION, {'lower': True}),
+    (97, 'passes_received', 'Passes Received', 'Passes reçues', POSSESSION, {}),
+    (98, 'second_yellow_cards', 'Second Yellow Card', 'Deuxièmes cartons jaunes', DISCIPLINE, {'lower': True}),
+    (99, 'fouls_committed', 'Fouls Committed', 'Fautes commises', DISCIPLINE, {'lower': True}),
+    (100, 'fouls_drawn', 'Fouls Drawn', 'Fautes subies', DISCIPLINE, {'profile': True}),
+    (101, 'offsides', 'Offsides', 'Hors-jeu', DISCIPLINE, {'lower': True}),
+    (102, 'penalties_won', 'Penalty Kicks Won', 'Penalties obtenus', OFFENSIVE, {}),
+    (103, 'penalties_conceded', 'Penalty Kicks Conceded', 'Penalties concédés', DISCIPLINE, {'lower': True}),
+    (104, 'own_goals', 'Own Goals', 'Buts contre son camp', DISCIPLINE, {'lower': True}),
+    (105, 'ball_recoveries', 'Ball Recoveries', 'Ballons récupérés', DEFENSIVE, {'rank': 3, 'profile': True}),
+    (106, 'aerials_won', 'Aerials Won', 'Duels aériens gagnés', DEFENSIVE, {}),
+    (107, 'aerials_lost', 'Aerials Lost', 'Duels aériens perdus', DEFENSIVE, {'lower': True}),
+)
+
+
+def _slug(label):
+    return re.sub(r'[^a-z0-9]+', '_', label.lower()).strip('_')
+
+
+class MetricRegistry:
+    """Métriques indexées par identifiant (liste), libellé FBref et clé (dicts)."""
+
+    def __init__(self, definitions=_DEFINITIONS):
+        self._metrics = []
+        self._by_label = {}
+        self._by_key = {}
+        for id, key, label, label_fr, category, options in definitions:
+            if id != len(self._metrics):
+                raise ValueError(f"identifiants non contigus : {id} pour {label!r}")
+            metric = Metric(id, key, label, label_fr, category, not options.get('lower', False),
+                            options.get('rank', 0), options.get('radar'), options.get('profile', False))
+            self._metrics.append(metric)
+            self._by_label[label] = metric
+            self._by_key[key] = metric
+
+    def __len__(self):
+        return len(self._metrics)
+
+    def __iter__(self):
+        return iter(self._metrics)
+
+    def __contains__(self, label):
+        return label in self._by_label
+
+    def __getitem__(self, id):
+        return self._metrics[id]
+
+    def get(self, label):
+        """Métrique d'un libellé FBref ; un libellé inconnu donne une métrique provisoire sans identifiant."""
+        metric = self._by_label.get(label)
+        if metric is None:
+            metric = Metric(None, _slug(label), label, label, OTHER)
+        return metric
+
+    def defined_labels(self):
+        """Libellés FBref des métriques du registre."""
+        return tuple(m.label for m in self._metrics)
+
+    def by_key(self, key):
+        return self._by_key[key]
+
+    def id(self, label):
+        return self.get(label).id
+
+    def ids(self, labels):
+        """Identifiants des libellés, -1 pour ceux absents du registre."""
+        return np.fromiter((self._by_label[label].id if label in self._by_label else -1 for label in labels),
+                           dtype=np.int32, count=len(labels))
+
+    def by_category(self, category):
+        return tuple(m.label for m in self._metrics if m.category == category)
+
+    def chart_metrics(self, *categories):
+        """Libellés FBref mis en avant dans les graphiques de ces catégories, dans l'ordre des rangs."""
+        chosen = [m for m in self._metrics if m.rank and m.category in categories]
+        return tuple(m.label for m in sorted(chosen, key=lambda m: (m.rank, m.id)))
+
+    def radar_axes(self):
+        """{libellé d'axe: libellé FBref} du radar principal."""
+        return {m.radar[1]: m.label for m in sorted((m for m in self._metrics if m.radar),
+                                                      key=lambda m: m.radar)}
+
+    def profile_metrics(self):
+        """Libellés FBref du vecteur de profil (similarité), dans l'ordre des identifiants."""
+        return tuple(m.label for m in self._metrics if m.profile)
+
+    def lower_is_better(self):
+        return frozenset(m.label for m in self._metrics if not m.higher_is_better)
+
+
+REGISTRY = MetricRegistry()
+
+# Métriques pour lesquelles FBref inverse le percentile (moins = mieux)
+LOWER_IS_BETTER = REGISTRY.lower_is_better()
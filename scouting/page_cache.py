@@ -0,0 +1,148 @@
+"""Cache disque des pages FBref (HTML brut + tableau parsé), adressé par contenu.
+
+Chaque URL pointe vers l'empreinte SHA-256 de son HTML. Le HTML est stocké
+compressé (gzip) et le tableau parsé dans un .npz, si bien qu'une page
+inchangée n'est jamais reparsée, qu'elle soit servie depuis le cache, après
+un 304 Not Modified ou après un 200 au contenu identique.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from scouting.engine import DEFAULT_LEAGUE_DIR
+from scouting.stats_store import PER90_COLUMN, PERCENTILE_COLUMN, STAT_COLUMN
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(DEFAULT_LEAGUE_DIR), 'http_cache')
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as handle:
+        handle.write(data)
+    os.replace(tmp, path)
+
+
+class PageCache:
+    """Cache HTTP local avec revalidation ETag/Last-Modified, TTL et éviction LRU.
+
+    ttl : durée (s) pendant laquelle une page est servie sans contacter le site.
+    max_bytes : taille totale au-delà de laquelle les pages les moins
+    récemment utilisées sont supprimées.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=24 * 3600, max_bytes=512 * 1024 ** 2):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(directory, 'blobs')
+        self.index_path = os.path.join(directory, 'index.json')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.hits = self.misses = self.revalidated = 0
+        try:
+            with open(self.index_path) as handle:
+                self.entries = json.load(handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def _blob(self, digest, suffix):
+        return os.path.join(self.blob_dir, digest + suffix)
+
+    def lookup(self, url):
+        return self.entries.get(url)
+
+    def is_fresh(self, entry, now=None):
+        return (now or time.time()) - entry['fetched_at'] < self.ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, html, etag=None, last_modified=None):
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob(digest, '.html.gz')
+        if not os.path.exists(path):
+            _atomic_write(path, gzip.compress(data))
+        now = time.time()
+        self.entries[url] = {
+            'digest': digest, 'etag': etag, 'last_modified': last_modified,
+            'fetched_at': now, 'last_access': now,
+        }
+        self.misses += 1
+        return self.entries[url]
+
+    def mark_revalidated(self, url):
+        """Réponse 304 : la page en cache redevient fraîche."""
+        entry = self.entries[url]
+        entry['fetched_at'] = entry['last_access'] = time.time()
+        self.revalidated += 1
+        return entry
+
+    def mark_hit(self, url):
+        entry = self.entries[url]
+        entry['last_access'] = time.time()
+        self.hits += 1
+        return entry
+
+    def html(self, entry):
+        with open(self._blob(entry['digest'], '.html.gz'), 'rb') as handle:
+            return gzip.decompress(handle.read()).decode('utf-8')
+
+    def table(self, entry, table_id, parse):
+        """Tableau parsé pour cette version de la page ; `parse(html, table_id)` si absent."""
+        path = self._blob(entry['digest'], f'.{table_id}.npz')
+        if os.path.exists(path):
+            with np.load(path) as data:
+                return pd.DataFrame({
+                    STAT_COLUMN: data['statistic'],
+                    PER90_COLUMN: data['per90'],
+                    PERCENTILE_COLUMN: data['percentile'],
+                })
+        df = parse(self.html(entry), table_id)
+        fd, tmp = tempfile.mkstemp(dir=self.blob_dir, suffix='.npz')
+        with os.fdopen(fd, 'wb') as handle:
+            np.savez_compressed(
+                handle,
+                statistic=np.asarray(df[STAT_COLUMN], dtype=str),
+                per90=df[PER90_COLUMN].to_numpy(),
+                percentile=df[PERCENTILE_COLUMN].to_numpy(),
+            )
+        os.replace(tmp, path)
+        return df
+
+    def evict(self):
+        """Supprime les pages les moins récemment utilisées au-delà de max_bytes."""
+        sizes = {}
+        for name in os.listdir(self.blob_dir):
+            digest = name.split('.', 1)[0]
+            sizes[digest] = sizes.get(digest, 0) + os.path.getsize(os.path.join(self.blob_dir, name))
+        referenced = {e['digest'] for e in self.entries.values()}
+        orphans = set(sizes) - referenced
+        total = sum(size for digest, size in sizes.items() if digest in referenced)
+
+        by_age = sorted(self.entries.items(), key=lambda item: item[1]['last_access'])
+        for url, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            del self.entries[url]
+            if all(e['digest'] != entry['digest'] for e in self.entries.values()):
+                orphans.add(entry['digest'])
+                total -= sizes.get(entry['digest'], 0)
+
+        for name in os.listdir(self.blob_dir):
+            if name.split('.', 1)[0] in orphans:
+                os.unlink(os.path.join(self.blob_dir, name))
+
+    def flush(self):
+        self.evict()
+        _atomic_write(self.index_path, json.dumps(self.entries).encode('utf-8'))
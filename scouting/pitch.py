@@ -0,0 +1,145 @@
+"""Rendu du terrain (onglet 'Position sur Terrain') avec mise en cache des PNG.
+
+Chaque PNG (schéma tactique fixe, ou carte de chaleur des événements de
+scouting/events.py) est dessiné directement avec mplsoccer puis gardé en
+cache par (joueur, layout, style).
+"""
+import io
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Ellipse
+from mplsoccer import Pitch
+
+
+@dataclass(frozen=True)
+class PitchStyle:
+    pitch_color: str = '#2d5a2d'
+    line_color: str = 'white'
+    linewidth: int = 2
+    figsize: tuple = (12, 8)
+    dpi: int = 150
+
+
+@dataclass(frozen=True)
+class Zone:
+    center: tuple
+    width: float
+    height: float
+    alpha: float
+    color: str
+    label: str
+
+
+@dataclass(frozen=True)
+class Movement:
+    start: tuple
+    delta: tuple
+    color: str
+    text: str
+    text_position: tuple
+
+
+@dataclass(frozen=True)
+class PitchLayout:
+    """Position principale, zones d'influence et mouvements typiques d'un joueur."""
+
+    position: tuple
+    zones: tuple = ()
+    movements: tuple = ()
+
+
+LEFT_WINGER_LAYOUT = PitchLayout(
+    position=(20, 15),
+    zones=(
+        Zone((25, 20), 30, 25, 0.3, '#004d98', 'Zone d\'influence principale'),
+        Zone((15, 25), 20, 15, 0.2, '#a50044', 'Zone de repli défensif'),
+    ),
+    movements=(
+        Movement((20, 15), (15, 5), 'yellow', 'Rentrées\ndans l\'axe', (28, 22)),
+        Movement((20, 15), (25, -5), '#00ff00', 'Courses\nen surface', (45, 8)),
+        Movement((20, 15), (5, -10), 'orange', 'Débordements', (27, 2)),
+    ),
+)
+
+
+def new_pitch_figure(style=PitchStyle()):
+    """Figure avec le terrain mplsoccer, prête pour les annotations.
+
+    Le terrain est redessiné à chaque rendu : c'est plus rapide que d'afficher
+    une image pré-rendue pleine résolution puis de la réencoder, et le PNG
+    final est de toute façon mis en cache par joueur.
+    """
+    fig = Figure(figsize=style.figsize, dpi=style.dpi, facecolor=style.pitch_color)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    Pitch(pitch_color=style.pitch_color, line_color=style.line_color,
+          linewidth=style.linewidth).draw(ax=ax)
+    return fig, ax
+
+
+def figure_to_png(fig, style=PitchStyle()):
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', facecolor=style.pitch_color, dpi=style.dpi, bbox_inches='tight')
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=128)
+def render_player_pitch(player, layout=LEFT_WINGER_LAYOUT, style=PitchStyle()):
+    """PNG du positionnement d'un joueur, calculé une fois par (joueur, layout, style)."""
+    fig, ax = new_pitch_figure(style)
+
+    # Position principale
+    x, y = layout.position
+    ax.scatter(x, y, s=300, c='#004d98', marker='o', edgecolors='white', linewidth=2, label='Position Principale')
+    ax.text(x, y - 3, player.upper().replace(' ', '\n'), ha='center', va='top', color='white', fontsize=10, fontweight='bold')
+
+    # Zones d'influence
+    for zone in layout.zones:
+        ax.add_patch(Ellipse(zone.center, zone.width, zone.height, alpha=zone.alpha, color=zone.color, label=zone.label))
+
+    # Mouvements offensifs typiques
+    for move in layout.movements:
+        ax.arrow(*move.start, *move.delta, head_width=2, head_length=2, fc=move.color, ec=move.color, alpha=0.8)
+        ax.text(*move.text_position, move.text, ha='center', color=move.color, fontsize=9)
+
+    ax.set_title(f'{player} - Positionnement et Mouvements Tactiques',
+                 fontsize=16, fontweight='bold', color='white', pad=20)
+    ax.legend(loc='upper left', framealpha=0.8)
+    return figure_to_png(fig, style)
+
+
+def warm_up(players=(), layout=LEFT_WINGER_LAYOUT, style=PitchStyle()):
+    """Charge matplotlib/mplsoccer (polices, caches) et pré-calcule les PNG des joueurs donnés."""
+    new_pitch_figure(style)
+    for player in players:
+        render_player_pitch(player, layout, style)
+
+
+@lru_cache(maxsize=64)
+def render_event_pitch(grid, event_type='touch', style=PitchStyle(), min_carries=3):
+    """PNG de la carte de chaleur d'une saison et des conduites progressives moyennes par zone.
+
+    Le coût ne dépend que de la taille de la grille, pas du nombre d'événements.
+    """
+    from scouting.events import EVENT_LABELS, bin_edges
+
+    fig, ax = new_pitch_figure(style)
+    x_edges, y_edges = bin_edges()
+    counts = grid.grid(event_type)
+    if counts.any():
+        ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap='hot',
+                      alpha=0.6, shading='flat', zorder=1)
+
+    x, y, dx, dy, n = grid.progressive_vectors(min_carries)
+    if len(n):
+        ax.quiver(x, y, dx, dy, n, angles='xy', scale_units='xy', scale=1, cmap='cool',
+                  width=0.004, alpha=0.9, zorder=2)
+
+    ax.set_title(f'{grid.player} - {EVENT_LABELS[event_type]} ({grid.season}, '
+                 f'{len(grid.matches)} matchs) et conduites progressives',
+                 fontsize=14, fontweight='bold', color='white', pad=20)
+    return figure_to_png(fig, style)
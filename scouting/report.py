@@ -0,0 +1,434 @@
+"""Contenu du scouting report, indépendant de Streamlit.
+
+`build_report` calcule tout ce qu'affiche la page (cartes de métriques,
+forces, faiblesses, radars, compatibilité) à partir d'un StatsStore ;
+`render_html` et `render_summary` en produisent des versions statiques.
+"""
+import base64
+import html
+import io
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from scouting.metrics import DEFENSIVE, OFFENSIVE, POSSESSION, REGISTRY
+
+CSS = """
+    .main-header {
+        background: linear-gradient(90deg, #004d98 0%, #a50044 100%);
+        padding: 2rem;
+        margin: -1rem -1rem 2rem -1rem;
+        color: white;
+        text-align: center;
+        border-radius: 10px;
+    }
+    .player-card {
+        background: linear-gradient(135deg, #004d98 0%, #a50044 100%);
+        padding: 1.5rem;
+        border-radius: 15px;
+        color: white;
+        margin: 1rem 0;
+    }
+    .player-card img {
+        width: 100%;
+        height: auto;
+        border-radius: 10px;
+    }
+    .metric-card {
+        background: white;
+        padding: 1rem;
+        border-radius: 10px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        border-left: 4px solid #004d98;
+        margin: 0.5rem 0;
+    }
+    .strength-card {
+        background: linear-gradient(135deg, #00a650 0%, #007d3c 100%);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+    }
+    .weakness-card {
+        background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+    }
+    .barca-colors {
+        background: linear-gradient(45deg, #004d98, #a50044);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        font-weight: bold;
+    }
+"""
+
+# Axes du radar principal -> métrique FBref, et métriques des graphiques par
+# catégorie : tout vient du registre (scouting/metrics.py)
+RADAR_METRICS = REGISTRY.radar_axes()
+OFFENSIVE_METRICS = REGISTRY.chart_metrics(OFFENSIVE)
+# L'onglet défensif montre aussi les pertes de balle (catégorie possession)
+DEFENSIVE_METRICS = REGISTRY.chart_metrics(DEFENSIVE, POSSESSION)
+
+DEFAULT_CLUB = 'FC Barcelona'
+
+
+def ordinal(percentile):
+    """57 -> '57e', 1 -> '1er'."""
+    return '1er' if round(percentile) == 1 else f'{percentile:.0f}e'
+
+
+@dataclass(frozen=True)
+class MetricCard:
+    title: str
+    value: str
+    caption: str
+
+
+@dataclass(frozen=True)
+class Insight:
+    """Bloc force/faiblesse : items = ((texte, en gras ?), ...)."""
+
+    title: str
+    items: tuple
+    kind: str = 'strength'
+
+
+@dataclass(frozen=True)
+class ClubFit:
+    club: str
+    categories: tuple
+    importance: tuple
+    levels: tuple
+    score: float
+
+
+@dataclass(frozen=True)
+class ScoutingReport:
+    player: str
+    cards: tuple
+    advanced: tuple
+    strengths: tuple
+    weaknesses: tuple
+    radar_categories: tuple
+    radar_values: tuple
+    comparables: tuple
+    offensive: tuple
+    defensive: tuple
+    club_fit: ClubFit
+    extras: dict = field(default_factory=dict, compare=False)
+
+
+def _per90(store, metric, unit):
+    return f"{store.value(metric):.2f}{unit}/90min ({ordinal(store.percentile(metric))} percentile)"
+
+
+def metric_cards(store):
+    def card(title, metric, unit):
+        return MetricCard(title, f"{store.value(metric):.2f}{unit}", f"{ordinal(store.percentile(metric))} percentile")
+
+    return (
+        card('⚽ BUTS + PASSES', 'Goals + Assists', ' /90min'),
+        card('🎭 DRIBBLES', 'Take-Ons Attempted', ' tentatives'),
+        card('🚀 ACTIONS CRÉATIVES', 'Shot-Creating Actions', ' /90min'),
+        card('📈 PROGRESSION', 'Progressive Carries', ' courses'),
+    )
+
+
+def advanced_metrics(store):
+    """Colonnes de st.metric de l'onglet 'Métriques Avancées' : (libellé, valeur, légende)."""
+    def pct(metric, suffix=''):
+        return f"{ordinal(store.percentile(metric))} percentile{suffix}"
+
+    goals_minus_xg = store.value('Goals - xG')
+    return (
+        (
+            ('🎯 Goals - xG', f"{goals_minus_xg:+.2f}",
+             'Surperforme ses Expected Goals' if goals_minus_xg > 0 else 'Sous-performe ses Expected Goals'),
+            ('📈 Progressive Passes Rec', f"{store.value('Progressive Passes Rec'):g}", pct('Progressive Passes Rec')),
+            ('🏃 Carries into Final Third', f"{store.value('Carries into Final Third'):g}", pct('Carries into Final Third')),
+        ),
+        (
+            ('⚽ Goals + Assists', f"{store.value('Goals + Assists'):g}", 'Production offensive solide'),
+            ('🎭 Successful Take-Ons', f"{store.value('Successful Take-Ons'):g}",
+             pct('Successful Take-Ons', ' - Elite' if store.percentile('Successful Take-Ons') >= 95 else '')),
+            ('📊 Shot-Creating Actions', f"{store.value('Shot-Creating Actions'):g}", pct('Shot-Creating Actions')),
+        ),
+        (
+            ('🎯 Key Passes', f"{store.value('Key Passes'):g}", pct('Key Passes')),
+            ('🚀 Progressive Carrying Distance', f"{store.value('Progressive Carrying Distance'):g}m",
+             pct('Progressive Carrying Distance')),
+            ('⚡ Total Carrying Distance', f"{store.value('Total Carrying Distance'):g}m", pct('Total Carrying Distance')),
+        ),
+    )
+
+
+def strengths(store):
+    attempted = store.value('Take-Ons Attempted')
+    # Une matrice d'événements peut donner 0 tentative (aucun dribble dans le flux)
+    success_rate = f"{store.value('Successful Take-Ons') / attempted * 100:.0f}%" if attempted else 'n/d'
+    return (
+        Insight("🎭 DRIBBLES D'ÉLITE MONDIALE", (
+            (_per90(store, 'Take-Ons Attempted', ' tentatives'), True),
+            (_per90(store, 'Successful Take-Ons', ' réussites'), True),
+            (f"Taux de réussite: {success_rate} - Excellent pour un ailier", False),
+            ("Capable de déséquilibrer n'importe quelle défense", False),
+        )),
+        Insight("🚀 PROGRESSION EXCEPTIONNELLE", (
+            (_per90(store, 'Progressive Carries', ' courses progressives'), True),
+            (_per90(store, 'Carries into Penalty Area', ' courses en surface'), True),
+            (f"{store.value('Progressive Carrying Distance'):g}m de distance progressive par match", False),
+            ("Parfait pour le jeu de possession barcelonais", False),
+        )),
+        Insight("🎯 CRÉATION D'OCCASIONS", (
+            (_per90(store, 'Shot-Creating Actions', ' actions créatives'), True),
+            (_per90(store, 'Key Passes', ' passes clés'), True),
+            (f"{store.value('Goal-Creating Actions'):.2f} actions créatrices de but/90min", False),
+            ("Impact direct sur les statistiques offensives", False),
+        )),
+        Insight("⚡ VITESSE ET CENTRES", (
+            (_per90(store, 'Crosses', ' centres'), True),
+            ("Excellent dans les transitions rapides", False),
+            ("Capable de jouer sur les deux flancs", False),
+            ("Profil moderne recherché par Barcelone", False),
+        )),
+    )
+
+
+def weaknesses(store):
+    return (
+        Insight("⚠️ ENGAGEMENT DÉFENSIF LIMITÉ", (
+            (_per90(store, 'Tackles', ' tacles'), False),
+            (_per90(store, 'Interceptions', ' interceptions'), False),
+            ("Besoin d'améliorer le pressing défensif", False),
+            ("Adaptation nécessaire au système Barça", False),
+        ), 'weakness'),
+        Insight("🔄 PERTES DE BALLE", (
+            (_per90(store, 'Times Tackled During Take-On', ' dribbles subis'), False),
+            (_per90(store, 'Dispossessed', ' dépossessions'), False),
+            ("Ratio à améliorer pour le jeu de possession", False),
+            ("Formation tactique recommandée", False),
+        ), 'weakness'),
+    )
+
+
+@lru_cache(maxsize=8)
+def club_fit_engine(metrics):
+    from scouting.club_fit import ClubFitEngine
+
+    return ClubFitEngine.from_config(metrics)
+
+
+def club_fit(store, club=DEFAULT_CLUB, engine=None):
+    """Besoins d'un profil de club (config/club_profiles.json) et niveau du joueur."""
+    engine = engine or club_fit_engine(store.metrics)
+    dimensions = engine.club_dimensions(club)
+    return ClubFit(
+        club,
+        tuple(d.name for d in dimensions),
+        tuple(d.importance for d in dimensions),
+        engine.player_levels(store, club),
+        engine.score_store(store)[club],
+    )
+
+
+def comparables(player, league, similarity, k=3):
+    """Percentiles radar des k joueurs les plus proches (vide sans index de ligue)."""
+    if similarity is None or league is None or player not in league:
+        return ()
+    radar_metrics = RADAR_METRICS.values()
+    return tuple(
+        (name, tuple(league.percentiles_for(name).get(m) for m in radar_metrics))
+        for name, _ in similarity.neighbours(player, k=k) if name in league
+    )
+
+
+def build_report(store, comparables=(), club=DEFAULT_CLUB):
+    """Contenu complet du rapport ; `comparables` = ((nom, percentiles radar), ...)."""
+    radar_metrics = tuple(RADAR_METRICS.values())
+    return ScoutingReport(
+        player=store.player,
+        cards=metric_cards(store),
+        advanced=advanced_metrics(store),
+        strengths=strengths(store),
+        weaknesses=weaknesses(store),
+        radar_categories=tuple(RADAR_METRICS),
+        radar_values=tuple(store.percentile_values(radar_metrics).tolist()),
+        comparables=tuple(comparables),
+        offensive=_series(store, OFFENSIVE_METRICS),
+        defensive=_series(store, DEFENSIVE_METRICS),
+        club_fit=club_fit(store, club),
+    )
+
+
+def _series(store, metrics):
+    return tuple(metrics), tuple(store.values(metrics).tolist()), tuple(store.percentile_values(metrics).tolist())
+
+
+# --- Fragments HTML partagés par l'application et l'export statique ---
+
+def metric_card_html(card):
+    return f"""
+        <div class="metric-card">
+            <h3 style="color: #004d98; margin: 0;">{card.title}</h3>
+            <h2 style="margin: 5px 0;">{card.value}</h2>
+            <p style="margin: 0; color: #666;">{card.caption}</p>
+        </div>
+        """
+
+
+def insight_html(insight):
+    items = "\n".join(
+        f"                <li><strong>{html.escape(text)}</strong></li>" if bold
+        else f"                <li>{html.escape(text)}</li>"
+        for text, bold in insight.items
+    )
+    return f"""
+        <div class="{insight.kind}-card">
+            <h3>{insight.title}</h3>
+            <ul>
+{items}
+            </ul>
+        </div>
+        """
+
+
+def compatibility_label(score):
+    if score >= 75:
+        return 'TRÈS COMPATIBLE'
+    if score >= 60:
+        return 'COMPATIBLE'
+    return 'PEU COMPATIBLE'
+
+
+def compatibility_html(fit, interval=None):
+    spread = f'<p style="font-size: 1.1rem; opacity: 0.9;">{interval.label}</p>' if interval else ''
+    return f"""
+    <div style="background: linear-gradient(135deg, #004d98, #a50044); padding: 2rem; border-radius: 15px; text-align: center; color: white; margin: 2rem 0;">
+        <h2>🎯 SCORE DE COMPATIBILITÉ {fit.club.upper()}</h2>
+        <h1 style="font-size: 3rem; margin: 1rem 0;">{fit.score:.0f}/100</h1>
+        {spread}
+        <p style="font-size: 1.2rem;">Profil {compatibility_label(fit.score)} avec le profil recherché ({fit.club})</p>
+    </div>
+    """
+
+
+def report_figures(report):
+    from scouting import figures
+
+    return (
+        figures.overview_radar(report.player, report.radar_categories, report.radar_values, report.comparables),
+        figures.offensive_bars(*report.offensive),
+        figures.defensive_bars(*report.defensive),
+        figures.club_fit_radar(report.player, report.club_fit.club, report.club_fit.categories,
+                               report.club_fit.importance, report.club_fit.levels),
+    )
+
+
+def render_html(report):
+    """Page HTML autonome (Plotly chargé depuis le CDN, terrain intégré en base64)."""
+    import plotly.io as pio
+    from scouting.pitch import render_player_pitch
+
+    charts = "\n".join(
+        pio.to_html(fig, full_html=False, include_plotlyjs='cdn' if i == 0 else False)
+        for i, fig in enumerate(report_figures(report))
+    )
+    pitch = base64.b64encode(render_player_pitch(report.player)).decode('ascii')
+    cards = "".join(metric_card_html(c) for c in report.cards)
+    strengths_html = "".join(insight_html(i) for i in report.strengths)
+    weaknesses_html = "".join(insight_html(i) for i in report.weaknesses)
+    title = html.escape(report.player.upper())
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Scouting Report - {html.escape(report.player)}</title>
+<style>
+    body {{ font-family: sans-serif; max-width: 1100px; margin: 2rem auto; }}
+    .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(220px, 1fr)); gap: 1rem; }}
+{CSS}
+</style>
+</head>
+<body>
+<div class="main-header"><h1>🔴🔵 SCOUTING REPORT - {title}</h1></div>
+<div class="grid">{cards}</div>
+<h2>💪 Forces</h2>
+<div class="grid">{strengths_html}</div>
+<h2>🛡️ Zones d'amélioration</h2>
+<div class="grid">{weaknesses_html}</div>
+{compatibility_html(report.club_fit)}
+{charts}
+<img alt="Position sur le terrain" style="width: 100%;" src="data:image/png;base64,{pitch}">
+</body>
+</html>
+"""
+
+
+def render_summary(report, fmt='png', dpi=120):
+    """Synthèse d'une page (percentiles, forces/faiblesses, terrain) en PNG ou PDF."""
+    import matplotlib.image as mpimg
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from scouting.pitch import render_player_pitch
+
+    fig = Figure(figsize=(11.7, 8.3), layout='constrained')
+    FigureCanvasAgg(fig)
+    fig.suptitle(f"Scouting Report - {report.player}  |  Compatibilité {report.club_fit.club}: "
+                 f"{report.club_fit.score:.0f}/100", fontsize=15, fontweight='bold', color='#004d98')
+    grid = fig.add_gridspec(2, 2, height_ratios=[1, 1.1])
+
+    ax = fig.add_subplot(grid[0, 0])
+    metrics = report.offensive[0] + report.defensive[0]
+    pcts = report.offensive[2] + report.defensive[2]
+    colors = ['#00a650' if p >= 70 else '#FFA500' if p >= 40 else '#ff6b6b' for p in pcts]
+    ax.barh(metrics[::-1], pcts[::-1], color=colors[::-1])
+    ax.set_xlim(0, 100)
+    ax.set_title('Percentiles', fontsize=11)
+    ax.tick_params(labelsize=8)
+
+    ax = fig.add_subplot(grid[0, 1])
+    ax.axis('off')
+    # Les polices matplotlib n'ont pas les emojis des titres : on les retire
+    lines = [('Forces', '#00a650')] + [(f"• {i.title.split(' ', 1)[1]}", 'black') for i in report.strengths]
+    lines += [('Faiblesses', '#ee5a24')] + [(f"• {i.title.split(' ', 1)[1]}", 'black') for i in report.weaknesses]
+    for row, (text, color) in enumerate(lines):
+        ax.text(0, 1 - row * 0.1, text, color=color, fontsize=10,
+                fontweight='bold' if color != 'black' else 'normal', va='top', transform=ax.transAxes)
+
+    ax = fig.add_subplot(grid[1, :])
+    ax.imshow(mpimg.imread(io.BytesIO(render_player_pitch(report.player)), format='png'))
+    ax.axis('off')
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi)
+    return buf.getvalue()
+
+
+def render_radar_png(player, categories, values, comparables=(), dpi=120):
+    """Radar de percentiles en PNG (matplotlib), pour les clients sans Plotly."""
+    import math
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    angles = [2 * math.pi * i / len(categories) for i in range(len(categories))]
+    fig = Figure(figsize=(6, 6), layout='constrained')
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(projection='polar')
+    series = ((player, values, '#004d98'),) + tuple(
+        (name, comparable, color)
+        for (name, comparable), color in zip(comparables, ('#a50044', '#FFA500', '#00a650'))
+    )
+    for name, points, color in series:
+        ax.plot(angles + angles[:1], list(points) + list(points[:1]), color=color, linewidth=2, label=name)
+        ax.fill(angles + angles[:1], list(points) + list(points[:1]), color=color, alpha=0.15)
+    ax.set_xticks(angles)
+    ax.set_xticklabels(categories, fontsize=9)
+    ax.set_ylim(0, 100)
+    ax.set_title(f"Percentiles - {player}", fontsize=12, fontweight='bold', color='#004d98')
+    ax.legend(loc='lower right', bbox_to_anchor=(1.15, -0.1), fontsize=8)
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi)
+    return buf.getvalue()
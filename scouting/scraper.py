@@ -0,0 +1,281 @@
+"""Scraping concurrent des tableaux de scouting FBref (version batch du notebook).
+
+Exemple :
+    python -m scouting.scraper afdc14d7/Nico-Williams --output-dir data/scout_tables
+"""
+import argparse
+import asyncio
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+import pandas as pd
+
+from scouting.engine import DEFAULT_LEAGUE_DIR
+from scouting.page_cache import DEFAULT_CACHE_DIR, PageCache
+from scouting.stats_store import PER90_COLUMN, PERCENTILE_COLUMN
+
+FBREF_BASE_URL = 'https://fbref.com'
+SCOUT_PATH = '/en/players/{player_id}/scout/{window}/{slug}-Scouting-Report'
+DEFAULT_WINDOW = '365_m1'
+DEFAULT_TABLE_ID = 'scout_full_AM'
+USER_AGENT = 'Mozilla/5.0 (compatible; scouting-report/1.0)'
+
+
+@dataclass(frozen=True)
+class PlayerRef:
+    """Identifiant FBref d'un joueur, ex. 'afdc14d7/Nico-Williams'."""
+
+    player_id: str
+    slug: str
+
+    @classmethod
+    def parse(cls, text):
+        player_id, _, slug = text.strip().partition('/')
+        if not player_id or not slug:
+            raise ValueError(f"Identifiant attendu sous la forme 'id/Nom-Prenom' : {text!r}")
+        return cls(player_id, slug)
+
+    @property
+    def filename(self):
+        return self.slug.replace('-', '_').lower() + '_stats.csv'
+
+    def url(self, base_url=FBREF_BASE_URL, window=DEFAULT_WINDOW):
+        return base_url.rstrip('/') + SCOUT_PATH.format(
+            player_id=self.player_id, window=window, slug=self.slug)
+
+
+class HostRateLimiter:
+    """Espace les requêtes vers un même hôte d'au moins `min_interval` secondes."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._locks = {}
+
+    async def wait(self, url):
+        host = urlsplit(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = self._next_slot.get(host, now)
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            self._next_slot[host] = max(slot, now) + self.min_interval
+
+
+def clean_scout_table(df):
+    """Étapes de nettoyage du notebook : NaN, 'Per 90' numérique, '%' retiré."""
+    df = df.dropna()
+    per90 = pd.to_numeric(df[PER90_COLUMN], errors='coerce')
+    df = df[per90.notna()].copy()
+    df[PER90_COLUMN] = per90[per90.notna()]
+    df[PERCENTILE_COLUMN] = pd.to_numeric(
+        df[PERCENTILE_COLUMN].astype(str).str.replace('%', '', regex=False))
+    return df
+
+
+def parse_scout_html(html, table_id=DEFAULT_TABLE_ID):
+    # FBref place parfois ses tableaux dans des commentaires HTML
+    if f'id="{table_id}"' in html and '<!--' in html:
+        html = re.sub(r'<!--|-->', '', html)
+    table = pd.read_html(io.StringIO(html), attrs={'id': table_id})[0]
+    return clean_scout_table(table)
+
+
+def write_csv_atomic(df, path):
+    """Écrit le CSV dans un fichier temporaire puis le renomme (jamais de fichier partiel)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.csv.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='') as handle:
+            df.to_csv(handle, index=False)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def retry_delay(header, default):
+    """Délai d'un en-tête Retry-After : secondes ou date HTTP (RFC 9110), sinon `default`."""
+    if header is None:
+        return default
+    try:
+        return max(float(header), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        return default
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+async def fetch_page(session, url, limiter, headers=None, retries=3):
+    """Retourne (status, html ou None si 304, en-têtes de la réponse)."""
+    for attempt in range(retries + 1):
+        await limiter.wait(url)
+        async with session.get(url, headers=headers) as response:
+            if response.status in (429, 500, 502, 503, 504) and attempt < retries:
+                delay = retry_delay(response.headers.get('Retry-After'), 2 ** attempt * limiter.min_interval or 1)
+                await asyncio.sleep(delay)
+                continue
+            if response.status == 304:
+                return 304, None, response.headers
+            response.raise_for_status()
+            return response.status, await response.text(), response.headers
+
+
+async def scrape_player(session, ref, limiter, base_url=FBREF_BASE_URL,
+                        window=DEFAULT_WINDOW, table_id=DEFAULT_TABLE_ID, cache=None):
+    url = ref.url(base_url, window)
+    entry = cache.lookup(url) if cache is not None else None
+    if entry is not None and cache.is_fresh(entry):
+        entry = cache.mark_hit(url)
+    else:
+        headers = cache.conditional_headers(entry) if entry is not None else None
+        status, html, response_headers = await fetch_page(session, url, limiter, headers)
+        if status == 304:
+            entry = cache.mark_revalidated(url)
+        elif cache is not None:
+            entry = cache.store(url, html, response_headers.get('ETag'),
+                                response_headers.get('Last-Modified'))
+        else:
+            # read_html est coûteux en CPU : on le sort de la boucle d'événements
+            return await asyncio.to_thread(parse_scout_html, html, table_id)
+    return await asyncio.to_thread(cache.table, entry, table_id, parse_scout_html)
+
+
+async def scrape_players(refs, output_dir=DEFAULT_LEAGUE_DIR, base_url=FBREF_BASE_URL,
+                         concurrency=4, min_interval=3.0, window=DEFAULT_WINDOW,
+                         table_id=DEFAULT_TABLE_ID, timeout=30, cache=None, quarantine_dir=None):
+    """Télécharge les joueurs en parallèle et écrit chaque CSV dès qu'il est prêt.
+
+    Avec un `PageCache`, les pages encore fraîches ne sont pas retéléchargées
+    et les pages inchangées ne sont pas reparsées. Avec `quarantine_dir`, le
+    lot est d'abord validé en bloc (scouting.validation) : seuls les tableaux
+    conformes sont écrits dans `output_dir`, les autres vont en quarantaine.
+
+    Retourne (chemins écrits, {joueur: exception}).
+    """
+    limiter = HostRateLimiter(min_interval)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    written, failures, pending = [], {}, {}
+
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        headers={'User-Agent': USER_AGENT},
+    ) as session:
+        async def run(ref):
+            try:
+                df = await scrape_player(session, ref, limiter, base_url, window, table_id, cache)
+                return ref, df, None
+            except Exception as exc:
+                return ref, None, exc
+
+        for done in asyncio.as_completed([run(ref) for ref in refs]):
+            ref, df, error = await done
+            if error is not None:
+                failures[ref] = error
+                continue
+            path = os.path.join(output_dir, ref.filename)
+            if quarantine_dir is not None:
+                pending[path] = ref, df
+                continue
+            write_csv_atomic(df, path)
+            written.append(path)
+    if pending:
+        written += _write_validated(pending, quarantine_dir, failures)
+    if cache is not None:
+        cache.flush()
+    return written, failures
+
+
+def _write_validated(pending, quarantine_dir, failures):
+    """Valide {chemin: (joueur, tableau)} en une passe, écrit les conformes, isole les autres."""
+    from scouting.validation import quarantine_batch, validate_frames, write_report
+
+    report = validate_frames({path: df for path, (_, df) in pending.items()})
+    for path in report.accepted:
+        write_csv_atomic(pending[path][1], path)
+    if report.rejected:
+        batch = quarantine_batch(quarantine_dir)
+        for path in report.rejected:
+            ref, df = pending[path]
+            write_csv_atomic(df, os.path.join(batch, os.path.basename(path)))
+            issues = '; '.join(str(i) for i in report.issues_for(path) if i.is_error)
+            failures[ref] = ValueError(f"mis en quarantaine ({batch}) : {issues}")
+        write_report(report, batch)
+    return list(report.accepted)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping des scouting reports FBref")
+    parser.add_argument('players', nargs='*', help="identifiants 'id/Nom-Prenom'")
+    parser.add_argument('--ids-file', help="fichier texte avec un identifiant par ligne")
+    parser.add_argument('--output-dir', default=DEFAULT_LEAGUE_DIR)
+    parser.add_argument('--base-url', default=FBREF_BASE_URL)
+    parser.add_argument('--window', default=DEFAULT_WINDOW)
+    parser.add_argument('--table-id', default=DEFAULT_TABLE_ID)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--min-interval', type=float, default=3.0,
+                        help="secondes minimum entre deux requêtes vers le même hôte")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--ttl-hours', type=float, default=24.0,
+                        help="durée pendant laquelle une page en cache n'est pas revalidée")
+    parser.add_argument('--cache-max-mb', type=float, default=512.0)
+    parser.add_argument('--quarantine-dir', default=None,
+                        help="dossier de quarantaine (défaut : data/quarantine)")
+    parser.add_argument('--no-validate', action='store_true',
+                        help="écrire les tableaux sans validation contre le registre des métriques")
+    parser.add_argument('--archive', metavar='DIR',
+                        help="ajouter aussi les tableaux du jour à l'archive de snapshots")
+    args = parser.parse_args(argv)
+
+    ids = list(args.players)
+    if args.ids_file:
+        with open(args.ids_file) as handle:
+            ids += [line for line in handle if line.strip() and not line.startswith('#')]
+    if not ids:
+        parser.error("aucun joueur à télécharger")
+    refs = [PlayerRef.parse(i) for i in ids]
+    cache = None if args.no_cache else PageCache(
+        args.cache_dir, args.ttl_hours * 3600, int(args.cache_max_mb * 1024 ** 2))
+
+    quarantine_dir = None
+    if not args.no_validate:
+        from scouting.validation import DEFAULT_QUARANTINE_DIR
+
+        quarantine_dir = args.quarantine_dir or DEFAULT_QUARANTINE_DIR
+
+    written, failures = asyncio.run(scrape_players(
+        refs, args.output_dir, args.base_url, args.concurrency,
+        args.min_interval, args.window, args.table_id, cache=cache, quarantine_dir=quarantine_dir))
+    if cache is not None:
+        print(f"cache : {cache.hits} hits, {cache.revalidated} revalidées, {cache.misses} téléchargées")
+    for path in written:
+        print(f"OK   {path}")
+    if args.archive and written:
+        from scouting.archive import SnapshotArchive
+
+        rows = SnapshotArchive(args.archive).ingest_files(written)
+        print(f"archive : {sum(rows.values())} lignes ajoutées")
+    for ref, error in failures.items():
+        print(f"FAIL {ref.player_id}/{ref.slug}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
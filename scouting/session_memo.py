@@ -0,0 +1,34 @@
+"""Résultats mémorisés par session, recalculés seulement quand leurs entrées changent.
+
+Les fragments Streamlit limitent une réexécution au bloc dont un widget a
+bougé ; à l'intérieur de ce bloc, `memo` garde le dernier résultat de chaque
+section avec l'empreinte de ses dépendances déclarées (joueur, comparables,
+pondérations...). Une section dont les entrées n'ont pas changé est servie
+telle quelle.
+"""
+import hashlib
+import pickle
+
+from scouting.instrumentation import record_cache
+
+SESSION_KEY = '_scouting_memo'
+
+
+def fingerprint(inputs):
+    """Empreinte stable d'un dict d'entrées simples (noms, nombres, tuples, dicts)."""
+    payload = pickle.dumps(sorted(inputs.items()), protocol=4)
+    return hashlib.sha1(payload).hexdigest()
+
+
+def memo(state, section, compute, **inputs):
+    """Résultat de `compute()`, réutilisé tant que `inputs` ne change pas pour cette session."""
+    memos = state.setdefault(SESSION_KEY, {})
+    key = fingerprint(inputs)
+    previous = memos.get(section)
+    if previous is not None and previous[0] == key:
+        record_cache(f'session.{section}', True)
+        return previous[1]
+    record_cache(f'session.{section}', False)
+    result = compute()
+    memos[section] = (key, result)
+    return result
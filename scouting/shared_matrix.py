@@ -0,0 +1,127 @@
+"""Matrice joueurs x métriques partagée entre processus par mmap, sans copie.
+
+Le build écrit `values.npy`, `percentiles.npy` et `index.json` dans un
+sous-dossier versionné, puis bascule le fichier `CURRENT` de façon atomique.
+Chaque worker Streamlit mappe ces fichiers en lecture seule : les pages
+mémoire sont partagées par le noyau et rien n'est parsé au démarrage.
+
+Exemple :
+    python -m scouting.shared_matrix --league-dir data/scout_tables
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from scouting.engine import DEFAULT_LEAGUE_DIR, PercentileIndex, league_files
+from scouting.stats_store import build_store
+
+DEFAULT_SHARED_DIR = os.path.join(os.path.dirname(DEFAULT_LEAGUE_DIR), 'shared_matrix')
+
+
+def export_matrix(index, directory=DEFAULT_SHARED_DIR, keep=2):
+    """Publie la matrice et les percentiles d'un PercentileIndex ; retourne la version."""
+    os.makedirs(directory, exist_ok=True)
+    version = f"v{time.time_ns()}"
+    staging = tempfile.mkdtemp(dir=directory, prefix='.staging-')
+    np.save(os.path.join(staging, 'values.npy'), np.ascontiguousarray(index.values, dtype=np.float64))
+    np.save(os.path.join(staging, 'percentiles.npy'), np.ascontiguousarray(index.percentiles, dtype=np.float64))
+    with open(os.path.join(staging, 'index.json'), 'w') as handle:
+        json.dump({'players': list(index.players), 'metrics': list(index.metrics)}, handle)
+    os.rename(staging, os.path.join(directory, version))
+
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as handle:
+        handle.write(version)
+    os.replace(tmp, os.path.join(directory, 'CURRENT'))
+
+    # Les anciennes versions restent lisibles par les workers qui les mappent
+    # encore ; on ne garde que les plus récentes
+    versions = sorted(d for d in os.listdir(directory) if d.startswith('v'))
+    for old in versions[:-keep]:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+    return version
+
+
+def current_version(directory=DEFAULT_SHARED_DIR):
+    try:
+        with open(os.path.join(directory, 'CURRENT')) as handle:
+            return handle.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+class SharedMatrix:
+    """Vue en lecture seule, même interface de lecture que PercentileIndex."""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = os.path.basename(path)
+        with open(os.path.join(path, 'index.json')) as handle:
+            meta = json.load(handle)
+        self.players = meta['players']
+        self.metrics = tuple(meta['metrics'])
+        self.values = np.load(os.path.join(path, 'values.npy'), mmap_mode='r')
+        self.percentiles = np.load(os.path.join(path, 'percentiles.npy'), mmap_mode='r')
+        self._player_index = {p: i for i, p in enumerate(self.players)}
+        self._metric_index = {m: j for j, m in enumerate(self.metrics)}
+
+    def __len__(self):
+        return len(self.players)
+
+    def __contains__(self, player):
+        return player in self._player_index
+
+    def store_for(self, player):
+        """StatsStore dont les tableaux sont des vues sur la mémoire partagée."""
+        row = self._player_index[player]
+        return build_store(player, self.metrics, self.values[row], self.percentiles[row])
+
+    def percentiles_for(self, player):
+        return dict(zip(self.metrics, self.percentiles[self._player_index[player]].tolist()))
+
+    def column(self, metric, kind='percentiles'):
+        return getattr(self, kind)[:, self._metric_index[metric]]
+
+
+try:
+    import streamlit as st
+    _cache = st.cache_resource(show_spinner=False)
+except ImportError:
+    from functools import lru_cache
+    _cache = lru_cache(maxsize=4)
+
+
+@_cache
+def _open(path):
+    return SharedMatrix(path)
+
+
+def load_shared_matrix(directory=DEFAULT_SHARED_DIR):
+    """Version publiée la plus récente, ou None si aucune matrice n'a été construite."""
+    version = current_version(directory)
+    return None if version is None else _open(os.path.join(directory, version))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publie la matrice de la ligue en mémoire partagée")
+    parser.add_argument('--league-dir', default=DEFAULT_LEAGUE_DIR)
+    parser.add_argument('--out', default=DEFAULT_SHARED_DIR)
+    args = parser.parse_args(argv)
+
+    paths = league_files(args.league_dir)
+    if not paths:
+        parser.error(f"aucun tableau dans {args.league_dir}")
+    index = PercentileIndex.from_scout_files(paths)
+    version = export_matrix(index, args.out)
+    print(f"{len(index)} joueurs x {len(index.metrics)} métriques -> {os.path.join(args.out, version)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
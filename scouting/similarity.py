@@ -0,0 +1,193 @@
+"""Recherche de joueurs similaires (k plus proches voisins sur les métriques /90)."""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from scouting.engine import DEFAULT_LEAGUE_DIR, league_files, load_league_index, tables_version
+from scouting.metrics import REGISTRY
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(DEFAULT_LEAGUE_DIR), 'similarity_index.npz')
+
+# Vecteur de profil : métriques marquées `profile` dans le registre
+PROFILE_METRICS = REGISTRY.profile_metrics()
+
+
+class SimilarityIndex:
+    """Index k-NN exact (distance euclidienne via BLAS) sur des variables standardisées.
+
+    En mode approximatif, la recherche se fait d'abord dans une projection
+    ACP de faible dimension, puis les meilleurs candidats sont reclassés
+    avec la distance exacte.
+    """
+
+    def __init__(self, players, metrics, mean, std, features, components=None, signature=''):
+        self.players = list(players)
+        self.metrics = tuple(metrics)
+        self.mean = mean
+        self.std = std
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.components = components
+        self.signature = signature
+        self._player_index = {p: i for i, p in enumerate(self.players)}
+        self._sq_norms = np.einsum('ij,ij->i', self.features, self.features)
+        self._projected = None if components is None else self.features @ components.T
+        if self._projected is not None:
+            self._projected_norms = np.einsum('ij,ij->i', self._projected, self._projected)
+
+    def __len__(self):
+        return len(self.players)
+
+    @property
+    def approximate(self):
+        return self.components is not None
+
+    @classmethod
+    def build(cls, players, metrics, values, approximate=False, n_components=8, signature=''):
+        values = np.asarray(values, dtype=np.float64)
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        std[~(std > 0)] = 1.0
+        mean = np.nan_to_num(mean)
+        features = np.nan_to_num((values - mean) / std)
+        components = None
+        if approximate:
+            _, _, vt = np.linalg.svd(features, full_matrices=False)
+            components = vt[:n_components].astype(np.float32)
+        return cls(players, metrics, mean, std, features, components, signature)
+
+    @classmethod
+    def from_percentile_index(cls, index, metrics=PROFILE_METRICS, **kwargs):
+        columns = [index.metrics.index(m) for m in metrics if m in index.metrics]
+        return cls.build(index.players, [index.metrics[j] for j in columns],
+                         index.values[:, columns], **kwargs)
+
+    def standardize(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        return np.nan_to_num((values - self.mean) / self.std).astype(np.float32)
+
+    def _distances(self, queries, rows=None):
+        features = self.features if rows is None else self.features[rows]
+        sq_norms = self._sq_norms if rows is None else self._sq_norms[rows]
+        d2 = sq_norms[None, :] - 2.0 * (queries @ features.T)
+        d2 += np.einsum('ij,ij->i', queries, queries)[:, None]
+        return np.sqrt(np.maximum(d2, 0.0))
+
+    def _candidates(self, queries, count):
+        if self._projected is None or count >= len(self.players):
+            return None
+        projected = queries @ self.components.T
+        d2 = self._projected_norms[None, :] - 2.0 * (projected @ self._projected.T)
+        return np.argpartition(d2, count - 1, axis=1)[:, :count]
+
+    def query_many(self, values, k=5, exclude=None, candidates_factor=10, min_candidates=256):
+        """Top-k pour un lot de vecteurs bruts (/90) : liste de [(joueur, distance)]."""
+        queries = self.standardize(np.atleast_2d(values))
+        extra = 1 if exclude is not None else 0
+        k_search = min(k + extra, len(self.players))
+        candidates = self._candidates(queries, max(k_search * candidates_factor, min_candidates))
+        results = []
+        for q, query in enumerate(queries):
+            rows = None if candidates is None else candidates[q]
+            dist = self._distances(query[None, :], rows)[0]
+            top = np.argpartition(dist, k_search - 1)[:k_search] if k_search < len(dist) else np.arange(len(dist))
+            top = top[np.argsort(dist[top])]
+            names = [self.players[i if rows is None else rows[i]] for i in top]
+            hits = [(n, float(d)) for n, d in zip(names, dist[top])
+                    if exclude is None or n != exclude[q]]
+            results.append(hits[:k])
+        return results
+
+    def query(self, values, k=5, exclude=None):
+        return self.query_many(values, k, None if exclude is None else [exclude])[0]
+
+    def neighbours(self, player, k=5):
+        """Les k joueurs les plus proches d'un joueur déjà indexé (lui-même exclu)."""
+        row = self._player_index[player]
+        raw = self.features[row] * self.std + self.mean
+        return self.query(raw, k, exclude=player)
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = path + '.tmp.npz'
+        np.savez(
+            tmp,
+            players=np.array(self.players),
+            metrics=np.array(self.metrics),
+            mean=self.mean, std=self.std, features=self.features,
+            components=self.components if self.components is not None else np.empty((0, 0)),
+            signature=np.array(self.signature),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        with np.load(path) as data:
+            components = data['components']
+            return cls(
+                data['players'].tolist(), data['metrics'].tolist(),
+                data['mean'], data['std'], data['features'],
+                components if components.size else None,
+                str(data['signature']),
+            )
+
+
+def league_signature(directory=DEFAULT_LEAGUE_DIR, approximate=False):
+    paths = league_files(directory)
+    # Le profil en fait partie : un index persistant est reconstruit si le registre change
+    payload = json.dumps([[p, os.path.getmtime(p)] for p in paths] + [approximate, list(PROFILE_METRICS)])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+try:
+    import streamlit as st
+    _cache = st.cache_resource(show_spinner=False)
+except ImportError:
+    from functools import lru_cache
+    _cache = lru_cache(maxsize=8)
+
+
+@_cache
+def _load_similarity_index(directory, path, approximate, signature):
+    if os.path.exists(path):
+        index = SimilarityIndex.load(path)
+        if index.signature == signature:
+            return index
+    league = load_league_index(directory)
+    if league is None or len(league) < 2:
+        return None
+    index = SimilarityIndex.from_percentile_index(league, approximate=approximate)
+    index.signature = signature
+    index.save(path)
+    return index
+
+
+def load_similarity_index(directory=DEFAULT_LEAGUE_DIR, path=DEFAULT_INDEX_PATH, approximate=False):
+    """Index persistant sur disque, reconstruit seulement si les tableaux ont changé."""
+    if not league_files(directory):
+        return None
+    return _load_similarity_index(directory, path, approximate,
+                                  league_signature(directory, approximate))
+
+
+@_cache
+def _league_similarity_index(version, approximate, _league):
+    # Les paramètres préfixés par _ ne sont pas hachés par st.cache_resource
+    return SimilarityIndex.from_percentile_index(_league, approximate=approximate)
+
+
+def similarity_for(league, directory=DEFAULT_LEAGUE_DIR, approximate=False):
+    """Index de similarité sur les données de `league` (tableaux, matrice partagée...).
+
+    L'index persistant est réutilisé quand la ligue est exactement celle des
+    tableaux du dossier ; sinon un index est construit depuis la ligue et mis
+    en cache par version des données (`league.version`).
+    """
+    if league is None or len(league) < 2:
+        return None
+    if league.version is not None and league.version == tables_version(directory):
+        return load_similarity_index(directory, approximate=approximate)
+    if league.version is None:
+        return SimilarityIndex.from_percentile_index(league, approximate=approximate)
+    return _league_similarity_index(league.version, approximate, league)
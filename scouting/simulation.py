@@ -0,0 +1,182 @@
+"""Simulation du score de compatibilité : intervalles de confiance par tirages.
+
+Chaque tirage perturbe les per-90 des joueurs selon leur variance
+d'échantillonnage (approximation de Poisson : un per-90 v mesuré sur n matchs
+complets a une variance v / n), convertit les valeurs tirées en percentiles,
+puis recalcule le score club. Les percentiles sont lus dans la distribution
+de la ligue quand elle est disponible ; sinon sur une courbe logistique en
+échelle log, calée pour que la valeur observée retrouve son percentile FBref.
+
+Les tirages sont traités par lots vectorisés (tirages x joueurs x métriques) ;
+un pool de processus peut se répartir les lots pour les gros volumes.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from scouting.club_fit import ClubFitEngine
+from scouting.engine import LOWER_IS_BETTER
+
+DEFAULT_DRAWS = 10_000
+# Minutes jouées supposées quand la source ne les fournit pas (~ une saison de titulaire)
+DEFAULT_MINUTES = 2_000
+BATCH_SIZE = 2_048
+CONFIDENCE = 0.9
+# Pente logit(percentile) / log(per-90) de la courbe utilisée sans données de ligue
+LOG_SLOPE = 3.4
+
+
+def _signs(metrics, lower_is_better=LOWER_IS_BETTER):
+    return np.array([-1.0 if m in lower_is_better else 1.0 for m in metrics])
+
+
+class LeagueReference:
+    """Percentiles d'une valeur tirée dans la distribution observée de la ligue.
+
+    `own` contient les valeurs observées des joueurs simulés (NaN s'ils ne sont
+    pas dans la ligue). Comme dans PercentileIndex, le percentile est le nombre
+    de valeurs strictement inférieures divisé par le nombre de valeurs de la
+    colonne, le joueur compris : le tirage remplace la valeur observée du
+    joueur (elle sort du numérateur, le dénominateur ne change pas), ou
+    s'ajoute à la colonne pour un joueur hors ligue (dénominateur + 1).
+    """
+
+    def __init__(self, league, metrics, own, lower_is_better=LOWER_IS_BETTER):
+        self.sign = _signs(metrics, lower_is_better)
+        self.own = own * self.sign
+        position = {m: j for j, m in enumerate(league.metrics)}
+        values = np.asarray(league.values)
+        keyed = np.full((len(values), len(metrics)), np.nan)
+        for k, metric in enumerate(metrics):
+            if metric in position:
+                keyed[:, k] = values[:, position[metric]] * self.sign[k]
+        self.sorted = np.sort(keyed, axis=0)
+        self.valid = np.count_nonzero(~np.isnan(keyed), axis=0)
+
+    def percentiles(self, draws):
+        keyed = draws * self.sign
+        below = (self.own < keyed).reshape(-1, draws.shape[-1])
+        # Taille de la colonne une fois le tirage mis à la place de la valeur observée
+        total = np.broadcast_to(self.valid + np.isnan(self.own), keyed.shape).reshape(-1, draws.shape[-1])
+        flat = keyed.reshape(-1, draws.shape[-1])
+        out = np.full(flat.shape, np.nan)
+        for j, valid in enumerate(self.valid):
+            if valid:
+                rank = np.searchsorted(self.sorted[:valid, j], flat[:, j], side='left') - below[:, j]
+                out[:, j] = rank * 100.0 / total[:, j]
+        return out.reshape(draws.shape)
+
+
+class LogisticReference:
+    """Courbe percentile = f(log per-90) passant par le couple observé de chaque joueur."""
+
+    def __init__(self, per90, percentiles, metrics, lower_is_better=LOWER_IS_BETTER):
+        self.per90 = per90
+        self.percentile = percentiles
+        share = np.clip(percentiles, 0.5, 99.5) / 100.0
+        self.logit = np.log(share / (1.0 - share))
+        self.slope = LOG_SLOPE * _signs(metrics, lower_is_better)
+
+    def percentiles(self, draws):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            logit = self.logit + self.slope * (np.log(draws) - np.log(self.per90))
+            out = 100.0 / (1.0 + np.exp(-logit))
+        # Sans valeur observée positive, la courbe n'est pas définie : percentile inchangé
+        return np.where(self.per90 > 0, out, self.percentile)
+
+
+@dataclass(frozen=True)
+class ScoreInterval:
+    club: str
+    score: float
+    low: float
+    high: float
+    std: float
+    confidence: float = CONFIDENCE
+
+    @property
+    def label(self):
+        return f"IC {self.confidence:.0%} : {self.low:.0f} – {self.high:.0f}".replace('%', ' %')
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    players: tuple
+    clubs: tuple
+    point: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+    std: np.ndarray
+    draws: int
+    confidence: float
+
+    def interval(self, player, club):
+        i, c = self.players.index(player), self.clubs.index(club)
+        return ScoreInterval(club, float(self.point[i, c]), float(self.low[i, c]),
+                             float(self.high[i, c]), float(self.std[i, c]), self.confidence)
+
+
+@dataclass
+class _Inputs:
+    engine: ClubFitEngine
+    reference: object
+    per90: np.ndarray
+    scale: np.ndarray
+    assessed: np.ndarray
+
+
+def _run_batch(inputs, n, seed):
+    """Scores (n, joueurs, clubs) pour n tirages."""
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((n,) + inputs.per90.shape)
+    draws = np.maximum(inputs.per90 + noise * inputs.scale, 0.0)
+    percentiles = inputs.reference.percentiles(draws)
+    levels = inputs.engine.levels(percentiles.reshape(-1, percentiles.shape[-1]))
+    levels = levels.reshape((n,) + inputs.assessed.shape)
+    levels = np.where(np.isnan(inputs.assessed), levels, inputs.assessed)
+    scores = inputs.engine.combine(levels.reshape(-1, levels.shape[-1]))
+    return scores.reshape(n, inputs.per90.shape[0], -1)
+
+
+def simulate(engine, stores, league=None, draws=DEFAULT_DRAWS, minutes=DEFAULT_MINUTES,
+             confidence=CONFIDENCE, seed=0, workers=0, batch_size=BATCH_SIZE):
+    """Intervalles de confiance des scores club pour une liste de joueurs.
+
+    `minutes` (scalaire ou une valeur par joueur) fixe la taille d'échantillon
+    des per-90 ; `workers` > 1 répartit les lots sur un pool de processus
+    (hors des threads de Streamlit, où l'application garde `workers` = 0).
+    """
+    metrics = engine.used_metrics()
+    sub = ClubFitEngine(metrics, engine.profiles, engine.assessments)
+    players = tuple(s.player for s in stores)
+    per90 = np.array([[s.value(m) if m in s.index else np.nan for m in metrics] for s in stores])
+    percentiles = np.array([[s.percentile(m) if m in s.index else np.nan for m in metrics] for s in stores])
+    nineties = np.broadcast_to(np.asarray(minutes, dtype=np.float64), (len(stores),)) / 90.0
+    scale = np.sqrt(np.maximum(np.nan_to_num(per90), 0.0) / nineties[:, None])
+
+    if league is not None:
+        members = np.array([s.player in league for s in stores])
+        reference = LeagueReference(league, metrics, np.where(members[:, None], per90, np.nan))
+    else:
+        reference = LogisticReference(per90, percentiles, metrics)
+    assessed = sub.levels(np.full(per90.shape, np.nan), players)
+    inputs = _Inputs(sub, reference, per90, scale, assessed)
+
+    sizes = [batch_size] * (draws // batch_size) + ([draws % batch_size] if draws % batch_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers and workers > 1 and len(sizes) > 1:
+        # Comme batch_reports : fork si disponible, sinon la méthode par défaut (spawn)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            batches = list(pool.map(_run_batch, [inputs] * len(sizes), sizes, seeds))
+    else:
+        batches = [_run_batch(inputs, n, s) for n, s in zip(sizes, seeds)]
+    samples = np.concatenate(batches)
+
+    tail = (1.0 - confidence) / 2.0
+    low, high = np.nanquantile(samples, [tail, 1.0 - tail], axis=0)
+    return SimulationResult(players, sub.clubs, sub.scores(percentiles, players), low, high,
+                            np.nanstd(samples, axis=0), draws, confidence)
@@ -0,0 +1,100 @@
+"""Profil de démarrage : temps d'import de chaque dépendance de l'application.
+
+Exemple :
+    python -m scouting.startup_profile
+    python -m scouting.startup_profile --json
+"""
+import argparse
+import ast
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'nico_williams_scouting_app.py')
+# Importées en premier pour isoler leur coût de celui des modules qui en dépendent
+BASE_DEPENDENCIES = ('numpy', 'pandas')
+# Imports différés au premier affichage d'un onglet (voir LAZY_TABS dans l'application)
+DEFERRED_DEPENDENCIES = (
+    'plotly.graph_objects',
+    'plotly.subplots',
+    'scouting.figures',
+    'matplotlib.figure',
+    'mplsoccer',
+    'scouting.pitch',
+)
+
+
+def app_imports(path=APP_PATH):
+    """Modules importés au niveau module par le script de l'application, dans l'ordre."""
+    with open(path, encoding='utf-8') as handle:
+        tree = ast.parse(handle.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # `from scouting import assets` importe le sous-module scouting.assets
+            package = importlib.util.find_spec(node.module).submodule_search_locations is not None
+            submodules = [f'{node.module}.{alias.name}' for alias in node.names
+                          if package and importlib.util.find_spec(f'{node.module}.{alias.name}') is not None]
+            modules += submodules or [node.module]
+    return modules
+
+
+def dependencies(path=APP_PATH):
+    """Dépendances de démarrage dérivées des imports de l'application, sans doublon."""
+    return tuple(dict.fromkeys((*BASE_DEPENDENCIES, *app_imports(path), *DEFERRED_DEPENDENCIES)))
+
+
+_MEASURE = """
+import json, sys, time
+timings = []
+for name in sys.argv[1:]:
+    start = time.perf_counter()
+    __import__(name)
+    timings.append((name, time.perf_counter() - start))
+print(json.dumps(timings))
+"""
+
+
+def _run(modules):
+    out = subprocess.run(
+        [sys.executable, '-c', _MEASURE, *modules],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def profile_imports(dependencies):
+    """Pour chaque module : coût isolé (interpréteur neuf) et coût incrémental
+    (importé à la suite des précédents, comme dans l'application)."""
+    incremental = dict(_run(dependencies))
+    rows = []
+    for name in dependencies:
+        isolated = dict(_run([name]))[name]
+        rows.append({'module': name, 'isolated_s': isolated, 'incremental_s': incremental[name]})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Temps d'import par dépendance")
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('modules', nargs='*', help="modules à mesurer (défaut : imports de l'application)")
+    args = parser.parse_args(argv)
+
+    rows = profile_imports(args.modules or dependencies())
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    print(f"{'module':<24}{'isolé (ms)':>12}{'incrémental (ms)':>18}")
+    for row in rows:
+        print(f"{row['module']:<24}{row['isolated_s'] * 1e3:>12.1f}{row['incremental_s'] * 1e3:>18.1f}")
+    print(f"{'total':<24}{'':>12}{sum(r['incremental_s'] for r in rows) * 1e3:>18.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Chargement des tableaux de scouting FBref dans un stockage typé en colonnes."""
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from scouting.metrics import REGISTRY
+
+# Colonnes du CSV écrit par NicoWilliams_Scrapping.ipynb (en-tête sur deux lignes)
+STAT_COLUMN = ('Standard Stats', 'Statistic')
+PER90_COLUMN = ('Standard Stats', 'Per 90')
+PERCENTILE_COLUMN = ('Standard Stats', 'Percentile')
+
+DEFAULT_STATS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'nico_williams_stats.csv',
+)
+
+
+class MetricSchema:
+    """Colonnes d'un tableau (libellés, identifiants du registre, position par identifiant).
+
+    Une seule instance par liste de métriques (voir schema_for) : tous les
+    joueurs d'une ligue partagent le même schéma au lieu d'un dict chacun.
+    """
+
+    __slots__ = ('metrics', 'ids', 'index', 'positions')
+
+    def __init__(self, metrics):
+        self.metrics = tuple(metrics)
+        self.ids = REGISTRY.ids(self.metrics)
+        self.index = {m: i for i, m in enumerate(self.metrics)}
+        self.positions = np.full(len(REGISTRY), -1, dtype=np.intp)
+        # Les métriques hors registre (-1) restent lisibles par libellé seulement
+        registered = self.ids >= 0
+        self.positions[self.ids[registered]] = np.flatnonzero(registered)
+
+    def __len__(self):
+        return len(self.metrics)
+
+    def __reduce__(self):
+        # Après pickle (st.cache_data, pool de processus), on retrouve l'instance partagée
+        return schema_for, (self.metrics,)
+
+    def columns(self, ids):
+        """Colonnes des identifiants de métriques, -1 pour celles absentes du tableau."""
+        ids = np.asarray(ids, dtype=np.intp)
+        known = (ids >= 0) & (ids < len(self.positions))
+        return np.where(known, self.positions[np.where(known, ids, 0)], -1)
+
+
+@lru_cache(maxsize=64)
+def schema_for(metrics):
+    return MetricSchema(metrics)
+
+
+class StatsStore:
+    """Statistiques d'un joueur : deux tableaux alignés sur un schéma partagé."""
+
+    __slots__ = ('player', 'schema', 'per90', 'percentiles')
+
+    def __init__(self, player, schema, per90, percentiles):
+        self.player = player
+        self.schema = schema
+        self.per90 = per90
+        self.percentiles = percentiles
+
+    def __repr__(self):
+        return f"StatsStore({self.player!r}, {len(self.schema)} métriques)"
+
+    @property
+    def metrics(self):
+        return self.schema.metrics
+
+    @property
+    def index(self):
+        return self.schema.index
+
+    @property
+    def ids(self):
+        return self.schema.ids
+
+    def value(self, metric):
+        return float(self.per90[self.schema.index[metric]])
+
+    def percentile(self, metric):
+        return float(self.percentiles[self.schema.index[metric]])
+
+    def values(self, metrics):
+        return self.per90[[self.schema.index[m] for m in metrics]]
+
+    def percentile_values(self, metrics):
+        return self.percentiles[[self.schema.index[m] for m in metrics]]
+
+    def values_by_id(self, ids):
+        """Valeurs /90 par identifiant de métrique (NaN si absente du tableau)."""
+        columns = self.schema.columns(ids)
+        return np.where(columns >= 0, self.per90[columns], np.nan)
+
+    def percentiles_by_id(self, ids):
+        columns = self.schema.columns(ids)
+        return np.where(columns >= 0, self.percentiles[columns], np.nan)
+
+    def as_dicts(self):
+        """Retourne (per90, percentiles) sous forme de dicts métrique -> valeur."""
+        return (
+            dict(zip(self.metrics, self.per90.tolist())),
+            dict(zip(self.metrics, self.percentiles.tolist())),
+        )
+
+
+def player_name_from_path(path):
+    """'nico_williams_stats.csv' -> 'Nico Williams'."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if stem.endswith('_stats'):
+        stem = stem[:-len('_stats')]
+    return stem.replace('_', ' ').title()
+
+
+def build_store(player, metrics, per90, percentiles):
+    return StatsStore(
+        player,
+        schema_for(tuple(metrics)),
+        np.asarray(per90, dtype=np.float64),
+        np.asarray(percentiles, dtype=np.float64),
+    )
+
+
+def parse_scout_csv(path, player=None):
+    """Lit un CSV de scouting FBref (en-tête 'Standard Stats / Per 90 / Percentile').
+
+    Le tableau FBref répète certaines métriques dans plusieurs sections
+    (ex. 'Goals', 'Crosses') : seule la première occurrence est conservée.
+    """
+    df = pd.read_csv(path, header=[0, 1])
+    df = df.drop_duplicates(subset=[STAT_COLUMN], keep='first')
+    per90 = pd.to_numeric(df[PER90_COLUMN], errors='coerce')
+    percentile = pd.to_numeric(
+        df[PERCENTILE_COLUMN].astype(str).str.replace('%', '', regex=False),
+        errors='coerce',
+    )
+    return build_store(
+        player or player_name_from_path(path),
+        df[STAT_COLUMN].astype(str),
+        per90.to_numpy(),
+        percentile.to_numpy(),
+    )
+
+
+try:
+    import streamlit as st
+    _cache = st.cache_data(show_spinner=False)
+except ImportError:  # utilisation hors Streamlit (scripts, CLI)
+    _cache = lru_cache(maxsize=64)
+
+
+@_cache
+def _load_stats_store(path, mtime, player):
+    return parse_scout_csv(path, player)
+
+
+def load_stats_store(path=DEFAULT_STATS_PATH, player=None):
+    """Version mémoïsée de parse_scout_csv, invalidée quand le fichier change."""
+    path = os.path.abspath(path)
+    return _load_stats_store(path, os.path.getmtime(path), player)
@@ -0,0 +1,268 @@
+"""Validation en bloc des tableaux de scouting contre le registre des métriques.
+
+Le notebook et `clean_scout_table` supposent que le tableau FBref garde les
+colonnes ('Standard Stats', 'Per 90' / 'Percentile') et ses libellés de
+métriques ; après un changement de mise en page, les lignes qui ne se
+convertissent plus disparaissent sans bruit. Cette étape vérifie un lot
+complet en une passe (tous les fichiers empilés dans un seul tableau long) :
+
+- colonnes attendues présentes, tableau non vide ;
+- métriques du registre absentes, inconnues, ou renommées (une absente et une
+  inconnue au libellé proche dans le même fichier) ;
+- per-90 non numériques ou négatifs, percentiles hors [0, 100] ;
+- fichiers au contenu identique (même page servie pour deux joueurs).
+
+Les fichiers en erreur sont mis en quarantaine avec un rapport JSON, avant
+d'atteindre le dossier lu par l'application.
+
+Exemple :
+    python -m scouting.validation data/scout_tables --dry-run
+"""
+import argparse
+import difflib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+from scouting.engine import DEFAULT_LEAGUE_DIR, league_files
+from scouting.metrics import REGISTRY
+from scouting.stats_store import PER90_COLUMN, PERCENTILE_COLUMN, STAT_COLUMN
+
+DEFAULT_QUARANTINE_DIR = os.path.join(os.path.dirname(DEFAULT_LEAGUE_DIR), 'quarantine')
+# Similarité minimale (difflib) pour lire une absente + une inconnue comme un renommage
+RENAME_CUTOFF = 0.75
+
+ISSUES = {
+    'unreadable': "fichier illisible",
+    'columns': "colonnes manquantes",
+    'empty': "tableau vide",
+    'missing': "métriques absentes",
+    'renamed': "métriques renommées",
+    'new': "métriques inconnues",
+    'per90': "per-90 non numériques ou négatifs",
+    'percentile': "percentiles hors [0, 100]",
+    'duplicate': "contenu identique à un autre fichier",
+}
+# Codes signalés sans mise en quarantaine : un nouveau libellé reste lisible (métrique provisoire)
+WARNINGS = frozenset({'new'})
+
+
+@dataclass(frozen=True)
+class Issue:
+    name: str
+    code: str
+    detail: str = ''
+
+    @property
+    def is_error(self):
+        return self.code not in WARNINGS
+
+    def __str__(self):
+        return f"{ISSUES[self.code]} ({self.detail})" if self.detail else ISSUES[self.code]
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    names: tuple
+    issues: tuple
+
+    @property
+    def rejected(self):
+        return tuple(dict.fromkeys(i.name for i in self.issues if i.is_error))
+
+    @property
+    def accepted(self):
+        rejected = set(self.rejected)
+        return tuple(n for n in self.names if n not in rejected)
+
+    def issues_for(self, name):
+        return tuple(i for i in self.issues if i.name == name)
+
+    def summary(self, examples=3):
+        """Résumé compact : une ligne par type d'anomalie, avec les détails les plus fréquents."""
+        lines = [f"{len(self.names)} fichiers, {len(self.accepted)} valides, "
+                 f"{len(self.rejected)} en quarantaine"]
+        for code, label in ISSUES.items():
+            found = [i for i in self.issues if i.code == code]
+            if not found:
+                continue
+            files = len({i.name for i in found})
+            details = Counter(d for i in found for d in i.detail.split(', ') if d)
+            common = ', '.join(f"{d} ×{n}" if n > 1 else d for d, n in details.most_common(examples))
+            marker = '!' if code not in WARNINGS else '~'
+            lines.append(f"  {marker} {label} : {files} fichier(s)" + (f" — {common}" if common else ''))
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        return {
+            'names': list(self.names),
+            'rejected': list(self.rejected),
+            'issues': [asdict(i) for i in self.issues],
+        }
+
+
+def _stack(frames, issues):
+    """Un seul tableau long (fichier, métrique, per-90, percentile) pour tout le lot."""
+    files, metrics, per90, percentile = [], [], [], []
+    for position, (name, df) in enumerate(frames.items()):
+        missing = [c[1] for c in (STAT_COLUMN, PER90_COLUMN, PERCENTILE_COLUMN) if c not in df.columns]
+        if missing:
+            issues.append(Issue(name, 'columns', ', '.join(missing)))
+        elif df.empty:
+            issues.append(Issue(name, 'empty'))
+        else:
+            files.append(np.full(len(df), position))
+            metrics.append(df[STAT_COLUMN].astype(str).to_numpy())
+            per90.append(df[PER90_COLUMN].to_numpy(dtype=object))
+            percentile.append(df[PERCENTILE_COLUMN].to_numpy(dtype=object))
+    if not files:
+        return None
+    long = pd.DataFrame({
+        'file': np.concatenate(files),
+        'metric': np.concatenate(metrics),
+        'per90': np.concatenate(per90),
+        'percentile': np.concatenate(percentile),
+    })
+    # Comme parse_scout_csv : seule la première occurrence d'une métrique répétée compte
+    long = long.drop_duplicates(subset=['file', 'metric'], keep='first').reset_index(drop=True)
+    long['per90'] = pd.to_numeric(long['per90'], errors='coerce')
+    long['percentile'] = pd.to_numeric(
+        long['percentile'].astype(str).str.replace('%', '', regex=False), errors='coerce')
+    return long
+
+
+def _per_file(mask, files, count):
+    return np.bincount(files[mask], minlength=count)
+
+
+def validate_frames(frames, expected=None):
+    """Valide {nom: tableau FBref nettoyé} ; `expected` = libellés attendus (registre par défaut)."""
+    names = tuple(frames)
+    expected = tuple(expected or REGISTRY.defined_labels())
+    issues = []
+    long = _stack(frames, issues)
+    if long is None:
+        return ValidationReport(names, tuple(issues))
+
+    files = long['file'].to_numpy()
+    codes = pd.Index(expected).get_indexer(long['metric'])
+    known = codes >= 0
+    present = np.zeros((len(names), len(expected)), dtype=bool)
+    present[files[known], codes[known]] = True
+    stacked = np.zeros(len(names), dtype=bool)
+    stacked[np.unique(files)] = True
+
+    unknown = long.loc[~known, ['file', 'metric']].groupby('file')['metric'].agg(list).to_dict()
+    per90 = long['per90'].to_numpy()
+    percentile = long['percentile'].to_numpy()
+    bad_per90 = _per_file(np.isnan(per90) | (per90 < 0), files, len(names))
+    bad_percentile = _per_file(np.isnan(percentile) | (percentile < 0) | (percentile > 100), files, len(names))
+
+    for position in np.flatnonzero(stacked):
+        name = names[position]
+        missing = [expected[j] for j in np.flatnonzero(~present[position])]
+        new = unknown.get(position, [])
+        renamed = []
+        for label in list(new):
+            match = difflib.get_close_matches(label, missing, n=1, cutoff=RENAME_CUTOFF)
+            if match:
+                renamed.append(f"{match[0]} → {label}")
+                missing.remove(match[0])
+                new.remove(label)
+        for code, values in (('missing', missing), ('renamed', renamed), ('new', new)):
+            if values:
+                issues.append(Issue(name, code, ', '.join(values)))
+        if bad_per90[position]:
+            issues.append(Issue(name, 'per90', f"{bad_per90[position]} lignes"))
+        if bad_percentile[position]:
+            issues.append(Issue(name, 'percentile', f"{bad_percentile[position]} lignes"))
+
+    # Empreinte par fichier, indépendante de l'ordre des lignes (xor des hachages de lignes)
+    hashes = pd.util.hash_pandas_object(long[['metric', 'per90', 'percentile']], index=False).to_numpy()
+    starts = np.flatnonzero(np.r_[True, files[1:] != files[:-1]])
+    digests = pd.Series(np.bitwise_xor.reduceat(hashes, starts), index=files[starts])
+    duplicated = digests[digests.duplicated(keep=False)]
+    for _, group in duplicated.groupby(duplicated):
+        members = [names[p] for p in group.index]
+        extra = f" +{len(members) - 2}" if len(members) > 2 else ''
+        for rank, name in enumerate(members):
+            other = members[1] if rank == 0 else members[0]
+            issues.append(Issue(name, 'duplicate', os.path.basename(other) + extra))
+
+    order = {name: position for position, name in enumerate(names)}
+    issues.sort(key=lambda i: (order[i.name], list(ISSUES).index(i.code)))
+    return ValidationReport(names, tuple(issues))
+
+
+def read_scout_table(path):
+    return pd.read_csv(path, header=[0, 1])
+
+
+def validate_files(paths, expected=None):
+    """Lit et valide une liste de CSV de scouting ; un fichier illisible est signalé, pas levé."""
+    frames, unreadable = {}, []
+    for path in paths:
+        try:
+            frames[path] = read_scout_table(path)
+        except (OSError, ValueError, pd.errors.ParserError) as exc:
+            unreadable.append(Issue(path, 'unreadable', str(exc).splitlines()[0]))
+    report = validate_frames(frames, expected)
+    return ValidationReport(tuple(paths), tuple(unreadable) + report.issues)
+
+
+def quarantine_batch(quarantine_dir=DEFAULT_QUARANTINE_DIR):
+    """Nouveau dossier de quarantaine horodaté pour un lot."""
+    path = os.path.join(quarantine_dir, time.strftime('%Y%m%d-%H%M%S'))
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = os.path.join(quarantine_dir, time.strftime('%Y%m%d-%H%M%S') + f'-{suffix}')
+    os.makedirs(path)
+    return path
+
+
+def write_report(report, directory):
+    with open(os.path.join(directory, 'report.json'), 'w', encoding='utf-8') as handle:
+        json.dump(report.to_dict(), handle, ensure_ascii=False, indent=2)
+
+
+def quarantine_files(report, quarantine_dir=DEFAULT_QUARANTINE_DIR):
+    """Déplace les fichiers rejetés et écrit le rapport ; retourne le dossier (None si rien à isoler)."""
+    if not report.rejected:
+        return None
+    batch = quarantine_batch(quarantine_dir)
+    for path in report.rejected:
+        os.replace(path, os.path.join(batch, os.path.basename(path)))
+    write_report(report, batch)
+    return batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Valide les tableaux de scouting d'un dossier")
+    parser.add_argument('directory', nargs='?', default=DEFAULT_LEAGUE_DIR)
+    parser.add_argument('--quarantine-dir', default=DEFAULT_QUARANTINE_DIR)
+    parser.add_argument('--dry-run', action='store_true', help="rapport seulement, aucun fichier déplacé")
+    parser.add_argument('--json', action='store_true', help="rapport complet en JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    report = validate_files(league_files(args.directory))
+    if args.json:
+        json.dump(report.to_dict(), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print(report.summary())
+    if not args.dry_run:
+        batch = quarantine_files(report, args.quarantine_dir)
+        if batch:
+            print(f"quarantaine : {batch}", file=sys.stderr)
+    return 1 if report.rejected else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
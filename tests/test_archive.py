@@ -0,0 +1,33 @@
+import datetime
+
+from scouting.archive import SnapshotArchive
+from scouting.stats_store import build_store
+
+METRICS = ('Goals', 'Assists')
+
+
+def _store(goals, assists):
+    return build_store('Nico Williams', METRICS, [goals, assists], [50.0, 61.0])
+
+
+def test_backfill_keeps_later_snapshots(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    archive.ingest(_store(0.3, 0.2), datetime.date(2025, 1, 1))
+    archive.ingest(_store(0.5, 0.2), datetime.date(2025, 3, 1))
+    archive.ingest(_store(0.3, 10.0), datetime.date(2025, 2, 1))
+
+    per90 = archive.trajectories(['Nico Williams'], METRICS)['per90']['Nico Williams']
+    assert per90.loc['2025-01-01'].tolist() == [0.2, 0.3]
+    assert per90.loc['2025-02-01'].tolist() == [10.0, 0.3]
+    assert per90.loc['2025-03-01'].tolist() == [0.2, 0.5]
+
+
+def test_backfill_before_unchanged_snapshot(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    archive.ingest(_store(0.3, 0.2), datetime.date(2025, 1, 1))
+    archive.ingest(_store(0.3, 0.2), datetime.date(2025, 3, 1))
+    archive.ingest(_store(0.9, 0.2), datetime.date(2025, 2, 1))
+
+    per90 = archive.trajectories(['Nico Williams'], METRICS)['per90']['Nico Williams']
+    assert per90.loc['2025-02-01', 'Goals'] == 0.9
+    assert per90.loc['2025-03-01', 'Goals'] == 0.3
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import time
+from email.utils import formatdate
+
+import pandas as pd
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from scouting.page_cache import PageCache
+from scouting.scraper import PlayerRef, retry_delay, scrape_players, write_csv_atomic
+from scouting.stats_store import DEFAULT_STATS_PATH, parse_scout_csv
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'scout_full_AM.html')
+ETAG = '"scout-v1"'
+NICO = PlayerRef.parse('afdc14d7/Nico-Williams')
+OTHER = PlayerRef.parse('0a1b2c3d/Inaki-Williams')
+
+
+class FakeFBref:
+    """Stand-in FBref : sert la page enregistrée et garde la trace des requêtes."""
+
+    def __init__(self, throttle=0):
+        with open(FIXTURE, encoding='utf-8') as handle:
+            self.html = handle.read()
+        self.throttle = throttle
+        self.requests = []
+
+    async def scout(self, request):
+        self.requests.append((time.monotonic(), request.match_info['player_id'], dict(request.headers)))
+        if self.throttle:
+            self.throttle -= 1
+            return web.Response(status=429, headers={'Retry-After': '1'})
+        if request.headers.get('If-None-Match') == ETAG:
+            return web.Response(status=304, headers={'ETag': ETAG})
+        return web.Response(text=self.html, content_type='text/html', headers={'ETag': ETAG})
+
+    def scrape(self, refs, output_dir, runs=1, **kwargs):
+        """`runs` passes de scrape_players sur le même serveur ; résultat de la dernière."""
+        async def run():
+            app = web.Application()
+            app.router.add_get('/en/players/{player_id}/scout/{window}/{page}', self.scout)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                for _ in range(runs):
+                    result = await scrape_players(refs, str(output_dir), base_url=str(server.make_url('')),
+                                                  **kwargs)
+                return result
+            finally:
+                await server.close()
+        return asyncio.run(run())
+
+
+def test_scrape_writes_the_table(tmp_path):
+    fbref = FakeFBref()
+    written, failures = fbref.scrape([NICO], tmp_path, min_interval=0)
+
+    assert failures == {}
+    assert written == [str(tmp_path / 'nico_williams_stats.csv')]
+    assert os.listdir(tmp_path) == ['nico_williams_stats.csv']
+    scraped, expected = parse_scout_csv(written[0]), parse_scout_csv(DEFAULT_STATS_PATH)
+    assert scraped.metrics == expected.metrics
+    assert scraped.per90.tolist() == expected.per90.tolist()
+    assert scraped.percentiles.tolist() == expected.percentiles.tolist()
+
+
+def test_rate_limit_spaces_requests_to_the_same_host(tmp_path):
+    fbref = FakeFBref()
+    fbref.scrape([NICO, OTHER], tmp_path, min_interval=0.3)
+
+    (first, *_), (second, *_) = sorted(fbref.requests)
+    assert second - first >= 0.25
+
+
+def test_retry_after_is_honoured(tmp_path):
+    fbref = FakeFBref(throttle=1)
+    written, failures = fbref.scrape([NICO], tmp_path, min_interval=0)
+
+    assert failures == {} and len(written) == 1
+    (first, *_), (second, *_) = fbref.requests
+    assert second - first >= 0.9
+
+
+def test_retry_delay_accepts_http_dates():
+    assert retry_delay('7', 1.0) == 7.0
+    assert retry_delay(formatdate(time.time() + 30, usegmt=True), 1.0) == pytest.approx(30, abs=2)
+    assert retry_delay(formatdate(time.time() - 30, usegmt=True), 1.0) == 0.0
+    assert retry_delay('demain', 1.0) == 1.0
+    assert retry_delay(None, 1.0) == 1.0
+
+
+def test_stale_page_is_revalidated_with_etag(tmp_path):
+    fbref = FakeFBref()
+    cache = PageCache(str(tmp_path / 'cache'), ttl=0)
+    written, failures = fbref.scrape([NICO], tmp_path / 'out', runs=2, min_interval=0, cache=cache)
+
+    assert failures == {} and len(written) == 1
+    assert [headers.get('If-None-Match') for _, _, headers in fbref.requests] == [None, ETAG]
+    assert (cache.misses, cache.revalidated) == (1, 1)
+    assert len(parse_scout_csv(written[0]).metrics) > 100
+
+
+def test_fresh_page_is_served_from_cache(tmp_path):
+    fbref = FakeFBref()
+    cache = PageCache(str(tmp_path / 'cache'), ttl=3600)
+    fbref.scrape([NICO], tmp_path / 'out', runs=2, min_interval=0, cache=cache)
+
+    assert len(fbref.requests) == 1
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+class _FailingFrame:
+    def to_csv(self, handle, index=False):
+        handle.write('Standard Stats,Standard')
+        raise RuntimeError('écriture interrompue')
+
+
+def test_failed_write_keeps_previous_csv(tmp_path):
+    path = tmp_path / 'nico_williams_stats.csv'
+    write_csv_atomic(pd.read_csv(DEFAULT_STATS_PATH, header=[0, 1]), str(path))
+    before = path.read_text()
+
+    with pytest.raises(RuntimeError):
+        write_csv_atomic(_FailingFrame(), str(path))
+    assert path.read_text() == before
+    assert os.listdir(tmp_path) == ['nico_williams_stats.csv']